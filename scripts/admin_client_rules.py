@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Declarative admin-client rewrite engine for tables that need to bypass RLS.
+
+Rules come from a JSON config (see admin-client-rules.json):
+
+    {"rules": [{
+        "table": "workspace_accounts",
+        "client": "adminClient",
+        "declaration": "const adminClient = supabaseAdmin()",
+        "import": "import { supabaseAdmin } from '@/app/lib/supabase'",
+        "admin_clients": ["adminClient", "supabaseAdmin", "adminSupabase"],
+        "only_if_contains": ["from '@/app/lib/supabase'", "supabaseAdmin"]
+    }]}
+
+Every configured table is matched by one compiled alternation, so a file is
+rewritten in a single pass however many tables are configured: user-client
+.from('<table>') calls are switched to the rule's client, the declaration is
+inserted at the top of the outermost function around each rewritten call
+(once per handler, so GET and POST each get their own) and the import is
+added after the last import if it is missing. A rule with only_if_contains
+leaves files alone unless they contain every listed string.
+"""
+
+import bisect
+import json
+import re
+from collections import namedtuple
+
+from call_scanner import find_function_bodies
+from table_index import CLIENT_BEFORE, CLIENT_LOOKBEHIND
+
+AdminClientRule = namedtuple('AdminClientRule', 'table client declaration import_line admin_clients only_if_contains')
+Change = namedtuple('Change', 'line table old_client new_client')
+
+LAST_IMPORT = re.compile(r"^import\b[^;]*?\bfrom\s*['\"][^'\"\n]+['\"];?[ \t]*$", re.MULTILINE)
+BODY_INDENT = re.compile(r'(?:[ \t]*\n)*([ \t]*)')
+
+
+def load_rules(config_path):
+    """Read AdminClientRule entries from a JSON config file."""
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    rules = []
+    for entry in config['rules']:
+        client = entry.get('client', 'adminClient')
+        rules.append(AdminClientRule(
+            table=entry['table'],
+            client=client,
+            declaration=entry.get('declaration'),
+            import_line=entry.get('import'),
+            admin_clients=frozenset(entry.get('admin_clients', [])) | {client},
+            only_if_contains=tuple(entry.get('only_if_contains', [])),
+        ))
+    return rules
+
+
+def _has_import(content, import_line):
+    return import_line.rstrip(';') in content
+
+
+def _outermost_body(bodies, position):
+    """The (open, close) of the outermost function body around position, or None at module level."""
+    enclosing = [body for body in bodies if body[0] < position < body[1]]
+    return min(enclosing) if enclosing else None
+
+
+def _declare_in_body(content, body, declaration):
+    """Edit that puts declaration as the first statement of the function body."""
+    open_brace = body[0]
+    newline = content.find('\n', open_brace)
+    if newline < 0 or newline > body[1] or content[open_brace + 1:newline].strip():
+        # one-line body: `=> { return supabase.from(...) }`
+        return (open_brace + 1, open_brace + 1, f" {declaration};")
+    indent = BODY_INDENT.match(content, newline + 1).group(1)
+    return (newline + 1, newline + 1, f"{indent}{declaration}\n")
+
+
+class AdminClientRewriter:
+    """Applies a set of AdminClientRules to file contents in one pass."""
+
+    def __init__(self, rules):
+        self.rules = {rule.table: rule for rule in rules}
+        tables = '|'.join(re.escape(table) for table in sorted(self.rules, key=len, reverse=True))
+        self.from_call = re.compile(r"\.from\(\s*(['\"`])(%s)\1\s*\)" % tables)
+
+    @property
+    def tables(self):
+        return sorted(self.rules)
+
+    def rewrite(self, content):
+        """Return (new_content, [Change, ...]); content is untouched if there are no changes."""
+        newlines = None
+        bodies = None
+        edits = []  # (position, end, text), applied in one sweep
+        changes = []
+        declared = set()  # (declaration, function body open brace or None)
+        eligible = {}
+        imports = []
+
+        for match in self.from_call.finditer(content):
+            rule = self.rules[match.group(2)]
+            if rule.table not in eligible:
+                eligible[rule.table] = all(text in content for text in rule.only_if_contains)
+            if not eligible[rule.table]:
+                continue
+            client = CLIENT_BEFORE.search(content, max(0, match.start() - CLIENT_LOOKBEHIND), match.start())
+            # Skip unknown receivers and member access (this.supabase.from): we
+            # only swap plain identifiers / zero-arg calls.
+            if not client or (client.start() and content[client.start() - 1] == '.'):
+                continue
+            old_client = client.group(1)
+            if old_client.rstrip('()') in rule.admin_clients:
+                continue
+
+            if newlines is None:
+                newlines = [m.start() for m in re.finditer('\n', content)]
+            line_index = bisect.bisect_right(newlines, client.start() - 1)
+            line_start = newlines[line_index - 1] + 1 if line_index else 0
+
+            if rule.declaration:
+                if bodies is None:
+                    bodies = find_function_bodies(content)
+                body = _outermost_body(bodies, client.start())
+                key = (rule.declaration, body and body[0])
+                if key not in declared:
+                    declared.add(key)
+                    if body is None:
+                        if rule.declaration not in content:
+                            line = content[line_start:client.start()]
+                            indent = line[:len(line) - len(line.lstrip())]
+                            edits.append((line_start, line_start, f"{indent}{rule.declaration}\n"))
+                    elif rule.declaration not in content[body[0]:body[1]]:
+                        edits.append(_declare_in_body(content, body, rule.declaration))
+            if rule.import_line and not _has_import(content, rule.import_line) and rule.import_line not in imports:
+                imports.append(rule.import_line)
+
+            edits.append((client.start(1), client.end(1), rule.client))
+            changes.append(Change(line_index + 1, rule.table, old_client, rule.client))
+
+        if not edits:
+            return content, []
+
+        if imports:
+            last_import = None
+            for last_import in LAST_IMPORT.finditer(content):
+                pass
+            if last_import:
+                edits.append((last_import.end(), last_import.end(), ''.join(f"\n{line}" for line in imports)))
+            else:
+                edits.append((0, 0, ''.join(f"{line}\n" for line in imports) + '\n'))
+
+        # (start, end) order puts a zero-width insertion before a replacement at the same offset
+        edits.sort(key=lambda edit: (edit[0], edit[1]))
+        pieces = []
+        position = 0
+        for start, end, text in edits:
+            pieces.append(content[position:start])
+            pieces.append(text)
+            position = end
+        pieces.append(content[position:])
+        return ''.join(pieces), changes
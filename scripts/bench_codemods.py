@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Python codemods in scripts/ against a synthetic Next.js tree.
+
+A deterministic corpus (app/api route handlers, app pages, lib modules, .d.ts
+files) is generated at each requested scale with realistic import blocks,
+multi-line createClient(...) calls and .from('<table>') queries. Every codemod
+then runs as a subprocess on a fresh copy of that corpus with --no-cache, and
+wall time, files/sec, MB/sec and peak RSS are recorded per script.
+
+Results are written as JSON so two commits can be compared:
+
+    python scripts/bench_codemods.py --scales 1000 10000 --output before.json
+    python scripts/bench_codemods.py --scales 1000 10000 --output after.json --compare before.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections import namedtuple
+from datetime import datetime, timezone
+
+from codemod_common import find_ts_files
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SCALES = [1000, 10000, 50000]
+DEFAULT_OUTPUT = 'codemod-bench.json'
+BENCH_FORMAT = 1
+
+# scope(tree) returns the files the script reads, for files/sec and MB/sec.
+# parallel scripts also get --jobs when it is given.
+Benchmark = namedtuple('Benchmark', 'name script args scope parallel')
+
+KB_FAMILIES = ['competitors', 'data', 'icps', 'personas', 'products']
+
+
+def _app_and_lib(tree):
+    return find_ts_files(os.path.join(tree, 'app')) + find_ts_files(os.path.join(tree, 'lib'))
+
+
+def _api_routes(tree):
+    return [path for path in find_ts_files(os.path.join(tree, 'app/api')) if os.path.basename(path) == 'route.ts']
+
+
+BENCHMARKS = [
+    Benchmark('migrate_supabase', 'migrate_supabase.py', ['.'], _app_and_lib, True),
+    Benchmark('migrate_supabase_phase2', 'migrate_supabase_phase2.py', [], lambda tree: find_ts_files(tree), True),
+    Benchmark('migrate_supabase_phase3', 'migrate_supabase_phase3.py', [],
+              lambda tree: find_ts_files(tree, include_dts=True), True),
+    Benchmark('migrate_supabase_all', 'migrate_supabase_all.py', ['.'],
+              lambda tree: find_ts_files(tree, include_dts=True), True),
+    Benchmark('update-kb-routes', 'update-kb-routes.py', [], _api_routes, True),
+    Benchmark('fix-workspace-accounts', 'fix-workspace-accounts.py', [],
+              lambda tree: find_ts_files(os.path.join(tree, 'app/api')), False),
+    Benchmark('fix-workspace-accounts-v2', 'fix-workspace-accounts-v2.py', [],
+              lambda tree: find_ts_files(os.path.join(tree, 'app/api')), False),
+]
+
+
+# --- Corpus ------------------------------------------------------------------
+
+TABLES = [
+    'workspace_accounts', 'workspace_members', 'campaigns', 'campaign_prospects',
+    'prospect_approval_sessions', 'knowledge_base', 'workspaces', 'users',
+]
+SUPABASE_IMPORTS = [
+    ["import { createClient } from '@supabase/supabase-js';"],
+    ["import { createServerClient } from '@supabase/ssr';", "import { cookies } from 'next/headers';"],
+    ["import { createRouteHandlerClient } from '@supabase/auth-helpers-nextjs';", "import { cookies } from 'next/headers';"],
+    ["import { createClient as createServiceClient } from '@supabase/supabase-js';"],
+    ["import type { SupabaseClient } from '@supabase/supabase-js';"],
+]
+APP_IMPORTS = [
+    "import { supabaseAdmin } from '@/app/lib/supabase';",
+    "import { pool } from '@/lib/db';",
+    "import { z } from 'zod';",
+    "import { logger } from '@/lib/logger';",
+    "import { requireWorkspaceAccess } from '@/lib/auth/workspace';",
+    "import { formatDistanceToNow } from 'date-fns';",
+    "import type { Campaign, Prospect } from '@/types/campaign';",
+]
+CREATE_CLIENT = [
+    "  const supabase = createClient(",
+    "    process.env.NEXT_PUBLIC_SUPABASE_URL!,",
+    "    process.env.SUPABASE_SERVICE_ROLE_KEY!,",
+    "    { auth: { persistSession: false, autoRefreshToken: false } }",
+    "  );",
+]
+CREATE_SERVER_CLIENT = [
+    "  const cookieStore = await cookies();",
+    "  const supabase = createServerClient(",
+    "    process.env.NEXT_PUBLIC_SUPABASE_URL!,",
+    "    process.env.NEXT_PUBLIC_SUPABASE_ANON_KEY!,",
+    "    { cookies: { getAll: () => cookieStore.getAll(), setAll: () => {} } }",
+    "  );",
+]
+
+
+def _query(rng, client):
+    table = rng.choice(TABLES)
+    return [
+        f"  const {{ data: rows{rng.randrange(1000)}, error }} = await {client}",
+        f"    .from('{table}')",
+        "    .select('*')",
+        "    .eq('workspace_id', workspaceId)",
+        f"    .limit({rng.choice([10, 50, 100, 1000])});",
+        "  if (error) {",
+        f"    console.error('Failed to load {table}:', error);",
+        "    return NextResponse.json({ error: error.message }, { status: 500 });",
+        "  }",
+    ]
+
+
+def _helper(rng, index):
+    # Plain code with strings, templates and comments so the scanners see
+    # something close to real route bodies
+    return [
+        f"// Normalise a batch of records before returning them (helper {index})",
+        f"function normalise{index}(items: Array<Record<string, unknown>>) {{",
+        "  return items.map((item) => ({",
+        "    ...item,",
+        f"    label: `${{String(item.name ?? '')}} (#{rng.randrange(10000)})`,",
+        "    createdAt: new Date(String(item.created_at)).toISOString(),",
+        "    tags: Array.isArray(item.tags) ? item.tags.filter(Boolean) : [],",
+        "  }));",
+        "}",
+        "",
+    ]
+
+
+def route_file(rng):
+    imports = ["import { NextRequest, NextResponse } from 'next/server';"]
+    supabase = rng.random() < 0.3
+    if supabase:
+        imports += rng.choice(SUPABASE_IMPORTS)
+    imports += rng.sample(APP_IMPORTS, rng.randint(1, 4))
+
+    lines = imports + [""]
+    for index in range(rng.randint(1, 4)):
+        lines += _helper(rng, index)
+    for method in rng.sample(['GET', 'POST', 'PUT', 'DELETE'], rng.randint(1, 3)):
+        lines += [f"export async function {method}(request: NextRequest) {{",
+                  "  const workspaceId = request.nextUrl.searchParams.get('workspace_id');"]
+        if supabase and rng.random() < 0.6:
+            lines += CREATE_CLIENT if rng.random() < 0.7 else CREATE_SERVER_CLIENT
+            client = 'supabase'
+        else:
+            client = rng.choice(['supabase', 'supabaseAdmin()', 'adminClient'])
+        for _ in range(rng.randint(1, 3)):
+            lines += _query(rng, client)
+        lines += ["  return NextResponse.json({ success: true, workspaceId });", "}", ""]
+    return '\n'.join(lines)
+
+
+def kb_route_file(family):
+    # The exact boilerplate update-kb-routes.py rewrites
+    return '\n'.join([
+        "import { NextRequest, NextResponse } from 'next/server';",
+        "import { createRouteHandlerClient } from '@supabase/auth-helpers-nextjs';",
+        "import { cookies } from 'next/headers';",
+        "",
+        "type RouteSupabaseClient = ReturnType<typeof createRouteHandlerClient>;",
+        "",
+        "export async function GET(request: NextRequest) {",
+        "  // cookieStore removed;",
+        "  const supabase = createRouteHandlerClient({ cookies: await cookies() });",
+        f"  const {{ data, error }} = await supabase.from('knowledge_base_{family}').select('*');",
+        "  if (error) return NextResponse.json({ error: error.message }, { status: 500 });",
+        "  return NextResponse.json({ data });",
+        "}",
+        "",
+    ])
+
+
+def component_file(rng, name):
+    lines = ["'use client';", "", "import { useEffect, useState } from 'react';"]
+    if rng.random() < 0.15:
+        lines += ["import { createClientComponentClient } from '@supabase/auth-helpers-nextjs';"]
+    lines += ["", f"export default function {name}() {{",
+              "  const [items, setItems] = useState<string[]>([]);",
+              "  useEffect(() => {",
+              f"    fetch('/api/{name.lower()}').then((res) => res.json()).then((body) => setItems(body.data ?? []));",
+              "  }, []);",
+              "  return (",
+              "    <ul className=\"space-y-2\">",
+              "      {items.map((item) => <li key={item}>{item}</li>)}",
+              "    </ul>",
+              "  );",
+              "}", ""]
+    return '\n'.join(lines)
+
+
+def lib_file(rng, index):
+    lines = []
+    if rng.random() < 0.25:
+        lines += rng.choice(SUPABASE_IMPORTS)
+        lines += ["", f"export function getClient{index}() {{"] + CREATE_CLIENT + ["  return supabase;", "}", ""]
+    for helper in range(rng.randint(2, 6)):
+        lines += _helper(rng, helper)
+    return '\n'.join(lines)
+
+
+def dts_file(index):
+    return '\n'.join([
+        "import type { SupabaseClient } from '@supabase/supabase-js';",
+        "",
+        f"export interface Record{index} {{",
+        "  id: string;",
+        "  workspace_id: string;",
+        "  client?: SupabaseClient;",
+        "}",
+        "",
+    ])
+
+
+def generate_corpus(root, total_files, seed=0):
+    """Write a synthetic Next.js tree with total_files TS files under root. Returns bytes written."""
+    rng = random.Random(seed)
+    files = {}
+    for family in KB_FAMILIES:
+        files[f"app/api/knowledge-base/{family}/route.ts"] = kb_route_file(family)
+
+    remaining = max(0, total_files - len(files))
+    counts = {
+        'route': remaining * 55 // 100,
+        'component': remaining * 20 // 100,
+        'dts': remaining * 5 // 100,
+    }
+    counts['lib'] = remaining - sum(counts.values())
+    per_dir = 20
+
+    for i in range(counts['route']):
+        files[f"app/api/family-{i // per_dir}/resource-{i}/route.ts"] = route_file(rng)
+    for i in range(counts['component']):
+        files[f"app/(dashboard)/section-{i // per_dir}/components/Widget{i}.tsx"] = component_file(rng, f"Widget{i}")
+    for i in range(counts['lib']):
+        files[f"lib/module-{i // per_dir}/service{i}.ts"] = lib_file(rng, i)
+    for i in range(counts['dts']):
+        files[f"types/generated-{i // per_dir}/record{i}.d.ts"] = dts_file(i)
+
+    written = 0
+    for rel_path, content in files.items():
+        path = os.path.join(root, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = content.encode('utf-8')
+        with open(path, 'wb') as f:
+            f.write(data)
+        written += len(data)
+    return written
+
+
+# --- Running -----------------------------------------------------------------
+
+def _rss_bytes(maxrss):
+    # ru_maxrss is in bytes on macOS and KiB on Linux
+    return maxrss if sys.platform == 'darwin' else maxrss * 1024
+
+
+def run_benchmark(bench, tree, jobs=None, log_file=os.devnull):
+    """Run one codemod on tree and return its measurements."""
+    scope = bench.scope(tree)
+    scope_bytes = sum(os.path.getsize(path) for path in scope if os.path.exists(path))
+
+    argv = [sys.executable, os.path.join(SCRIPT_DIR, bench.script)] + bench.args + ['--no-cache']
+    if bench.parallel and jobs is not None:
+        argv += ['--jobs', str(jobs)]
+
+    with open(log_file, 'wb') as log:
+        start = time.perf_counter()
+        proc = subprocess.Popen(argv, cwd=tree, stdout=log, stderr=subprocess.STDOUT)
+        # wait4 gives this child's own rusage (RUSAGE_CHILDREN would be the max over all runs)
+        _, wait_status, usage = os.wait4(proc.pid, 0)
+        seconds = time.perf_counter() - start
+    proc.returncode = os.waitstatus_to_exitcode(wait_status)
+
+    return {
+        'returncode': proc.returncode,
+        'seconds': round(seconds, 4),
+        'files': len(scope),
+        'bytes': scope_bytes,
+        'files_per_sec': round(len(scope) / seconds, 1) if seconds else None,
+        'mb_per_sec': round(scope_bytes / 1e6 / seconds, 3) if seconds else None,
+        'peak_rss_mb': round(_rss_bytes(usage.ru_maxrss) / 1e6, 1),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=SCRIPT_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_scale(scale, result, baseline=None):
+    corpus = result['corpus']
+    print(f"\n📦 {scale} files ({corpus['bytes'] / 1e6:.1f} MB, generated in {corpus['seconds']:.1f}s)")
+    header = f"{'Script':<28} {'sec':>8} {'files/s':>10} {'MB/s':>8} {'RSS MB':>8}"
+    if baseline:
+        header += f" {'vs base':>9}"
+    print(header)
+    print("-" * len(header))
+    for name, stats in result['scripts'].items():
+        line = (f"{name:<28} {stats['seconds']:>8.2f} {stats['files_per_sec'] or 0:>10.0f} "
+                f"{stats['mb_per_sec'] or 0:>8.2f} {stats['peak_rss_mb']:>8.1f}")
+        old = (baseline or {}).get(name)
+        if old and old.get('seconds'):
+            line += f" {stats['seconds'] / old['seconds']:>8.2f}x"
+        if stats['returncode']:
+            line += f"  ❌ exit {stats['returncode']}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the codemods in scripts/ on a synthetic TS corpus')
+    parser.add_argument('--scales', type=int, nargs='+', default=DEFAULT_SCALES,
+                        help='corpus sizes in files (default: 1000 10000 50000)')
+    parser.add_argument('--scripts', nargs='+', choices=[bench.name for bench in BENCHMARKS],
+                        help='only run these codemods (default: all)')
+    parser.add_argument('--jobs', '-j', type=int, help='pass --jobs to the codemods that support it')
+    parser.add_argument('--seed', type=int, default=0, help='corpus generator seed (default: 0)')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help=f'results JSON (default: {DEFAULT_OUTPUT})')
+    parser.add_argument('--compare', metavar='JSON', help='earlier results file to show speed ratios against')
+    parser.add_argument('--workdir', help='where to generate corpora (default: a temp dir, removed afterwards)')
+    args = parser.parse_args()
+
+    benchmarks = [bench for bench in BENCHMARKS if not args.scripts or bench.name in args.scripts]
+    baseline = {}
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f).get('scales', {})
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix='codemod-bench-')
+    results = {
+        'format': BENCH_FORMAT,
+        'commit': git_commit(),
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'jobs': args.jobs,
+        'seed': args.seed,
+        'scales': {},
+    }
+
+    print(f"⏱️  Benchmarking {len(benchmarks)} codemods at {', '.join(map(str, args.scales))} files (workdir: {workdir})")
+    try:
+        for scale in args.scales:
+            pristine = os.path.join(workdir, f"corpus-{scale}")
+            shutil.rmtree(pristine, ignore_errors=True)
+            start = time.perf_counter()
+            corpus_bytes = generate_corpus(pristine, scale, args.seed)
+            scale_result = {
+                'corpus': {'files': scale, 'bytes': corpus_bytes, 'seconds': round(time.perf_counter() - start, 2)},
+                'scripts': {},
+            }
+
+            for bench in benchmarks:
+                # Each codemod gets an untouched copy, since they rewrite files in place
+                tree = os.path.join(workdir, f"run-{scale}")
+                shutil.rmtree(tree, ignore_errors=True)
+                shutil.copytree(pristine, tree)
+                log_file = os.path.join(workdir, f"{bench.name}-{scale}.log")
+                scale_result['scripts'][bench.name] = run_benchmark(bench, tree, args.jobs, log_file)
+                shutil.rmtree(tree)
+
+            results['scales'][str(scale)] = scale_result
+            print_scale(scale, scale_result, baseline.get(str(scale), {}).get('scripts'))
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+        f.write('\n')
+    print(f"\n✅ Results written to {args.output}")
+    if any(stats['returncode'] for scale in results['scales'].values() for stats in scale['scripts'].values()):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Linear-time call-expression scanner for TS/TSX source used by the codemods.
+
+The createClient(...) / createServerClient(...) regexes in phase 2 and 3 used
+[^)]+ under DOTALL, which backtracks on large files and stops at the first ')'
+even when the arguments contain nested calls (createClient(url, getKey())).
+find_calls walks the text once, skipping strings, template literals and
+comments, and matches brackets with a stack, so every call span it returns is
+exact and the whole scan is O(n).
+
+find_function_bodies uses the same skipping to return the brace spans of
+function bodies (declarations, methods and arrow functions with a block).
+
+Regex literals are not recognised. A bracket inside one is taken as code: a
+stray closer that does not match the innermost open bracket is ignored, but
+one that does closes the call early, so createClient(a, /\\)/) is reported
+as `createClient(a, /\\)` and a rewrite leaves the rest of the regex behind.
+The old [^)]+ regexes had the same limit.
+"""
+
+import re
+from collections import namedtuple
+
+# start: first char of the callee name, args_start: index of '(',
+# end: index just past the matching ')'
+CallSpan = namedtuple('CallSpan', 'name start args_start end')
+
+CLOSERS = {'(': ')', '[': ']', '{': '}'}
+STRING = {
+    "'": re.compile(r"'(?:[^'\\\n]|\\.)*'?"),
+    '"': re.compile(r'"(?:[^"\\\n]|\\.)*"?'),
+}
+TEMPLATE_STOP = re.compile(r'[\\`]|\$\{')
+OPEN_PAREN = re.compile(r'\s*\(')
+COMMENT = re.compile(r'//[^\n]*|/\*[\s\S]*?\*/')
+BLOCK_STOP = re.compile(r"""["'`()\[\]{}]|/[/*]""")
+# `(...) {` after these is a statement block, not a function body
+CONTROL_KEYWORDS = frozenset(['if', 'for', 'while', 'switch', 'catch', 'with'])
+RETURN_TYPE = re.compile(r'\s*:\s*[\w$<>\[\],.|&?\s]+')
+WORD_BEFORE = re.compile(r'([\w$]+)\s*\Z')
+
+
+def _code_stops(names):
+    """
+    Regexes for the only code positions the scanner has to look at.
+
+    Brackets only matter while a call or a template ${...} is open, so at the
+    top level (empty stack) the idle regex skips them entirely.
+    """
+    callee = '|'.join(re.escape(name) for name in sorted(names))
+    idle = re.compile(r"""["'`]|/[/*]|(?<![\w$])(?:%s)(?![\w$])""" % callee)
+    full = re.compile(r"""["'`()\[\]{}]|/[/*]|(?<![\w$])(?:%s)(?![\w$])""" % callee)
+    return idle, full
+
+
+def find_calls(content, names):
+    """
+    Return a CallSpan for every call to one of names, in source order.
+
+    Calls nested inside another reported call are included too; callers that
+    rewrite spans should skip spans that start before the previous one ended.
+    The scanner jumps between brackets, quotes, comment starts and callee
+    names with a compiled regex, so ordinary identifiers and whitespace are
+    skipped at C speed.
+    """
+    idle_stop, full_stop = _code_stops(names)
+    n = len(content)
+    calls = []
+    # Each entry is (closer, call) for brackets, or ('`', None) while inside a
+    # template literal; '${' inside a template pushes a '}' entry.
+    stack = []
+    i = 0
+    while i < n:
+        if stack and stack[-1][0] == '`':
+            match = TEMPLATE_STOP.search(content, i)
+            if not match:
+                break
+            token = match.group()
+            if token == '\\':
+                i = match.end() + 1
+            elif token == '`':
+                stack.pop()
+                i = match.end()
+            else:
+                stack.append(('}', None))
+                i = match.end()
+            continue
+
+        match = (full_stop if stack else idle_stop).search(content, i)
+        if not match:
+            break
+        token = match.group()
+        i = match.end()
+
+        if token in STRING:
+            i = STRING[token].match(content, match.start()).end()
+        elif token == '`':
+            stack.append(('`', None))
+        elif token == '//':
+            newline = content.find('\n', i)
+            i = n if newline < 0 else newline + 1
+        elif token == '/*':
+            close = content.find('*/', i)
+            i = n if close < 0 else close + 2
+        elif token in CLOSERS:
+            stack.append((CLOSERS[token], None))
+        elif token in ')]}':
+            if stack and stack[-1][0] == token:
+                _, call = stack.pop()
+                if call is not None:
+                    calls.append(CallSpan(call[0], call[1], call[2], i))
+        else:
+            paren = OPEN_PAREN.match(content, i)
+            if paren:
+                stack.append((')', (token, match.start(), paren.end() - 1)))
+                i = paren.end()
+
+    calls.sort(key=lambda call: call.start)
+    return calls
+
+
+def _opens_function(content, brace, parens):
+    """Is the '{' at index brace a function body: `=> {`, or `name(...) {` with an optional return type?"""
+    window = max(0, brace - 200)
+    before = content[window:brace].rstrip()
+    if before.endswith('=>'):
+        return True
+    close = before.rfind(')')
+    if close < 0:
+        return False
+    tail = before[close + 1:]
+    if tail and not RETURN_TYPE.fullmatch(tail):
+        return False
+    open_index = parens.get(window + close)
+    if open_index is None:
+        return False
+    word = WORD_BEFORE.search(content, max(0, open_index - 40), open_index)
+    return not (word and word.group(1) in CONTROL_KEYWORDS)
+
+
+def find_function_bodies(content):
+    """
+    Return (open, close) indexes of the braces of every function body, in
+    order of their closing brace (inner functions before the outer ones).
+    """
+    bodies = []
+    parens = {}  # index of a ')' -> index of its '('
+    # (closer, open index, is function body); ('`', ...) while in a template
+    stack = []
+    n = len(content)
+    i = 0
+    while i < n:
+        if stack and stack[-1][0] == '`':
+            match = TEMPLATE_STOP.search(content, i)
+            if not match:
+                break
+            token = match.group()
+            if token == '\\':
+                i = match.end() + 1
+            elif token == '`':
+                stack.pop()
+                i = match.end()
+            else:
+                stack.append(('}', match.start(), False))
+                i = match.end()
+            continue
+
+        match = BLOCK_STOP.search(content, i)
+        if not match:
+            break
+        token = match.group()
+        start = match.start()
+        i = match.end()
+
+        if token in STRING:
+            i = STRING[token].match(content, start).end()
+        elif token == '`':
+            stack.append(('`', start, False))
+        elif token == '//':
+            newline = content.find('\n', i)
+            i = n if newline < 0 else newline + 1
+        elif token == '/*':
+            close = content.find('*/', i)
+            i = n if close < 0 else close + 2
+        elif token == '{':
+            stack.append(('}', start, _opens_function(content, start, parens)))
+        elif token in CLOSERS:
+            stack.append((CLOSERS[token], start, False))
+        elif stack and stack[-1][0] == token:
+            _, open_index, is_function = stack.pop()
+            if token == ')':
+                parens[start] = open_index
+            elif is_function:
+                bodies.append((open_index, start))
+    return bodies
+
+
+class CallAssignment:
+    """
+    Matches `const <var> = <callee>(...)` plus trailing text, using find_calls.
+
+    Quacks like a compiled regex (pattern, flags, sub, subn) so it can be used
+    as a rule inside codemod_common.RuleSet. The replacement is inserted
+    literally (no backreferences). With require_args, calls without arguments
+    (`createClient()`, comments only) are left alone, like the old `[^)]+` regex.
+    """
+
+    DECLARATION = re.compile(r'\bconst\s+([A-Za-z_$][\w$]*)\s*=\s*\Z')
+    LOOKBEHIND = 256
+
+    def __init__(self, callees, variables, trailing=r'', require_args=False):
+        self.callees = tuple(callees)
+        self.variables = frozenset(variables)
+        self.trailing = re.compile(trailing)
+        self.require_args = require_args
+        self.flags = 0
+        self.pattern = (f"const ({'|'.join(sorted(self.variables))}) = "
+                        f"({'|'.join(self.callees)})({'<balanced, non-empty>' if require_args else '<balanced>'})"
+                        f"{trailing}")
+
+    def spans(self, content):
+        """Yield non-overlapping (start, end) spans of matching assignments."""
+        last_end = 0
+        for call in find_calls(content, self.callees):
+            if call.start < last_end:
+                continue
+            if self.require_args and not COMMENT.sub('', content[call.args_start + 1:call.end - 1]).strip():
+                continue
+            window_start = max(last_end, call.start - self.LOOKBEHIND)
+            declaration = self.DECLARATION.search(content, window_start, call.start)
+            if not declaration or declaration.group(1) not in self.variables:
+                continue
+            end = self.trailing.match(content, call.end).end()
+            yield declaration.start(), end
+            last_end = end
+
+    def subn(self, replacement, content):
+        pieces = []
+        count = 0
+        position = 0
+        for start, end in self.spans(content):
+            pieces.append(content[position:start])
+            pieces.append(replacement)
+            position = end
+            count += 1
+        if not count:
+            return content, 0
+        pieces.append(content[position:])
+        return ''.join(pieces), count
+
+    def sub(self, replacement, content):
+        return self.subn(replacement, content)[0]
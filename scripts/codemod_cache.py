@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Persistent content-hash manifest (.codemod-cache.json) for the codemods in scripts/
+
+Each codemod gets its own section keyed by a rules version. Inside it we keep,
+per file path, the stat fingerprint (mtime_ns, size) and sha1 of the content
+the last time the rules were a no-op on it. On the next run a file whose stat
+fingerprint is unchanged is skipped without being opened; if only the mtime
+moved (checkout, touch) the content hash decides.
+"""
+
+import hashlib
+import json
+import os
+
+from codemod_common import SKIPPED, UNCHANGED
+
+DEFAULT_CACHE_FILE = '.codemod-cache.json'
+MANIFEST_FORMAT = 1
+
+
+def sha1_bytes(data):
+    return hashlib.sha1(data).hexdigest()
+
+
+def source_version(*paths):
+    """Rules version for scripts whose rules live in code: a hash of the script source."""
+    digest = hashlib.sha1()
+    for path in paths:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+class Manifest:
+    """Per-script set of files known to be no-ops under the current rules."""
+
+    def __init__(self, cache_file, namespace, rules_version, enabled=True):
+        self.cache_file = cache_file
+        self.namespace = namespace
+        self.rules_version = rules_version
+        self.enabled = enabled
+        self.sections = {}
+        self.files = {}
+        self.hits = 0
+        if enabled:
+            self._load()
+
+    def _load(self):
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('format') != MANIFEST_FORMAT:
+            return
+        self.sections = data.get('scripts', {})
+        section = self.sections.get(self.namespace, {})
+        # A different rules version invalidates every entry for this script
+        if section.get('rules') == self.rules_version:
+            self.files = section.get('files', {})
+
+    def is_noop(self, path):
+        """True if path is unchanged since the rules were last a no-op on it."""
+        if not self.enabled:
+            return False
+        entry = self.files.get(str(path))
+        if not entry:
+            return False
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        if [st.st_mtime_ns, st.st_size] == entry[:2]:
+            self.hits += 1
+            return True
+        with open(path, 'rb') as f:
+            digest = sha1_bytes(f.read())
+        if digest != entry[2]:
+            return False
+        entry[0], entry[1] = st.st_mtime_ns, st.st_size
+        self.hits += 1
+        return True
+
+    def filter(self, paths):
+        """Drop the paths that are known no-ops, keeping order."""
+        return [path for path in paths if not self.is_noop(path)]
+
+    def record(self, path, status):
+        """Remember path as a no-op if the rules left it untouched, else forget it."""
+        if not self.enabled:
+            return
+        key = str(path)
+        if status not in (SKIPPED, UNCHANGED):
+            self.files.pop(key, None)
+            return
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            st = os.stat(path)
+        except OSError:
+            self.files.pop(key, None)
+            return
+        self.files[key] = [st.st_mtime_ns, st.st_size, sha1_bytes(data)]
+
+    def record_all(self, paths, statuses):
+        for path, status in zip(paths, statuses):
+            self.record(path, status)
+
+    def save(self):
+        if not self.enabled:
+            return
+        self.sections[self.namespace] = {'rules': self.rules_version, 'files': self.files}
+        tmp_file = f"{self.cache_file}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'format': MANIFEST_FORMAT, 'scripts': self.sections}, f, separators=(',', ':'))
+        os.replace(tmp_file, self.cache_file)
+
+    def summary(self, total):
+        if not self.enabled:
+            return "Manifest: disabled (--no-cache)"
+        return f"Manifest: {self.hits} of {total} files unchanged since last no-op run, skipped without scanning"
+
+
+def add_cache_arguments(parser):
+    """Register --cache-file/--no-cache on an argparse parser."""
+    parser.add_argument('--cache-file', default=DEFAULT_CACHE_FILE,
+                        help=f'content-hash manifest to read/update (default: {DEFAULT_CACHE_FILE})')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='ignore the manifest and rescan every file')
+
+
+def manifest_from_args(args, namespace, rules_version):
+    return Manifest(args.cache_file, namespace, rules_version, enabled=not args.no_cache)
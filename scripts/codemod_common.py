@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the Python codemods in scripts/ (file discovery, worker pool, rule sets)
+"""
+
+import hashlib
+import os
+import json
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+SKIP_DIRS = ['node_modules', '.next', '.git']
+
+
+def is_ts_file(filename, include_dts=False):
+    """True for .ts/.tsx file names (.d.ts only if include_dts)."""
+    if not filename.endswith(('.ts', '.tsx')):
+        return False
+    return include_dts or not filename.endswith('.d.ts')
+
+
+def find_ts_files(root_dir, include_dts=False, only=None):
+    """
+    Collect .ts/.tsx files under root_dir, skipping build and vendor dirs.
+
+    If only is given (a list of cwd-relative paths, e.g. from
+    git_changed_files), the files are picked from it instead of walking
+    root_dir; paths are returned in the same form the walk would produce.
+    """
+    if only is not None:
+        paths = []
+        for path in only:
+            rel = os.path.relpath(path, root_dir)
+            parts = rel.split(os.sep)
+            if parts[0] == '..' or any(part in SKIP_DIRS for part in parts[:-1]):
+                continue
+            if is_ts_file(parts[-1], include_dts) and os.path.isfile(path):
+                paths.append(os.path.join(root_dir, rel))
+        return paths
+
+    paths = []
+    for dirpath, dirnames, filenames in os.walk(root_dir):
+        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+        for filename in filenames:
+            if is_ts_file(filename, include_dts):
+                paths.append(os.path.join(dirpath, filename))
+    return paths
+
+
+def git_changed_files(ref, cwd='.'):
+    """
+    Files added, modified or renamed since ref, relative to cwd.
+
+    Compares the working tree with the merge base of ref and HEAD, so both
+    commits on the branch and uncommitted edits count; untracked (not ignored)
+    files are included as additions. Deleted files are left out.
+    """
+    diff = subprocess.run(
+        ['git', 'diff', '--name-only', '--relative', '--diff-filter=AMR', '-z', '--merge-base', ref, '--'],
+        cwd=cwd, capture_output=True, check=True,
+    )
+    untracked = subprocess.run(
+        ['git', 'ls-files', '--others', '--exclude-standard', '-z'],
+        cwd=cwd, capture_output=True, check=True,
+    )
+    names = set(diff.stdout.decode('utf-8').split('\0')) | set(untracked.stdout.decode('utf-8').split('\0'))
+    names.discard('')
+    return sorted(names)
+
+
+def add_changed_since_argument(parser):
+    """Register the shared --changed-since option on an argparse parser."""
+    parser.add_argument(
+        '--changed-since',
+        metavar='REF',
+        help='only process files added, modified or renamed since this git ref (skips the tree walk)',
+    )
+
+
+def changed_files_from_args(args):
+    """The --changed-since file list, or None when the option was not given."""
+    if not args.changed_since:
+        return None
+    try:
+        return git_changed_files(args.changed_since)
+    except (OSError, subprocess.CalledProcessError) as e:
+        detail = e.stderr.decode('utf-8', errors='replace').strip() if getattr(e, 'stderr', None) else e
+        sys.exit(f"--changed-since {args.changed_since}: {detail}")
+
+
+def resolve_jobs(jobs):
+    """Turn a --jobs value into a worker count (0 or None = one per CPU)."""
+    if not jobs:
+        return os.cpu_count() or 1
+    return max(1, jobs)
+
+
+def imap_files(func, paths, jobs=1):
+    """
+    Apply func to every path, optionally across a process pool, yielding results lazily.
+
+    Results come back in the same order as paths, so the "Modified N files"
+    reports look the same whether the run was serial or parallel. func must be
+    a module-level function (or a functools.partial of one) so it can be
+    pickled into the workers.
+    """
+    jobs = resolve_jobs(jobs)
+    if jobs == 1 or len(paths) < 2:
+        for path in paths:
+            yield func(path)
+        return
+
+    # A few chunks per worker keeps the pool balanced without paying
+    # per-file IPC overhead on trees with ~1k files.
+    chunksize = max(1, len(paths) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        yield from pool.map(func, paths, chunksize=chunksize)
+
+
+def map_files(func, paths, jobs=1):
+    """Like imap_files, but returns the results as a list."""
+    return list(imap_files(func, paths, jobs))
+
+
+def add_jobs_argument(parser):
+    """Register the shared --jobs/-j option on an argparse parser."""
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=1,
+        help='number of worker processes (0 = one per CPU, default: 1)',
+    )
+
+
+# Per-file outcomes returned by the codemod workers
+SKIPPED = 'skipped'      # rejected by the literal prefilter, no regex run
+UNCHANGED = 'unchanged'  # regexes ran but produced no change
+MODIFIED = 'modified'
+ERROR = 'error'
+
+
+class RuleSet:
+    """
+    An ordered list of precompiled regex replacements behind a literal prefilter.
+
+    anchors are plain substrings that every rule needs in order to match
+    (e.g. '@supabase/'); content containing none of them is returned as-is
+    without running any regex. Rules are (pattern, replacement) or
+    (pattern, replacement, flags) tuples and are applied in order. A pattern
+    may also be a pre-built matcher with the compiled-regex interface
+    (pattern, flags, sub, subn), e.g. call_scanner.CallAssignment.
+
+    Setting profile to a RuleProfile makes apply() time and count every rule.
+    """
+
+    def __init__(self, name, rules, anchors=()):
+        self.name = name
+        self.anchors = tuple(anchors)
+        self.profile = None
+        self.rules = []
+        for rule in rules:
+            pattern, replacement = rule[0], rule[1]
+            flags = rule[2] if len(rule) > 2 else 0
+            if isinstance(pattern, str):
+                pattern = re.compile(pattern, flags)
+            self.rules.append((pattern, replacement))
+
+    @property
+    def version(self):
+        """Stable fingerprint of the rules, used to invalidate cached results."""
+        digest = hashlib.sha1(self.name.encode('utf-8'))
+        for anchor in self.anchors:
+            digest.update(b'\0a' + anchor.encode('utf-8'))
+        for pattern, replacement in self.rules:
+            key = getattr(pattern, 'fingerprint', pattern.pattern)
+            digest.update(f"\0r{key}\0{pattern.flags}\0{replacement}".encode('utf-8'))
+        return digest.hexdigest()
+
+    def prefilter(self, content):
+        """Cheap substring check: can any rule possibly match content?"""
+        if not self.anchors:
+            return True
+        return any(anchor in content for anchor in self.anchors)
+
+    def apply(self, content):
+        """Apply every rule to content (skipping the regexes if the prefilter fails)."""
+        if not self.prefilter(content):
+            return content
+        if self.profile is not None:
+            return self._apply_profiled(content)
+        for pattern, replacement in self.rules:
+            content = pattern.sub(replacement, content)
+        return content
+
+    def _apply_profiled(self, content):
+        for index, (pattern, replacement) in enumerate(self.rules):
+            start = time.perf_counter()
+            content, count = pattern.subn(replacement, content)
+            self.profile.record(self, index, time.perf_counter() - start, count)
+        return content
+
+    def rewrite(self, content):
+        """Return (new_content, status) for content."""
+        if not self.prefilter(content):
+            return content, SKIPPED
+        updated = self.apply(content)
+        return updated, (MODIFIED if updated != content else UNCHANGED)
+
+
+class SinglePassRules:
+    """
+    Ordered (pattern, replacement) rules merged into one alternation and applied in one re.sub.
+
+    At each position the first rule in list order that matches wins, so the
+    rules must not rely on each other's output. A replacement is either a
+    template (expanded against the rule's own match, so \\1 refers to the
+    rule's groups) or a callable taking that match. Patterns must not contain
+    named groups or numbered backreferences, since group numbers shift once
+    they are merged.
+
+    Quacks like a compiled regex (pattern, flags, sub, subn) so it can be the
+    single rule of a RuleSet; the rules carry their own replacements, so the
+    RuleSet replacement must be None.
+    """
+
+    def __init__(self, rules, flags=0):
+        self.rules = [(re.compile(pattern, flags), replacement) for pattern, replacement in rules]
+        self.flags = flags
+        self.pattern = '|'.join(f"(?P<r{index}>{rule.pattern})" for index, (rule, _) in enumerate(self.rules))
+        self.fingerprint = self.pattern + ''.join(f"\0{replacement!r}" for _, replacement in self.rules)
+        self.regex = re.compile(self.pattern, flags)
+
+    def _replace(self, match):
+        # r<i> is the outermost group of rule i, so it closes last
+        rule, replacement = self.rules[int(match.lastgroup[1:])]
+        # Re-match the rule on its own so its groups (and lookarounds) are its own
+        own = rule.match(match.string, match.start())
+        return replacement(own) if callable(replacement) else own.expand(replacement)
+
+    def subn(self, replacement, content):
+        assert replacement is None, 'SinglePassRules carries its own replacements'
+        return self.regex.subn(self._replace, content)
+
+    def sub(self, replacement, content):
+        return self.subn(replacement, content)[0]
+
+
+def count_statuses(statuses):
+    """Count worker outcomes, e.g. {'modified': 3, 'skipped': 870, ...}."""
+    counts = {SKIPPED: 0, UNCHANGED: 0, MODIFIED: 0, ERROR: 0}
+    for status in statuses:
+        counts[status] = counts.get(status, 0) + 1
+    return counts
+
+
+def print_prefilter_summary(statuses, label='Prefilter'):
+    """Print the whole-tree prefilter line shown at the end of each run."""
+    counts = count_statuses(statuses)
+    total = len(statuses)
+    pct = (counts[SKIPPED] / total * 100) if total else 0
+    print(f"{label}: skipped {counts[SKIPPED]} of {total} files ({pct:.1f}%) without running regexes; "
+          f"{counts[UNCHANGED]} scanned with no match, {counts[MODIFIED]} modified, {counts[ERROR]} errors")
+
+
+class RuleProfile:
+    """
+    Per-rule timing and match counts for one or more RuleSets.
+
+    Profiling happens in the process that applies the rules, so profiled
+    runs are serial (see profile_from_args).
+    """
+
+    def __init__(self, rulesets=()):
+        self.stats = {}
+        for rules in rulesets:
+            self.attach(rules)
+
+    def attach(self, rules):
+        """Start profiling a RuleSet; its rules are listed even if they never run."""
+        rules.profile = self
+        for index, (pattern, _) in enumerate(rules.rules):
+            self.stats.setdefault((rules.name, index), {
+                'ruleset': rules.name,
+                'index': index,
+                'pattern': pattern.pattern,
+                'seconds': 0.0,
+                'files_tested': 0,
+                'files_matched': 0,
+                'substitutions': 0,
+            })
+
+    def record(self, rules, index, seconds, count):
+        stats = self.stats[(rules.name, index)]
+        stats['seconds'] += seconds
+        stats['files_tested'] += 1
+        if count:
+            stats['files_matched'] += 1
+            stats['substitutions'] += count
+
+    def dead_rules(self):
+        """Rules that did not match a single file in this run."""
+        return [stats for stats in self.stats.values() if not stats['files_matched']]
+
+    def print_table(self):
+        rows = sorted(self.stats.values(), key=lambda stats: stats['seconds'], reverse=True)
+        print(f"\n{'Rule':<60} {'ms':>9} {'tested':>8} {'matched':>8} {'subs':>6}")
+        print("-" * 95)
+        for stats in rows:
+            label = f"{stats['ruleset']}[{stats['index']}] {stats['pattern']}".replace('\n', '\\n')
+            if len(label) > 60:
+                label = label[:57] + '...'
+            print(f"{label:<60} {stats['seconds'] * 1000:>9.2f} {stats['files_tested']:>8} "
+                  f"{stats['files_matched']:>8} {stats['substitutions']:>6}")
+        dead = self.dead_rules()
+        print(f"\nDead rules (no match in this run): {len(dead)} of {len(rows)}")
+        for stats in dead:
+            print(f"  - {stats['ruleset']}[{stats['index']}] {stats['pattern']}")
+
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'rules': list(self.stats.values()),
+                'dead': [[stats['ruleset'], stats['index']] for stats in self.dead_rules()],
+            }, f, indent=2)
+            f.write('\n')
+
+    def report(self, json_path=None):
+        """Print the table and, if json_path is set, write the JSON report."""
+        self.print_table()
+        if json_path:
+            self.save(json_path)
+            print(f"Rule profile written to {json_path}")
+
+
+def add_profile_arguments(parser):
+    """Register --profile/--profile-json on an argparse parser."""
+    parser.add_argument('--profile', action='store_true',
+                        help='time every rule and report match counts and dead rules (runs serially)')
+    parser.add_argument('--profile-json', metavar='FILE', help='also write the rule profile as JSON (implies --profile)')
+
+
+def profile_from_args(args, rulesets):
+    """A RuleProfile attached to rulesets if profiling was requested, else None."""
+    if not (args.profile or args.profile_json):
+        return None
+    if getattr(args, 'jobs', 1) != 1:
+        print("Profiling: running with --jobs 1 so every rule is measured in this process")
+        args.jobs = 1
+    return RuleProfile(rulesets)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Dry-run support for the codemods: stream unified diffs instead of writing files.
+
+Each file's diff is produced as soon as it has been rewritten in memory and
+written straight to stdout or a patch file, so only one file's before/after
+is held at a time. The patch uses a/ and b/ prefixes relative to the working
+directory, so running the codemod from the repo root gives a patch that
+`git apply` accepts. Per-directory line counts are printed at the end.
+"""
+
+import difflib
+import os
+import sys
+from collections import defaultdict
+
+NO_NEWLINE = '\\ No newline at end of file\n'
+
+
+def _patch_path(path):
+    return os.path.normpath(path).replace(os.sep, '/')
+
+
+def unified_patch(path, before, after):
+    """Unified diff text for one file ('' if before == after)."""
+    if before == after:
+        return ''
+    rel = _patch_path(path)
+    pieces = []
+    for line in difflib.unified_diff(before.splitlines(keepends=True), after.splitlines(keepends=True),
+                                     fromfile=f"a/{rel}", tofile=f"b/{rel}"):
+        pieces.append(line)
+        if not line.endswith('\n'):
+            pieces.append('\n' + NO_NEWLINE)
+    return ''.join(pieces)
+
+
+class PatchWriter:
+    """Streams patches to a file (or stdout) and keeps per-directory +/- counts."""
+
+    def __init__(self, patch_file=None):
+        self.patch_file = patch_file
+        self.stream = open(patch_file, 'w', encoding='utf-8') if patch_file else sys.stdout
+        self.stats = defaultdict(lambda: [0, 0, 0])  # dir -> [files, added, removed]
+
+    def write(self, path, patch):
+        """Write one file's patch text (from unified_patch) and count its lines."""
+        if not patch:
+            return
+        self.stream.write(patch)
+        # Only count inside hunks: a removed "-- x" line reads as "--- x", like the header
+        added = removed = 0
+        in_hunk = False
+        for line in patch.splitlines():
+            if line.startswith('@@'):
+                in_hunk = True
+            elif not in_hunk:
+                continue
+            elif line.startswith('+'):
+                added += 1
+            elif line.startswith('-'):
+                removed += 1
+        stats = self.stats[os.path.dirname(_patch_path(path)) or '.']
+        stats[0] += 1
+        stats[1] += added
+        stats[2] += removed
+
+    def diff(self, path, before, after):
+        """Diff before/after for path and write it."""
+        self.write(path, unified_patch(path, before, after))
+
+    def close(self):
+        if self.patch_file:
+            self.stream.close()
+        else:
+            self.stream.flush()
+
+    def print_summary(self, limit=30):
+        rows = sorted(self.stats.items(), key=lambda item: (-(item[1][1] + item[1][2]), item[0]))
+        files = sum(stats[0] for stats in self.stats.values())
+        added = sum(stats[1] for stats in self.stats.values())
+        removed = sum(stats[2] for stats in self.stats.values())
+        print(f"\nDry run: {files} files would change (+{added} -{removed}) in {len(rows)} directories")
+        for directory, (dir_files, dir_added, dir_removed) in rows[:limit]:
+            print(f"  {directory:<70} {dir_files:>5} files  +{dir_added:<6} -{dir_removed}")
+        if len(rows) > limit:
+            print(f"  ... and {len(rows) - limit} more directories")
+        if self.patch_file:
+            print(f"Patch written to {self.patch_file} (apply with: git apply {self.patch_file})")
+
+
+def add_dry_run_arguments(parser):
+    """Register --dry-run/--patch-file on an argparse parser."""
+    parser.add_argument('--dry-run', action='store_true',
+                        help='write nothing; stream unified diffs of the changes to stdout (or --patch-file)')
+    parser.add_argument('--patch-file', metavar='FILE',
+                        help='with --dry-run, write the diffs to FILE instead of stdout (implies --dry-run)')
+
+
+def patch_writer_from_args(args):
+    """A PatchWriter if a dry run was requested, else None."""
+    if not (args.dry_run or args.patch_file):
+        return None
+    return PatchWriter(args.patch_file)
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Watch mode for the codemods: re-apply rules to files as they are saved.
+
+The compiled rules and a per-file (mtime_ns, size) fingerprint stay in
+memory, so after the initial pass each save costs one stat, one read and at
+most one write. Changes come from inotify when the optional inotify_simple
+package is installed (Linux), otherwise from a stat poll of the watched dirs.
+A running tally of the @supabase/* imports still left is printed after each
+batch.
+"""
+
+import os
+import re
+import time
+from datetime import datetime
+
+from codemod_common import ERROR, MODIFIED, SKIP_DIRS, find_ts_files, is_ts_file
+
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:
+    INotify = None
+
+# `import ... from '@supabase/...'` and `export ... from '@supabase/...'`
+SUPABASE_IMPORT = re.compile(r"""\bfrom\s*['"]@supabase/""")
+
+
+def _fingerprint(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class PollingWatcher:
+    """Finds changed files by re-statting the watched trees every interval seconds."""
+
+    name = 'polling'
+
+    def __init__(self, roots, include_dts=False, interval=0.5):
+        self.roots = roots
+        self.include_dts = include_dts
+        self.interval = interval
+        self.snapshot = self._scan()
+
+    def _scan(self):
+        snapshot = {}
+        stack = list(self.roots)
+        while stack:
+            try:
+                entries = os.scandir(stack.pop())
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in SKIP_DIRS:
+                            stack.append(entry.path)
+                    elif is_ts_file(entry.name, self.include_dts):
+                        try:
+                            st = entry.stat()
+                        except OSError:
+                            continue
+                        snapshot[entry.path] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def changes(self):
+        """Block for one interval and return (changed_or_added, removed) paths."""
+        time.sleep(self.interval)
+        snapshot = self._scan()
+        changed = [path for path, fp in snapshot.items() if self.snapshot.get(path) != fp]
+        removed = [path for path in self.snapshot if path not in snapshot]
+        self.snapshot = snapshot
+        return changed, removed
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Kernel change notifications for every directory under the watched trees."""
+
+    name = 'inotify'
+
+    def __init__(self, roots, include_dts=False, interval=0.5):
+        self.include_dts = include_dts
+        self.interval = interval
+        self.inotify = INotify()
+        self.mask = (inotify_flags.CLOSE_WRITE | inotify_flags.MOVED_TO | inotify_flags.MOVED_FROM
+                     | inotify_flags.CREATE | inotify_flags.DELETE)
+        self.dirs = {}
+        for root in roots:
+            self._add_tree(root)
+
+    def _add_tree(self, root):
+        """Watch root and its subdirectories; returns the TS files already in it."""
+        found = []
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+            try:
+                self.dirs[self.inotify.add_watch(dirpath, self.mask)] = dirpath
+            except OSError:
+                continue
+            found.extend(os.path.join(dirpath, name) for name in filenames if is_ts_file(name, self.include_dts))
+        return found
+
+    def changes(self):
+        changed, removed = set(), set()
+        # read_delay coalesces the burst of events an editor save produces
+        for event in self.inotify.read(timeout=int(self.interval * 1000), read_delay=50):
+            directory = self.dirs.get(event.wd)
+            if directory is None or not event.name:
+                continue
+            path = os.path.join(directory, event.name)
+            if event.mask & inotify_flags.ISDIR:
+                if event.mask & (inotify_flags.CREATE | inotify_flags.MOVED_TO) and event.name not in SKIP_DIRS:
+                    changed.update(self._add_tree(path))
+            elif is_ts_file(event.name, self.include_dts):
+                if event.mask & (inotify_flags.DELETE | inotify_flags.MOVED_FROM):
+                    removed.add(path)
+                    changed.discard(path)
+                elif event.mask & (inotify_flags.CLOSE_WRITE | inotify_flags.MOVED_TO):
+                    changed.add(path)
+                    removed.discard(path)
+        return sorted(changed), sorted(removed)
+
+    def close(self):
+        self.inotify.close()
+
+
+def make_watcher(roots, include_dts=False, interval=0.5):
+    """inotify if available, polling otherwise."""
+    if INotify is not None:
+        try:
+            return InotifyWatcher(roots, include_dts, interval)
+        except OSError:
+            pass
+    return PollingWatcher(roots, include_dts, interval)
+
+
+class ImportTally:
+    """Running count of @supabase/* imports per file."""
+
+    def __init__(self):
+        self.counts = {}
+
+    def update(self, path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                count = len(SUPABASE_IMPORT.findall(f.read()))
+        except (OSError, UnicodeDecodeError):
+            count = 0
+        if count:
+            self.counts[path] = count
+        else:
+            self.counts.pop(path, None)
+
+    def remove(self, path):
+        self.counts.pop(path, None)
+
+    def summary(self):
+        return f"{sum(self.counts.values())} @supabase imports left in {len(self.counts)} files"
+
+
+def watch(roots, process_file, include_dts=False, interval=0.5, manifest=None):
+    """
+    Apply process_file (path -> status) to every file under roots that changes, until Ctrl-C.
+
+    Files whose fingerprint matches the one recorded after the last pass are
+    ignored, so the codemod's own writes do not trigger another pass.
+    """
+    fingerprints = {}
+    tally = ImportTally()
+    for root in roots:
+        for path in find_ts_files(root, include_dts):
+            fingerprints[path] = _fingerprint(path)
+            tally.update(path)
+
+    watcher = make_watcher(roots, include_dts, interval)
+    print(f"\n👀 Watching {', '.join(roots)} ({watcher.name}, {len(fingerprints)} files) - {tally.summary()}")
+    print("   Press Ctrl-C to stop.")
+    try:
+        while True:
+            changed, removed = watcher.changes()
+            for path in removed:
+                fingerprints.pop(path, None)
+                tally.remove(path)
+            changed = [path for path in changed if _fingerprint(path) not in (None, fingerprints.get(path))]
+            if not changed and not removed:
+                continue
+
+            start = time.perf_counter()
+            for path in changed:
+                status = process_file(path)
+                fingerprints[path] = _fingerprint(path)
+                tally.update(path)
+                if manifest is not None:
+                    manifest.record(path, status)
+                if status in (MODIFIED, ERROR):
+                    icon = '✏️ ' if status == MODIFIED else '❌'
+                    print(f"[{datetime.now():%H:%M:%S}] {icon} {path}: {status}")
+            if manifest is not None:
+                manifest.save()
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"[{datetime.now():%H:%M:%S}] {len(changed)} changed, {len(removed)} removed "
+                  f"in {elapsed:.0f}ms - {tally.summary()}")
+    except KeyboardInterrupt:
+        print(f"\n👋 Stopped watching - {tally.summary()}")
+    finally:
+        watcher.close()
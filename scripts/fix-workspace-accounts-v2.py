@@ -1,104 +1,112 @@
 #!/usr/bin/env python3
 """
-Fix ALL workspace_accounts queries to use supabaseAdmin() client.
-This is version 2 with better pattern matching.
+Fix ALL RLS-bound table queries to use the supabaseAdmin() client.
+This is version 2: rules (table -> admin client, import, declaration) come
+from admin-client-rules.json and every table is rewritten in one pass per file.
 """
 
+import argparse
 import os
-import re
+from collections import Counter
 from pathlib import Path
 
-def fix_file(file_path: Path) -> bool:
-    """Fix workspace_accounts queries in a file."""
+from admin_client_rules import AdminClientRewriter, load_rules
+from codemod_cache import add_cache_arguments, manifest_from_args, source_version
+from codemod_diff import add_dry_run_arguments, patch_writer_from_args
+from codemod_common import ERROR, MODIFIED, UNCHANGED, add_changed_since_argument, changed_files_from_args
+from table_index import DEFAULT_INDEX_FILE, load_updated
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CONFIG = os.path.join(SCRIPT_DIR, 'admin-client-rules.json')
+
+def fix_file(file_path: Path, rewriter: AdminClientRewriter, patch_writer=None) -> list:
+    """
+    Apply the admin-client rules to a file. Returns the list of changes made.
+
+    With a patch_writer the file is not written; its diff is streamed instead.
+    """
     with open(file_path, 'r', encoding='utf-8') as f:
         content = f.read()
 
-    original_content = content
-    changes_made = False
-
-    # Find all lines with .from('workspace_accounts') or .from("workspace_accounts")
-    lines = content.split('\n')
-    new_lines = []
-    admin_client_declared = 'const adminClient = supabaseAdmin()' in content
-
-    for i, line in enumerate(lines):
-        if (".from('workspace_accounts')" in line or '.from("workspace_accounts")' in line):
-            # Extract the variable name being used
-            # Pattern: await <var>.from('workspace_accounts') or <var>.from('workspace_accounts')
-            match = re.search(r'(\w+)\.from\([\'"]workspace_accounts[\'"]\)', line)
-
-            if match:
-                var_name = match.group(1)
-                # Skip if already using admin client
-                if var_name in ['adminClient', 'supabaseAdmin', 'adminSupabase']:
-                    new_lines.append(line)
-                    continue
-
-                # Replace with admin client
-                if not admin_client_declared:
-                    # Need to declare adminClient first
-                    # Find a good place (after auth check usually)
-                    indent = len(line) - len(line.lstrip())
-                    admin_declaration = ' ' * indent + 'const adminClient = supabaseAdmin()'
-
-                    # Insert admin_declaration before this line
-                    new_lines.append(admin_declaration)
-                    admin_client_declared = True
-                    changes_made = True
-
-                # Now replace the query
-                new_line = line.replace(f'{var_name}.from(\'workspace_accounts\')', 'adminClient.from(\'workspace_accounts\')')
-                new_line = new_line.replace(f'{var_name}.from("workspace_accounts")', 'adminClient.from("workspace_accounts")')
-                new_lines.append(new_line)
-                changes_made = True
-                print(f"   🔧 Line {i+1}: {var_name}.from('workspace_accounts') -> adminClient.from('workspace_accounts')")
-            else:
-                new_lines.append(line)
-        else:
-            new_lines.append(line)
+    new_content, changes = rewriter.rewrite(content)
 
-    if changes_made:
-        new_content = '\n'.join(new_lines)
+    for change in changes:
+        print(f"   🔧 Line {change.line}: {change.old_client}.from('{change.table}') -> {change.new_client}.from('{change.table}')")
+
+    if changes and patch_writer is not None:
+        patch_writer.diff(file_path, content, new_content)
+    elif changes:
         with open(file_path, 'w', encoding='utf-8') as f:
             f.write(new_content)
-        return True
-    return False
+    return changes
 
 def main():
     """Main function."""
-    print("🔧 Fixing workspace_accounts queries (v2 - better pattern matching)...")
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--config', default=DEFAULT_CONFIG, help='admin-client rules (default: scripts/admin-client-rules.json)')
+    add_cache_arguments(parser)
+    parser.add_argument('--index-file', default=DEFAULT_INDEX_FILE, help='table-usage index (see table_index.py)')
+    add_changed_since_argument(parser)
+    add_dry_run_arguments(parser)
+    args = parser.parse_args()
+    changed = changed_files_from_args(args)
+
+    rewriter = AdminClientRewriter(load_rules(args.config))
+    # Rules live in the config, so it is part of the manifest version
+    manifest = manifest_from_args(args, 'fix-workspace-accounts-v2',
+                                  source_version(__file__, os.path.join(SCRIPT_DIR, 'admin_client_rules.py'),
+                                                 os.path.join(SCRIPT_DIR, 'call_scanner.py'), args.config))
+
+    print(f"🔧 Fixing queries on {', '.join(rewriter.tables)} (v2 - rule engine)...")
     print("=" * 70)
 
-    # Find all files already modified by v1 script (they have the import)
-    api_dir = Path("app/api")
-    files_with_import = []
-
-    for ts_file in api_dir.rglob("*.ts"):
-        if ts_file.is_file():
-            try:
-                with open(ts_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    if "from '@/app/lib/supabase'" in content and "supabaseAdmin" in content:
-                        if (".from('workspace_accounts')" in content or '.from("workspace_accounts")' in content):
-                            files_with_import.append(ts_file)
-            except:
-                pass
-
-    print(f"📊 Found {len(files_with_import)} files with import but needing query fixes\n")
+    # A dry run writes nothing: no files, no index, no manifest
+    patch_writer = patch_writer_from_args(args)
+    # Only files the table-usage index says query a configured table are read
+    index = load_updated(args.index_file, ["app/api"], only=changed, save=patch_writer is None)
+    changed_set = None if changed is None else set(changed)
+    candidates = sorted({
+        path
+        for table in rewriter.tables
+        for path in index.files_for_table(table, kind='user')
+        if path.endswith('.ts') and (changed_set is None or path in changed_set)
+    })
+    files_to_process = manifest.filter(candidates)
+
+    print(f"📊 Found {len(files_to_process)} files with user-client queries on configured tables\n")
 
     fixed_count = 0
-    for file_path in files_with_import:
-        print(f"\n📝 Processing: {file_path}")
-        if fix_file(file_path):
+    per_table = Counter()
+    for rel_path in files_to_process:
+        print(f"\n📝 Processing: {rel_path}")
+        try:
+            changes = fix_file(Path(rel_path), rewriter, patch_writer)
+        except Exception as e:
+            print(f"   ❌ Error: {e}")
+            manifest.record(rel_path, ERROR)
+            continue
+        if changes:
             fixed_count += 1
+            per_table.update(change.table for change in changes)
             print(f"   ✅ Fixed!")
         else:
             print(f"   ⏭️  No changes needed (already using admin client)")
+        manifest.record(rel_path, MODIFIED if changes else UNCHANGED)
+    if patch_writer is None:
+        manifest.save()
 
     print("\n" + "=" * 70)
     print(f"📊 Summary:")
     print(f"   ✅ Fixed: {fixed_count} files")
-    print("\n✅ Done! Review changes with: git diff app/api")
+    for table in rewriter.tables:
+        print(f"   🔧 {table}: {per_table[table]} queries switched to admin client")
+    print(f"   {manifest.summary(len(candidates))}")
+    if patch_writer:
+        patch_writer.close()
+        patch_writer.print_summary()
+        print("\n✅ Dry run done - no files were written")
+    else:
+        print("\n✅ Done! Review changes with: git diff app/api")
 
 if __name__ == "__main__":
     main()
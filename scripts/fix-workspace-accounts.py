@@ -4,10 +4,15 @@ Fix all workspace_accounts queries to use supabaseAdmin() client.
 This resolves RLS policy issues causing "No LinkedIn account connected" errors.
 """
 
+import argparse
 import os
 import re
 from pathlib import Path
 
+from codemod_cache import add_cache_arguments, manifest_from_args, source_version
+from codemod_common import ERROR, MODIFIED, UNCHANGED, add_changed_since_argument, changed_files_from_args
+from table_index import DEFAULT_INDEX_FILE, load_updated
+
 # Files already fixed (skip these)
 FIXED_FILES = {
     "app/api/database/create-workspace-accounts/route.ts",
@@ -81,8 +86,8 @@ def fix_workspace_accounts_queries(content: str) -> tuple[str, int]:
 
     return content, changes
 
-def process_file(file_path: Path) -> bool:
-    """Process a single file. Returns True if changes were made."""
+def process_file(file_path: Path) -> bool | None:
+    """Process a single file. Returns True if changes were made, None on error."""
     print(f"\n📝 Processing: {file_path}")
 
     try:
@@ -116,43 +121,52 @@ def process_file(file_path: Path) -> bool:
 
     except Exception as e:
         print(f"   ❌ Error: {e}")
-        return False
+        return None
 
 def main():
     """Main function."""
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    add_cache_arguments(parser)
+    parser.add_argument('--index-file', default=DEFAULT_INDEX_FILE, help='table-usage index (see table_index.py)')
+    add_changed_since_argument(parser)
+    args = parser.parse_args()
+    changed = changed_files_from_args(args)
+    manifest = manifest_from_args(args, 'fix-workspace-accounts', source_version(__file__))
+
     print("🔧 Fixing workspace_accounts queries in all API routes...")
     print("=" * 50)
 
-    # Find all TypeScript files in app/api that contain workspace_accounts
-    api_dir = Path("app/api")
+    # Find all TypeScript files in app/api that query workspace_accounts,
+    # via the table-usage index (only files changed since the last run are read)
+    index = load_updated(args.index_file, ["app/api"], only=changed)
+    candidates = [path for path in index.files_for_table('workspace_accounts') if path.endswith('.ts')]
+    if changed is not None:
+        changed_set = set(changed)
+        candidates = [path for path in candidates if path in changed_set]
     files_to_process = []
 
-    for ts_file in api_dir.rglob("*.ts"):
-        if ts_file.is_file():
-            try:
-                with open(ts_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    if ".from('workspace_accounts')" in content or '.from("workspace_accounts")' in content:
-                        rel_path = str(ts_file)
-                        if rel_path not in FIXED_FILES:
-                            files_to_process.append(ts_file)
-                        else:
-                            print(f"⏭️  Skipping (already fixed): {rel_path}")
-            except:
-                pass
+    for rel_path in candidates:
+        if rel_path in FIXED_FILES:
+            print(f"⏭️  Skipping (already fixed): {rel_path}")
+        elif not manifest.is_noop(rel_path):
+            files_to_process.append(Path(rel_path))
 
     print(f"\n📊 Found {len(files_to_process)} files to process\n")
 
     fixed_count = 0
     for file_path in files_to_process:
-        if process_file(file_path):
+        result = process_file(file_path)
+        if result:
             fixed_count += 1
+        manifest.record(file_path, {True: MODIFIED, False: UNCHANGED}.get(result, ERROR))
+    manifest.save()
 
     print("\n" + "=" * 50)
     print(f"📊 Summary:")
     print(f"   ✅ Fixed: {fixed_count} files")
     print(f"   ⏭️  Skipped: {len(FIXED_FILES)} files (already fixed)")
     print(f"   📝 Total processed: {len(files_to_process)} files")
+    print(f"   {manifest.summary(len(candidates))}")
     print("\n✅ Done! Please review changes with: git diff app/api")
 
 if __name__ == "__main__":
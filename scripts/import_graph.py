@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Persistent import graph for app/ and lib/: which module every TS/TSX file
+imports, and - reversed - which files (transitively) depend on a module.
+
+Every import/export-from, side-effect import, dynamic import() and require()
+specifier is recorded per file in .import-graph.json, which is updated
+incrementally like the table-usage index: files whose stat fingerprint (or,
+failing that, content hash) is unchanged are not re-read. Specifiers are
+resolved in memory against the indexed files ('@/' is the repo root, as in
+tsconfig.json), so queries never touch the filesystem.
+
+Examples:
+    python scripts/import_graph.py                          # update + summary
+    python scripts/import_graph.py --dependents @supabase/ssr
+    python scripts/import_graph.py --dependents @/lib/db --direct
+    python scripts/import_graph.py --imports app/api/campaigns/route.ts
+    python scripts/import_graph.py --remaining --json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import posixpath
+import re
+import time
+from collections import Counter, defaultdict, deque
+
+from codemod_common import find_ts_files
+
+DEFAULT_GRAPH_FILE = '.import-graph.json'
+DEFAULT_DIRS = ['app', 'lib']
+GRAPH_FORMAT = 1
+
+# Modules the Supabase migration moves away from; a file importing any of
+# these directly is still to be migrated.
+LEGACY_MODULES = ['@supabase/', '@/app/lib/supabase']
+
+# from 'x' (import/export ... from), import 'x', import('x'), require('x')
+SPECIFIER = re.compile(
+    r"""\bfrom\s*(['"])([^'"\n]+)\1"""
+    r"""|\bimport\s*(?:\(\s*)?(['"])([^'"\n]+)\3"""
+    r"""|\brequire\s*\(\s*(['"])([^'"\n]+)\5"""
+)
+EXTENSIONS = ['.ts', '.tsx', '.d.ts', '.js', '.jsx']
+INDEX_FILES = ['/index' + ext for ext in EXTENSIONS]
+
+
+def scan_content(content):
+    """Return the distinct module specifiers content imports, in source order."""
+    specs = []
+    seen = set()
+    for match in SPECIFIER.finditer(content):
+        spec = match.group(2) or match.group(4) or match.group(6)
+        if spec not in seen:
+            seen.add(spec)
+            specs.append(spec)
+    return specs
+
+
+def _to_posix(path):
+    return path.replace(os.sep, '/')
+
+
+class ImportGraph:
+    """On-disk map of path -> import specifiers, with in-memory resolved edges."""
+
+    def __init__(self, graph_file=DEFAULT_GRAPH_FILE):
+        self.graph_file = graph_file
+        self.files = {}
+        self.rescanned = 0
+        self._edges = None
+        self._reverse = None
+
+    @classmethod
+    def load(cls, graph_file=DEFAULT_GRAPH_FILE):
+        graph = cls(graph_file)
+        try:
+            with open(graph_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('format') == GRAPH_FORMAT:
+                graph.files = data.get('files', {})
+        except (OSError, ValueError):
+            pass
+        return graph
+
+    def save(self):
+        tmp_file = f"{self.graph_file}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'format': GRAPH_FORMAT, 'files': self.files}, f, separators=(',', ':'))
+        os.replace(tmp_file, self.graph_file)
+
+    def update_file(self, path):
+        """Refresh one file's entry; only reads it if its stat fingerprint moved."""
+        st = os.stat(path)
+        fingerprint = [st.st_mtime_ns, st.st_size]
+        key = _to_posix(os.path.normpath(path))
+        entry = self.files.get(key)
+        if entry and entry['stat'] == fingerprint:
+            return
+        with open(path, 'rb') as f:
+            data = f.read()
+        digest = hashlib.sha1(data).hexdigest()
+        if entry and entry['sha1'] == digest:
+            entry['stat'] = fingerprint
+            return
+        self.files[key] = {
+            'stat': fingerprint,
+            'sha1': digest,
+            'imports': scan_content(data.decode('utf-8', errors='replace')),
+        }
+        self.rescanned += 1
+        self._edges = self._reverse = None
+
+    def update(self, dirs=DEFAULT_DIRS, only=None):
+        """Bring the graph in line with the files under dirs (or just the only files)."""
+        seen = set()
+        for directory in dirs:
+            for path in find_ts_files(directory, include_dts=True, only=only):
+                seen.add(_to_posix(os.path.normpath(path)))
+                self.update_file(path)
+        if only is not None:
+            return
+        prefixes = tuple(_to_posix(os.path.join(os.path.normpath(directory), '')) for directory in dirs)
+        for path in list(self.files):
+            if path.startswith(prefixes) and path not in seen:
+                del self.files[path]
+                self._edges = self._reverse = None
+
+    # --- Resolution ---------------------------------------------------------
+
+    def resolve(self, spec, importer=''):
+        """
+        Map a specifier to a graph node.
+
+        Local specifiers ('@/...', './...', '../...') become repo-relative
+        paths, with the extension/index file filled in when the target is
+        indexed; anything else is a package and keeps its specifier.
+        """
+        if spec.startswith('@/'):
+            base = spec[2:]
+        elif spec.startswith('.'):
+            base = posixpath.normpath(posixpath.join(posixpath.dirname(importer), spec))
+        else:
+            return spec
+        if base in self.files:
+            return base
+        for suffix in EXTENSIONS + INDEX_FILES:
+            if base + suffix in self.files:
+                return base + suffix
+        return base
+
+    def _build(self):
+        edges = {}
+        reverse = defaultdict(set)
+        for path, entry in self.files.items():
+            targets = {self.resolve(spec, path) for spec in entry['imports']}
+            edges[path] = targets
+            for target in targets:
+                reverse[target].add(path)
+        self._edges, self._reverse = edges, reverse
+
+    @property
+    def edges(self):
+        if self._edges is None:
+            self._build()
+        return self._edges
+
+    @property
+    def reverse(self):
+        if self._reverse is None:
+            self._build()
+        return self._reverse
+
+    def match_nodes(self, target):
+        """
+        Graph nodes a query names: a local module ('@/lib/db', 'lib/db.ts'),
+        a package ('@supabase/ssr') or a package prefix ending in '/'
+        ('@supabase/' matches every @supabase package).
+        """
+        if target.startswith(('@/', '.')):
+            return {self.resolve(target)}
+        if target.endswith('/'):
+            return {node for node in self.reverse if node.startswith(target)}
+        local = self.resolve('@/' + target)
+        if local in self.files:
+            return {local}
+        return {target} | {node for node in self.reverse if node.startswith(target + '/')}
+
+    # --- Queries ------------------------------------------------------------
+
+    def imports_of(self, path):
+        """Resolved modules path imports directly."""
+        return sorted(self.edges.get(_to_posix(os.path.normpath(path)), ()))
+
+    def dependents(self, targets, transitive=True):
+        """Sorted indexed files that import any of targets (directly, or through other files)."""
+        nodes = set()
+        for target in targets:
+            nodes |= self.match_nodes(target)
+        found = set()
+        queue = deque(nodes)
+        while queue:
+            for importer in self.reverse.get(queue.popleft(), ()):
+                if importer not in found:
+                    found.add(importer)
+                    if transitive:
+                        queue.append(importer)
+        return sorted(found)
+
+    def remaining(self, modules=LEGACY_MODULES):
+        """{'direct': files importing a legacy module, 'transitive': files depending on one}."""
+        return {
+            'direct': self.dependents(modules, transitive=False),
+            'transitive': self.dependents(modules),
+        }
+
+
+def load_updated(graph_file=DEFAULT_GRAPH_FILE, dirs=DEFAULT_DIRS, only=None, save=True):
+    """Load the graph, refresh it against the tree and persist it unless save is False."""
+    graph = ImportGraph.load(graph_file)
+    graph.update(dirs, only)
+    if save:
+        graph.save()
+    return graph
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Index and query the import graph of app/ and lib/')
+    parser.add_argument('dirs', nargs='*', default=DEFAULT_DIRS, help='directories to index (default: app lib)')
+    parser.add_argument('--graph-file', default=DEFAULT_GRAPH_FILE)
+    parser.add_argument('--dependents', nargs='+', metavar='MODULE',
+                        help='files that depend on these modules (e.g. @supabase/ssr, @supabase/, @/lib/db)')
+    parser.add_argument('--direct', action='store_true', help='with --dependents, only direct importers')
+    parser.add_argument('--imports', metavar='FILE', help='modules FILE imports directly')
+    parser.add_argument('--remaining', action='store_true',
+                        help=f"files still importing {' or '.join(LEGACY_MODULES)} (directly and transitively)")
+    parser.add_argument('--json', action='store_true', help='print the query result as JSON')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    graph = load_updated(args.graph_file, args.dirs)
+    loaded = time.perf_counter()
+
+    if args.dependents:
+        result = graph.dependents(args.dependents, transitive=not args.direct)
+    elif args.imports:
+        result = graph.imports_of(args.imports)
+    elif args.remaining:
+        result = graph.remaining()
+    else:
+        result = None
+    query_ms = (time.perf_counter() - loaded) * 1000
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    if isinstance(result, dict):
+        for path in result['direct']:
+            print(path)
+        print(f"\n{len(result['direct'])} files still import {' / '.join(LEGACY_MODULES)} directly; "
+              f"{len(result['transitive'])} depend on them transitively")
+    elif result is not None:
+        for path in result:
+            print(path)
+        print(f"\n{len(result)} {'modules' if args.imports else 'files'}")
+    else:
+        packages = Counter(
+            target for targets in graph.edges.values() for target in targets
+            if not target.startswith(('app/', 'lib/')) and target not in graph.files
+        )
+        edge_count = sum(len(targets) for targets in graph.edges.values())
+        print(f"{'Most imported modules outside app/ and lib/':<60} {'files':>6}")
+        print("-" * 67)
+        for module, count in packages.most_common(20):
+            print(f"{module:<60} {count:>6}")
+        print(f"\n{len(graph.files)} files, {edge_count} import edges")
+
+    print(f"\nIndexed {len(graph.files)} files ({graph.rescanned} rescanned) in "
+          f"{(loaded - start) * 1000:.0f}ms, query {query_ms:.1f}ms -> {args.graph_file}")
+
+
+if __name__ == '__main__':
+    main()
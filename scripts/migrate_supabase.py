@@ -3,89 +3,155 @@
 Complete removal of Supabase dependencies - Migrates to Firebase + PostgreSQL pool
 """
 
+import argparse
 import os
-import re
-import sys
+from functools import partial
 
-def replace_in_file(filepath, replacements):
-    """Apply multiple replacements to a file."""
+from codemod_common import (
+    ERROR, MODIFIED, RuleSet, add_changed_since_argument, add_jobs_argument,
+    add_profile_arguments, changed_files_from_args, find_ts_files, imap_files,
+    map_files, print_prefilter_summary, profile_from_args,
+)
+from codemod_cache import add_cache_arguments, manifest_from_args
+from codemod_diff import add_dry_run_arguments, patch_writer_from_args, unified_patch
+from codemod_watch import watch
+from import_graph import load_updated as load_import_graph
+
+def replace_in_file(filepath, rules, dry_run=False):
+    """
+    Apply a RuleSet to a file. Returns the per-file status (MODIFIED, SKIPPED, ...).
+
+    With dry_run the file is left alone and (status, patch) is returned, patch
+    being the unified diff of the change ('' if there is none).
+    """
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
+            original = f.read()
         
-        original = content
-        for pattern, replacement in replacements:
-            content = re.sub(pattern, replacement, content)
+        content, status = rules.rewrite(original)
         
-        if content != original:
+        if dry_run:
+            return status, (unified_patch(filepath, original, content) if status == MODIFIED else '')
+        if status == MODIFIED:
             with open(filepath, 'w', encoding='utf-8') as f:
                 f.write(content)
-            return True
-        return False
+        return status
     except Exception as e:
         print(f"Error processing {filepath}: {e}")
-        return False
+        return (ERROR, '') if dry_run else ERROR
 
-def process_files(root_dir):
-    """Process all TypeScript files."""
-    
-    # Replacements for imports
-    import_replacements = [
-        # Replace @supabase/ssr imports
-        (r"import \{ createServerClient \} from '@supabase/ssr';?", 
-         "import { pool } from '@/lib/db';"),
-        (r"import \{ createBrowserClient \} from '@supabase/ssr';?", 
-         "import { getFirebaseAuth } from '@/lib/firebase';"),
-        
-        # Replace @supabase/supabase-js imports
-        (r"import \{ createClient \} from '@supabase/supabase-js';?", 
-         "import { pool } from '@/lib/db';"),
-        (r"import \{ createClient as createServiceClient \} from '@supabase/supabase-js';?",
-         "import { pool } from '@/lib/db';"),
-        (r"import \{ createClient as createServerClient \} from '@supabase/supabase-js';?",
-         "import { pool } from '@/lib/db';"),
-        (r"import \{ createClient as createAdminClient \} from '@supabase/supabase-js';?",
-         "import { pool } from '@/lib/db';"),
-        (r"import type \{ SupabaseClient \} from '@supabase/supabase-js';?",
-         "import type { Pool } from 'pg';"),
-        (r"import \{ SupabaseClient \} from '@supabase/supabase-js';?",
-         "import { Pool } from 'pg';"),
-        
-        # Replace @supabase/auth-helpers-nextjs imports
-        (r"import \{ createClientComponentClient \} from '@supabase/auth-helpers-nextjs';?",
-         "import { getFirebaseAuth } from '@/lib/firebase';"),
-        (r"import \{ createRouteHandlerClient \} from '@supabase/auth-helpers-nextjs';?",
-         "import { pool } from '@/lib/db';"),
-    ]
+# Replacements for imports
+IMPORT_REPLACEMENTS = [
+    # Replace @supabase/ssr imports
+    (r"import \{ createServerClient \} from '@supabase/ssr';?", 
+     "import { pool } from '@/lib/db';"),
+    (r"import \{ createBrowserClient \} from '@supabase/ssr';?", 
+     "import { getFirebaseAuth } from '@/lib/firebase';"),
     
-    changed_files = []
-    
-    for dirpath, dirnames, filenames in os.walk(root_dir):
-        # Skip node_modules and .next
-        dirnames[:] = [d for d in dirnames if d not in ['node_modules', '.next', '.git']]
-        
-        for filename in filenames:
-            if filename.endswith(('.ts', '.tsx')) and not filename.endswith('.d.ts'):
-                filepath = os.path.join(dirpath, filename)
-                if replace_in_file(filepath, import_replacements):
-                    changed_files.append(filepath)
+    # Replace @supabase/supabase-js imports
+    (r"import \{ createClient \} from '@supabase/supabase-js';?", 
+     "import { pool } from '@/lib/db';"),
+    (r"import \{ createClient as createServiceClient \} from '@supabase/supabase-js';?",
+     "import { pool } from '@/lib/db';"),
+    (r"import \{ createClient as createServerClient \} from '@supabase/supabase-js';?",
+     "import { pool } from '@/lib/db';"),
+    (r"import \{ createClient as createAdminClient \} from '@supabase/supabase-js';?",
+     "import { pool } from '@/lib/db';"),
+    (r"import type \{ SupabaseClient \} from '@supabase/supabase-js';?",
+     "import type { Pool } from 'pg';"),
+    (r"import \{ SupabaseClient \} from '@supabase/supabase-js';?",
+     "import { Pool } from 'pg';"),
     
-    return changed_files
+    # Replace @supabase/auth-helpers-nextjs imports
+    (r"import \{ createClientComponentClient \} from '@supabase/auth-helpers-nextjs';?",
+     "import { getFirebaseAuth } from '@/lib/firebase';"),
+    (r"import \{ createRouteHandlerClient \} from '@supabase/auth-helpers-nextjs';?",
+     "import { pool } from '@/lib/db';"),
+]
+
+# Every import pattern above contains '@supabase/', so files without it are
+# skipped before any regex runs (the vast majority of the tree).
+IMPORT_RULES = RuleSet('supabase-imports', IMPORT_REPLACEMENTS, anchors=['@supabase/'])
+
+def migrate_paths(paths, jobs=1, patch_writer=None):
+    """
+    Apply the import rules to paths, returning one status per path.
+
+    With a patch_writer nothing is written; each file's diff is streamed to
+    it as soon as its result comes back from the pool.
+    """
+    if patch_writer is None:
+        return map_files(partial(replace_in_file, rules=IMPORT_RULES), paths, jobs)
+    statuses = []
+    for path, (status, patch) in zip(paths, imap_files(partial(replace_in_file, rules=IMPORT_RULES, dry_run=True),
+                                                       paths, jobs)):
+        patch_writer.write(path, patch)
+        statuses.append(status)
+    return statuses
+
+def process_files(root_dir, jobs=1):
+    """Process all TypeScript files."""
+    paths = find_ts_files(root_dir)
+    statuses = migrate_paths(paths, jobs)
+    return [path for path, status in zip(paths, statuses) if status == MODIFIED]
 
 if __name__ == '__main__':
-    root = sys.argv[1] if len(sys.argv) > 1 else '.'
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('root', nargs='?', default='.', help='repository root (default: .)')
+    add_jobs_argument(parser)
+    add_cache_arguments(parser)
+    add_changed_since_argument(parser)
+    parser.add_argument('--watch', action='store_true',
+                        help='after the initial pass, keep running and re-apply the rules to files as they change')
+    parser.add_argument('--interval', type=float, default=0.5, help='watch poll interval in seconds (default: 0.5)')
+    add_profile_arguments(parser)
+    add_dry_run_arguments(parser)
+    parser.add_argument('--from-graph', action='store_true',
+                        help='only process files the import graph (import_graph.py) says import an @supabase/ package')
+    args = parser.parse_args()
+    if args.watch and (args.dry_run or args.patch_file):
+        parser.error('--watch cannot be combined with --dry-run/--patch-file')
+    root = args.root
+    profile = profile_from_args(args, [IMPORT_RULES])
+    changed = changed_files_from_args(args)
+    # A dry run writes nothing: no files, no graph, no manifest
+    patch_writer = patch_writer_from_args(args)
+    if args.from_graph:
+        # Every import rule needs an @supabase/ import, so only direct importers can change
+        graph = load_import_graph(dirs=[os.path.join(root, 'app'), os.path.join(root, 'lib')],
+                                  save=patch_writer is None)
+        importers = graph.dependents(['@supabase/'], transitive=False)
+        changed = importers if changed is None else sorted(set(importers) & set(changed))
     
     print("Processing app/ and lib/ directories...")
     
-    app_changes = process_files(os.path.join(root, 'app'))
-    lib_changes = process_files(os.path.join(root, 'lib'))
-    
-    all_changes = app_changes + lib_changes
+    # One file list for both trees so a single pool covers the whole run
+    all_paths = (find_ts_files(os.path.join(root, 'app'), only=changed)
+                 + find_ts_files(os.path.join(root, 'lib'), only=changed))
+    manifest = manifest_from_args(args, 'migrate_supabase', IMPORT_RULES.version)
+    paths = manifest.filter(all_paths)
+    statuses = migrate_paths(paths, args.jobs, patch_writer)
+    manifest.record_all(paths, statuses)
+    if patch_writer is None:
+        manifest.save()
+    all_changes = [path for path, status in zip(paths, statuses) if status == MODIFIED]
     
-    print(f"\nModified {len(all_changes)} files:")
+    print(f"\n{'Would modify' if patch_writer else 'Modified'} {len(all_changes)} files:")
     for f in all_changes[:20]:
         print(f"  - {f}")
     if len(all_changes) > 20:
         print(f"  ... and {len(all_changes) - 20} more")
     
+    print()
+    print_prefilter_summary(statuses)
+    print(manifest.summary(len(all_paths)))
+    if profile:
+        profile.report(args.profile_json)
+    if patch_writer:
+        patch_writer.close()
+        patch_writer.print_summary()
+
+    if args.watch:
+        watch([os.path.join(root, 'app'), os.path.join(root, 'lib')],
+              partial(replace_in_file, rules=IMPORT_RULES), interval=args.interval, manifest=manifest)
     print("\nDone!")
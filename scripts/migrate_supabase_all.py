@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Run migrate_supabase phases 1-3 as a single pass (one read + at most one write per file)
+"""
+
+import argparse
+import os
+from functools import partial
+
+import migrate_supabase
+import migrate_supabase_phase2
+import migrate_supabase_phase3
+from codemod_common import (
+    ERROR, MODIFIED, UNCHANGED, add_changed_since_argument, add_jobs_argument,
+    add_profile_arguments, changed_files_from_args, find_ts_files, map_files,
+    print_prefilter_summary, profile_from_args,
+)
+from codemod_cache import add_cache_arguments, manifest_from_args, source_version
+
+PHASES = [
+    ('Phase 1: @supabase imports', migrate_supabase.IMPORT_RULES),
+    ('Phase 2: createClient() calls', migrate_supabase_phase2.CREATE_CLIENT_RULES),
+    ('Phase 3: multi-line createClient calls', migrate_supabase_phase3.MULTILINE_RULES),
+]
+
+# Each phase keeps the file scope of its standalone script:
+#   phase 1 - app/ and lib/, no .d.ts
+#   phase 2 - whole tree, no .d.ts
+#   phase 3 - whole tree, .d.ts included
+def phases_for(filepath, root):
+    """Return which phases apply to filepath, mirroring the standalone scripts."""
+    rel = os.path.relpath(filepath, root)
+    is_dts = filepath.endswith('.d.ts')
+    in_app_or_lib = rel.split(os.sep, 1)[0] in ('app', 'lib')
+    return (in_app_or_lib and not is_dts, not is_dts, True)
+
+def migrate_file(filepath, root='.'):
+    """
+    Apply every applicable phase to one file in memory.
+
+    Returns a tuple with one status per phase (None where the phase does not
+    cover this file), or None if the file could not be processed. The file is written once, only if the final content
+    differs, so a file is never left half-migrated between phases.
+    """
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        original = content
+        statuses = []
+        for (_, rules), enabled in zip(PHASES, phases_for(filepath, root)):
+            if enabled:
+                content, status = rules.rewrite(content)
+            else:
+                status = None
+            statuses.append(status)
+
+        if content != original:
+            with open(filepath, 'w', encoding='utf-8') as f:
+                f.write(content)
+        return tuple(statuses)
+    except Exception as e:
+        print(f"Error processing {filepath}: {e}")
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('root', nargs='?', default='.', help='repository root (default: .)')
+    add_jobs_argument(parser)
+    add_cache_arguments(parser)
+    add_changed_since_argument(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    profile = profile_from_args(args, [rules for _, rules in PHASES])
+
+    all_paths = find_ts_files(args.root, include_dts=True, only=changed_files_from_args(args))
+    # Phase scoping lives in this file, so its source is part of the version
+    rules_version = '+'.join([rules.version for _, rules in PHASES] + [source_version(__file__)])
+    manifest = manifest_from_args(args, 'migrate_supabase_all', rules_version)
+    paths = manifest.filter(all_paths)
+    results = map_files(partial(migrate_file, root=args.root), paths, args.jobs)
+    for path, result in zip(paths, results):
+        if result is None:
+            manifest.record(path, ERROR)
+        else:
+            manifest.record(path, MODIFIED if MODIFIED in result else UNCHANGED)
+    manifest.save()
+
+    for index, (title, _) in enumerate(PHASES):
+        statuses = [result[index] if result else ERROR for result in results]
+        changed = [path for path, status in zip(paths, statuses) if status == MODIFIED]
+        print(f"\n{title}")
+        print(f"Modified {len(changed)} files:")
+        for f in changed[:20]:
+            print(f"  - {f}")
+        if len(changed) > 20:
+            print(f"  ... and {len(changed) - 20} more")
+        print_prefilter_summary([status for status in statuses if status is not None])
+
+    written = sum(1 for result in results if result and MODIFIED in result)
+    print(f"\nWrote {written} files ({len(paths)} scanned, each read once)")
+    print(manifest.summary(len(all_paths)))
+    if profile:
+        profile.report(args.profile_json)
+    print("\nDone!")
+
+if __name__ == '__main__':
+    main()
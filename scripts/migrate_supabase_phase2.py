@@ -3,8 +3,27 @@
 Phase 2: Replace createClient() calls with pool usage
 """
 
-import os
-import re
+import argparse
+
+from call_scanner import CallAssignment
+from codemod_common import (
+    ERROR, MODIFIED, RuleSet, add_changed_since_argument, add_jobs_argument,
+    add_profile_arguments, changed_files_from_args, find_ts_files, map_files,
+    print_prefilter_summary, profile_from_args,
+)
+from codemod_cache import add_cache_arguments, manifest_from_args
+
+# Remove createClient variable assignments like:
+#   const supabase = createClient(...)
+#   const pool = createClient(...)
+# (single- or multi-line) plus `const supabase = createServerClient(...)`.
+# Calls are matched with the balanced-bracket scanner instead of [^)]*, so
+# nested calls in the arguments no longer cause partial matches.
+CREATE_CLIENT_RULES = RuleSet('phase2-createClient', [
+    (CallAssignment(['createClient'], ['supabase', 'poolClient', 'adminClient', 'serviceClient'],
+                    trailing=r'[;\n\s]*'), ''),
+    (CallAssignment(['createServerClient'], ['supabase'], trailing=r'[;\n\s]*'), ''),
+], anchors=['createClient', 'createServerClient'])
 
 def process_file(filepath):
     """Process a single file to replace createClient patterns."""
@@ -12,54 +31,42 @@ def process_file(filepath):
         with open(filepath, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        original = content
-        
-        # Remove createClient variable assignments like:
-        # const supabase = createClient(...)
-        # const pool = createClient(...)
-        content = re.sub(
-            r'const\s+(?:supabase|poolClient|adminClient|serviceClient)\s*=\s*createClient\([^)]*\)[;\n\s]*',
-            '',
-            content
-        )
+        content, status = CREATE_CLIENT_RULES.rewrite(content)
         
-        # Remove multi-line createClient calls
-        content = re.sub(
-            r'const\s+(?:supabase|poolClient|adminClient|serviceClient)\s*=\s*createClient\(\s*\n[^)]*\)[;\n\s]*',
-            '',
-            content, 
-            flags=re.MULTILINE
-        )
-        
-        # Replace createServerClient calls
-        content = re.sub(
-            r'const\s+supabase\s*=\s*createServerClient\([^)]*\{[^}]*\}[^)]*\)[;\n\s]*',
-            '',
-            content,
-            flags=re.DOTALL
-        )
-        
-        if content != original:
+        if status == MODIFIED:
             with open(filepath, 'w', encoding='utf-8') as f:
                 f.write(content)
-            return True
-        return False
+        return status
     except Exception as e:
         print(f"Error processing {filepath}: {e}")
-        return False
+        return ERROR
 
 def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    add_jobs_argument(parser)
+    add_cache_arguments(parser)
+    add_changed_since_argument(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    profile = profile_from_args(args, [CREATE_CLIENT_RULES])
+
+    all_paths = find_ts_files('.', only=changed_files_from_args(args))
+    manifest = manifest_from_args(args, 'migrate_supabase_phase2', CREATE_CLIENT_RULES.version)
+    paths = manifest.filter(all_paths)
+    statuses = map_files(process_file, paths, args.jobs)
+    manifest.record_all(paths, statuses)
+    manifest.save()
     changed = 0
-    for root, dirs, files in os.walk('.'):
-        dirs[:] = [d for d in dirs if d not in ['node_modules', '.next', '.git']]
-        for f in files:
-            if f.endswith(('.ts', '.tsx')) and not f.endswith('.d.ts'):
-                path = os.path.join(root, f)
-                if process_file(path):
-                    changed += 1
-                    print(f"Fixed: {path}")
+    for path, status in zip(paths, statuses):
+        if status == MODIFIED:
+            changed += 1
+            print(f"Fixed: {path}")
     
     print(f"\nModified {changed} files")
+    print_prefilter_summary(statuses)
+    print(manifest.summary(len(all_paths)))
+    if profile:
+        profile.report(args.profile_json)
 
 if __name__ == '__main__':
     main()
@@ -2,45 +2,66 @@
 """
 Remove multi-line createClient calls
 """
-import os
-import re
+import argparse
+
+from call_scanner import CallAssignment
+from codemod_common import (
+    ERROR, MODIFIED, RuleSet, add_changed_since_argument, add_jobs_argument,
+    add_profile_arguments, changed_files_from_args, find_ts_files, map_files,
+    print_prefilter_summary, profile_from_args,
+)
+from codemod_cache import add_cache_arguments, manifest_from_args
+
+# Multi-line createClient patterns
+MULTILINE_RULES = RuleSet('phase3-multiline-createClient', [
+    # const x = createClient(\n  url,\n  key\n) - never an argument-less createClient()
+    (CallAssignment(['createClient'],
+                    ['supabaseAdmin', 'supabaseAdminClient', 'userSupabase', 'adminClient', 'serviceClient', 'supabase'],
+                    trailing=r'\s*;?\s*\n?', require_args=True),
+     '// Pool imported from lib/db\n'),
+], anchors=['createClient'])
 
 def process_file(filepath):
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        original = content
-        
-        # Multi-line createClient patterns
-        patterns = [
-            # const x = createClient(\n  url,\n  key\n)
-            r'const\s+(?:supabaseAdmin|supabaseAdminClient|userSupabase|adminClient|serviceClient|supabase)\s*=\s*createClient\s*\([^)]+\)\s*;?\s*\n?',
-        ]
+        content, status = MULTILINE_RULES.rewrite(content)
         
-        for p in patterns:
-            content = re.sub(p, '// Pool imported from lib/db\n', content, flags=re.DOTALL | re.MULTILINE)
-        
-        if content != original:
+        if status == MODIFIED:
             with open(filepath, 'w', encoding='utf-8') as f:
                 f.write(content)
-            return True
-        return False
+        return status
     except Exception as e:
         print(f"Error: {filepath}: {e}")
-        return False
+        return ERROR
 
 def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    add_jobs_argument(parser)
+    add_cache_arguments(parser)
+    add_changed_since_argument(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    profile = profile_from_args(args, [MULTILINE_RULES])
+
+    all_paths = find_ts_files('.', include_dts=True, only=changed_files_from_args(args))
+    manifest = manifest_from_args(args, 'migrate_supabase_phase3', MULTILINE_RULES.version)
+    paths = manifest.filter(all_paths)
+    statuses = map_files(process_file, paths, args.jobs)
+    manifest.record_all(paths, statuses)
+    manifest.save()
     changed = 0
-    for root, dirs, files in os.walk('.'):
-        dirs[:] = [d for d in dirs if d not in ['node_modules', '.next', '.git']]
-        for f in files:
-            if f.endswith('.ts') or f.endswith('.tsx'):
-                path = os.path.join(root, f)
-                if process_file(path):
-                    changed += 1
-                    print(f"Fixed: {path}")
+    for path, status in zip(paths, statuses):
+        if status == MODIFIED:
+            changed += 1
+            print(f"Fixed: {path}")
+    
     print(f"\nModified {changed} files")
+    print_prefilter_summary(statuses)
+    print(manifest.summary(len(all_paths)))
+    if profile:
+        profile.report(args.profile_json)
 
 if __name__ == '__main__':
     main()
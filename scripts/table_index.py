@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Persistent index of Supabase table usage: every .from('<table>') call under
+app/api with its file, line and the client it is called on (supabase,
+adminClient, supabaseAdmin(), ...).
+
+The index lives in .table-index.json and is updated incrementally: files whose
+stat fingerprint (or, failing that, content hash) is unchanged are not re-read.
+
+Examples:
+    python scripts/table_index.py                       # update + per-table summary
+    python scripts/table_index.py --table campaign_prospects --kind user
+    python scripts/table_index.py --client adminClient --json
+"""
+
+import argparse
+import bisect
+import hashlib
+import json
+import os
+import re
+from collections import defaultdict, namedtuple
+
+from codemod_common import find_ts_files
+
+DEFAULT_INDEX_FILE = '.table-index.json'
+DEFAULT_DIRS = ['app/api']
+INDEX_FORMAT = 1
+
+# Clients that bypass RLS. Everything else called .from() on is treated as a
+# user (RLS-bound) client.
+ADMIN_CLIENTS = {
+    'supabaseAdmin', 'adminClient', 'adminSupabase', 'serviceClient',
+    'supabaseAdminClient', 'serviceSupabase',
+}
+
+# `client.from('table')`, `client\n  .from("table")`, `supabaseAdmin().from(`table`)`.
+# The .from( literal is searched first; the client is then matched backwards
+# from it within a short window, which keeps the scan close to a memchr.
+FROM_CALL = re.compile(r"\.from\(\s*(['\"`])([\w.-]+)\1\s*\)")
+CLIENT_BEFORE = re.compile(r"(?<![\w$])([A-Za-z_$][\w$]*(?:\(\))?)\s*\Z")
+CLIENT_LOOKBEHIND = 128
+
+TableUse = namedtuple('TableUse', 'path line column table client kind')
+
+
+def client_kind(client):
+    """Classify a client expression as 'admin', 'user' or 'unknown'."""
+    if not client:
+        return 'unknown'
+    return 'admin' if client.rstrip('()') in ADMIN_CLIENTS else 'user'
+
+
+def scan_content(content):
+    """Return [[table, line, column, client], ...] for every .from() call in content."""
+    newlines = [m.start() for m in re.finditer('\n', content)]
+    uses = []
+    for match in FROM_CALL.finditer(content):
+        client = CLIENT_BEFORE.search(content, max(0, match.start() - CLIENT_LOOKBEHIND), match.start())
+        offset = client.start() if client else match.start()
+        line = bisect.bisect_right(newlines, offset - 1)
+        column = offset - (newlines[line - 1] + 1 if line else 0)
+        uses.append([match.group(2), line + 1, column + 1, client.group(1) if client else ''])
+    return uses
+
+
+class TableIndex:
+    """On-disk map of path -> .from() uses, kept fresh by update()."""
+
+    def __init__(self, index_file=DEFAULT_INDEX_FILE):
+        self.index_file = index_file
+        self.files = {}
+        self.rescanned = 0
+
+    @classmethod
+    def load(cls, index_file=DEFAULT_INDEX_FILE):
+        index = cls(index_file)
+        try:
+            with open(index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('format') == INDEX_FORMAT:
+                index.files = data.get('files', {})
+        except (OSError, ValueError):
+            pass
+        return index
+
+    def save(self):
+        tmp_file = f"{self.index_file}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'format': INDEX_FORMAT, 'files': self.files}, f, separators=(',', ':'))
+        os.replace(tmp_file, self.index_file)
+
+    def update_file(self, path):
+        """Refresh one file's entry; only reads it if its stat fingerprint moved."""
+        st = os.stat(path)
+        fingerprint = [st.st_mtime_ns, st.st_size]
+        entry = self.files.get(path)
+        if entry and entry['stat'] == fingerprint:
+            return
+        with open(path, 'rb') as f:
+            data = f.read()
+        digest = hashlib.sha1(data).hexdigest()
+        if entry and entry['sha1'] == digest:
+            entry['stat'] = fingerprint
+            return
+        self.files[path] = {
+            'stat': fingerprint,
+            'sha1': digest,
+            'uses': scan_content(data.decode('utf-8', errors='replace')),
+        }
+        self.rescanned += 1
+
+    def update(self, dirs=DEFAULT_DIRS, only=None):
+        """
+        Bring the index in line with the files currently under dirs.
+
+        With only (e.g. a --changed-since file list) just those files are
+        refreshed and entries for other files are left as they are.
+        """
+        seen = set()
+        for directory in dirs:
+            for path in find_ts_files(directory, only=only):
+                seen.add(path)
+                self.update_file(path)
+        if only is not None:
+            return
+        prefixes = tuple(os.path.join(directory, '') for directory in dirs)
+        for path in list(self.files):
+            if path.startswith(prefixes) and path not in seen:
+                del self.files[path]
+
+    def uses(self, table=None, kind=None, client=None):
+        """Yield TableUse records, optionally filtered by table, client kind or client name."""
+        for path in sorted(self.files):
+            for use_table, line, column, use_client in self.files[path]['uses']:
+                if table and use_table != table:
+                    continue
+                if client and use_client.rstrip('()') != client.rstrip('()'):
+                    continue
+                use_kind = client_kind(use_client)
+                if kind and use_kind != kind:
+                    continue
+                yield TableUse(path, line, column, use_table, use_client, use_kind)
+
+    def files_for_table(self, table, kind=None):
+        """Sorted list of files that query table (optionally only via kind clients)."""
+        return sorted({use.path for use in self.uses(table=table, kind=kind)})
+
+
+def load_updated(index_file=DEFAULT_INDEX_FILE, dirs=DEFAULT_DIRS, only=None, save=True):
+    """Load the index, refresh it against the tree (or just the only files) and persist it unless save is False."""
+    index = TableIndex.load(index_file)
+    index.update(dirs, only)
+    if save:
+        index.save()
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Index .from(<table>) usage under app/api')
+    parser.add_argument('dirs', nargs='*', default=DEFAULT_DIRS, help='directories to index (default: app/api)')
+    parser.add_argument('--index-file', default=DEFAULT_INDEX_FILE)
+    parser.add_argument('--table', help='only show uses of this table')
+    parser.add_argument('--kind', choices=['user', 'admin', 'unknown'], help='only show uses through this kind of client')
+    parser.add_argument('--client', help='only show uses through this client variable')
+    parser.add_argument('--json', action='store_true', help='print matching uses as JSON')
+    args = parser.parse_args()
+
+    index = load_updated(args.index_file, args.dirs)
+    uses = list(index.uses(table=args.table, kind=args.kind, client=args.client))
+
+    if args.json:
+        print(json.dumps([use._asdict() for use in uses], indent=2))
+        return
+
+    if args.table or args.kind or args.client:
+        for use in uses:
+            print(f"{use.path}:{use.line}:{use.column}  {use.client or '<expr>'}.from('{use.table}')  [{use.kind}]")
+        print(f"\n{len(uses)} uses in {len({use.path for use in uses})} files")
+    else:
+        per_table = defaultdict(lambda: defaultdict(int))
+        for use in uses:
+            per_table[use.table][use.kind] += 1
+        print(f"{'Table':<40} {'user':>8} {'admin':>8} {'unknown':>8}")
+        print("-" * 68)
+        for table in sorted(per_table):
+            counts = per_table[table]
+            print(f"{table:<40} {counts['user']:>8} {counts['admin']:>8} {counts['unknown']:>8}")
+
+    print(f"\nIndexed {len(index.files)} files ({index.rescanned} rescanned) -> {args.index_file}")
+
+
+if __name__ == '__main__':
+    main()
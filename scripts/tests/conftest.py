@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The codemods import their siblings (codemod_common, call_scanner, ...) directly
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,61 @@
+from admin_client_rules import AdminClientRewriter, AdminClientRule
+
+RULE = AdminClientRule(
+    table='workspace_accounts',
+    client='adminClient',
+    declaration='const adminClient = supabaseAdmin()',
+    import_line="import { supabaseAdmin } from '@/app/lib/supabase'",
+    admin_clients=frozenset(['adminClient', 'supabaseAdmin']),
+    only_if_contains=("from '@/app/lib/supabase'", 'supabaseAdmin'),
+)
+
+ROUTE = """import { createServerClient, supabaseAdmin } from '@/app/lib/supabase'
+
+export async function GET(request: Request): Promise<Response> {
+  const supabase = createServerClient()
+  if (request) {
+    const { data } = await supabase.from('workspace_accounts').select('*')
+  }
+  const rows = await Promise.all(ids.map(async (id) => {
+    return supabase.from('workspace_accounts').select('*').eq('id', id)
+  }))
+  return Response.json(rows)
+}
+
+export const POST = async (request: Request) => {
+  const supabase = createServerClient()
+  await supabase.from('workspace_accounts').insert({})
+  return new Response(null)
+}
+"""
+
+
+def test_declares_admin_client_in_every_handler():
+    content, changes = AdminClientRewriter([RULE]).rewrite(ROUTE)
+
+    assert len(changes) == 3
+    assert content.count('const adminClient = supabaseAdmin()') == 2
+    get_handler, post_handler = content.split('export const POST')
+    assert "{\n  const adminClient = supabaseAdmin()\n  const supabase = createServerClient()" in get_handler
+    assert "{\n  const adminClient = supabaseAdmin()\n  const supabase = createServerClient()" in post_handler
+    assert 'adminClient.from' in post_handler
+
+
+def test_keeps_existing_declaration_in_handler():
+    route = ROUTE.replace(
+        "Promise<Response> {\n",
+        "Promise<Response> {\n  const adminClient = supabaseAdmin()\n",
+    )
+
+    content, _ = AdminClientRewriter([RULE]).rewrite(route)
+
+    assert content.count('const adminClient = supabaseAdmin()') == 2
+
+
+def test_skips_files_without_admin_import():
+    route = ROUTE.replace(', supabaseAdmin', '')
+
+    content, changes = AdminClientRewriter([RULE]).rewrite(route)
+
+    assert changes == []
+    assert content == route
@@ -0,0 +1,69 @@
+from call_scanner import find_calls
+from migrate_supabase_phase2 import CREATE_CLIENT_RULES
+from migrate_supabase_phase3 import MULTILINE_RULES
+
+
+def call_text(content, call):
+    return content[call.start:call.end]
+
+
+def test_find_calls_matches_nested_brackets():
+    content = "const c = createClient(url, { auth: { persist: [a(b)] } }, f(g()));\nnext();\n"
+    calls = find_calls(content, ['createClient'])
+    assert [call_text(content, call) for call in calls] == [
+        "createClient(url, { auth: { persist: [a(b)] } }, f(g()))",
+    ]
+    assert content[calls[0].args_start] == '('
+
+
+def test_find_calls_reports_nested_calls_too():
+    content = "createClient(createClient(a), b)"
+    calls = find_calls(content, ['createClient'])
+    assert [call_text(content, call) for call in calls] == ["createClient(createClient(a), b)", "createClient(a)"]
+
+
+def test_find_calls_ignores_brackets_in_strings():
+    content = """createClient(')', "(", `) ${ x(")") } (`, '\\')') ; tail()"""
+    calls = find_calls(content, ['createClient'])
+    assert [call_text(content, call) for call in calls] == [content[:content.index(' ;')]]
+
+
+def test_find_calls_ignores_brackets_in_comments():
+    content = "createClient(a, // )\n  b /* ) */)\nrest()"
+    calls = find_calls(content, ['createClient'])
+    assert [call_text(content, call) for call in calls] == ["createClient(a, // )\n  b /* ) */)"]
+
+
+def test_find_calls_ignores_stray_closer_in_regex_literal():
+    content = "createClient(a, /]/) ; tail()"
+    calls = find_calls(content, ['createClient'])
+    assert [call_text(content, call) for call in calls] == ["createClient(a, /]/)"]
+
+
+def test_find_calls_truncates_at_paren_in_regex_literal():
+    # Documented limit: regex literals are not recognised, so a ')' inside one closes the call
+    content = "const supabase = createClient(a, /\\)/);\nrun();\n"
+    calls = find_calls(content, ['createClient'])
+    assert [call_text(content, call) for call in calls] == ["createClient(a, /\\)"]
+    assert CREATE_CLIENT_RULES.apply(content) == "/);\nrun();\n"
+
+
+def test_find_calls_skips_names_in_strings_and_comments():
+    content = "'createClient(a)'; // createClient(b)\n/* createClient(c) */ createClient(d)"
+    calls = find_calls(content, ['createClient'])
+    assert [call_text(content, call) for call in calls] == ["createClient(d)"]
+
+
+def test_phase3_leaves_argumentless_create_client_alone():
+    content = "export default function Page() {\n  const supabase = createClient();\n  return null;\n}\n"
+    assert MULTILINE_RULES.apply(content) == content
+
+
+def test_phase3_leaves_comment_only_create_client_alone():
+    content = "const supabase = createClient(/* browser */);\n"
+    assert MULTILINE_RULES.apply(content) == content
+
+
+def test_phase3_still_removes_create_client_with_arguments():
+    content = "const supabase = createClient(\n  url,\n  key\n);\nrun();\n"
+    assert MULTILINE_RULES.apply(content) == "// Pool imported from lib/db\nrun();\n"
@@ -0,0 +1,14 @@
+import io
+
+from codemod_diff import PatchWriter, unified_patch
+
+
+def test_counts_lines_that_look_like_headers():
+    before = "-- old comment\nkeep\n++counter;\n"
+    after = "--- new comment\nkeep\n+++counter;\n"
+    writer = PatchWriter()
+    writer.stream = io.StringIO()
+
+    writer.write('app/page.tsx', unified_patch('app/page.tsx', before, after))
+
+    assert writer.stats['app'] == [1, 2, 2]
@@ -0,0 +1,73 @@
+import importlib
+import random
+
+import pytest
+
+from codemod_common import RuleSet, SinglePassRules
+
+update_kb_routes = importlib.import_module('update-kb-routes')
+
+# The eight sequential passes update-kb-routes used before SinglePassRules
+SEQUENTIAL_RULES = RuleSet('kb-routes', [
+    (r"import { createRouteHandlerClient } from '@supabase/auth-helpers-nextjs';", ""),
+    (r"import { cookies } from 'next/headers';", ""),
+    (r"type RouteSupabaseClient = ReturnType<typeof createRouteHandlerClient>;", ""),
+    (r"(import { NextRequest, NextResponse } from 'next/server';)(?![\s\S]*from '@/lib/supabase-route-client')",
+     r"\1\nimport { createSupabaseRouteClient } from '@/lib/supabase-route-client';"),
+    (r"// cookieStore removed;\s*const supabase = createRouteHandlerClient\({ cookies: await cookies\(\) }\);",
+     "const supabase = await createSupabaseRouteClient();"),
+    (r"const supabase = createRouteHandlerClient\({ cookies: await cookies\(\) }\);",
+     "const supabase = await createSupabaseRouteClient();"),
+    (r'\n\n\n+', '\n\n'),
+], anchors=['createRouteHandlerClient'])
+
+FRAGMENTS = [
+    "import { createRouteHandlerClient } from '@supabase/auth-helpers-nextjs';",
+    "import { cookies } from 'next/headers';",
+    "type RouteSupabaseClient = ReturnType<typeof createRouteHandlerClient>;",
+    "import { NextRequest, NextResponse } from 'next/server';",
+    "import { createSupabaseRouteClient } from '@/lib/supabase-route-client';",
+    "// cookieStore removed;",
+    "const supabase = createRouteHandlerClient({ cookies: await cookies() });",
+    "export async function GET(req: NextRequest) {",
+    "}",
+    "\n", "\n", "\n", " ", "  ",
+]
+
+ROUTE = """import { NextRequest, NextResponse } from 'next/server';
+import { createRouteHandlerClient } from '@supabase/auth-helpers-nextjs';
+import { cookies } from 'next/headers';
+
+
+type RouteSupabaseClient = ReturnType<typeof createRouteHandlerClient>;
+
+export async function GET(req: NextRequest) {
+  // cookieStore removed;
+  const supabase = createRouteHandlerClient({ cookies: await cookies() });
+  return NextResponse.json(await supabase.from('kb').select('*'));
+}
+"""
+
+
+def test_route_file_matches_sequential_rules():
+    expected = SEQUENTIAL_RULES.apply(ROUTE)
+    assert expected != ROUTE
+    assert update_kb_routes.ROUTE_RULES.apply(ROUTE) == expected
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_random_fragments_match_sequential_rules(seed):
+    rng = random.Random(seed)
+    for _ in range(2000):
+        content = ''.join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 14)))
+        assert update_kb_routes.ROUTE_RULES.apply(content) == SEQUENTIAL_RULES.apply(content), repr(content)
+
+
+def test_first_rule_in_list_order_wins():
+    rules = SinglePassRules([(r'ab', 'first'), (r'abc', 'second'), (r'c', 'C')])
+    assert rules.sub(None, 'abc abcabc') == 'firstC firstCfirstC'
+
+
+def test_template_and_callable_replacements_use_own_groups():
+    rules = SinglePassRules([(r'(\d+)px', r'\1rem'), (r'#(\w+)', lambda match: match.group(1).upper())])
+    assert rules.subn(None, 'margin: 4px; color: #fff') == ('margin: 4rem; color: FFF', 2)
@@ -1,60 +1,113 @@
 #!/usr/bin/env python3
-import re
-
-files = [
-    'app/api/knowledge-base/competitors/route.ts',
-    'app/api/knowledge-base/data/route.ts',
-    'app/api/knowledge-base/icps/route.ts',
-    'app/api/knowledge-base/personas/route.ts',
-    'app/api/knowledge-base/products/route.ts',
+"""
+Move route handlers from createRouteHandlerClient to createSupabaseRouteClient.
+
+Targets are discovered rather than listed: every file matching --include
+(default app/api/*/route.ts, any depth) that mentions createRouteHandlerClient.
+All rewrites are merged into one ordered regex pass per file and the routes
+are processed as one batch (--jobs for a worker pool).
+"""
+
+import argparse
+import fnmatch
+import os
+
+from codemod_cache import add_cache_arguments, manifest_from_args, source_version
+from codemod_common import (
+    ERROR, MODIFIED, RuleSet, SinglePassRules, add_changed_since_argument,
+    add_jobs_argument, add_profile_arguments, changed_files_from_args,
+    find_ts_files, map_files, print_prefilter_summary, profile_from_args,
+)
+
+DEFAULT_INCLUDE = ['app/api/*/route.ts']
+
+# Statements that are deleted outright
+REMOVED = [
+    r"import { createRouteHandlerClient } from '@supabase/auth-helpers-nextjs';",
+    r"import { cookies } from 'next/headers';",
+    r"type RouteSupabaseClient = ReturnType<typeof createRouteHandlerClient>;",
 ]
 
-for file_path in files:
-    with open(file_path, 'r') as f:
-        content = f.read()
+def collapse_blank_lines(match):
+    # A run of newlines with only deleted statements between them: drop the
+    # statements and clean up extra blank lines (3+ newlines -> 2)
+    newlines = match.group().count('\n')
+    return '\n\n' if newlines >= 3 else '\n' * newlines
+
+ROUTE_RULES = RuleSet('kb-routes', [(SinglePassRules([
+    # Clean up extra blank lines, including the ones left by removed imports
+    (r"\n(?:(?:%s)*\n)+" % '|'.join(REMOVED), collapse_blank_lines),
 
     # Replace imports
-    content = re.sub(
-        r"import { createRouteHandlerClient } from '@supabase/auth-helpers-nextjs';",
-        "",
-        content
-    )
-    content = re.sub(
-        r"import { cookies } from 'next/headers';",
-        "",
-        content
-    )
-    content = re.sub(
-        r"type RouteSupabaseClient = ReturnType<typeof createRouteHandlerClient>;",
-        "",
-        content
-    )
-
-    # Add new imports after NextRequest import
-    content = re.sub(
-        r"(import { NextRequest, NextResponse } from 'next/server';)",
-        r"\1\nimport { createSupabaseRouteClient } from '@/lib/supabase-route-client';",
-        content
-    )
-
-    # Replace client creation
-    content = re.sub(
-        r"// cookieStore removed;\s*const supabase = createRouteHandlerClient\({ cookies: await cookies\(\) }\);",
-        "const supabase = await createSupabaseRouteClient();",
-        content
-    )
-    content = re.sub(
-        r"const supabase = createRouteHandlerClient\({ cookies: await cookies\(\) }\);",
-        "const supabase = await createSupabaseRouteClient();",
-        content
-    )
-
-    # Clean up extra blank lines
-    content = re.sub(r'\n\n\n+', '\n\n', content)
-
-    with open(file_path, 'w') as f:
-        f.write(content)
-
-    print(f"✅ Updated {file_path}")
-
-print("\n✨ All KB routes updated!")
+    *[(statement, "") for statement in REMOVED],
+
+    # Add new imports after NextRequest import (once, so reruns are no-ops)
+    (r"(import { NextRequest, NextResponse } from 'next/server';)(?![\s\S]*from '@/lib/supabase-route-client')",
+     r"\1\nimport { createSupabaseRouteClient } from '@/lib/supabase-route-client';"),
+
+    # Replace client creation (deleted statements may sit between the comment and the call)
+    (r"// cookieStore removed;(?:\s|%s)*const supabase = createRouteHandlerClient\({ cookies: await cookies\(\) }\);" % '|'.join(REMOVED),
+     "const supabase = await createSupabaseRouteClient();"),
+    (r"const supabase = createRouteHandlerClient\({ cookies: await cookies\(\) }\);",
+     "const supabase = await createSupabaseRouteClient();"),
+]), None)], anchors=['createRouteHandlerClient'])
+
+def process_route(file_path):
+    """Rewrite one route file in place. Returns its status (MODIFIED, SKIPPED, ...)."""
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        content, status = ROUTE_RULES.rewrite(content)
+
+        if status == MODIFIED:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+        return status
+    except Exception as e:
+        print(f"❌ Error processing {file_path}: {e}")
+        return ERROR
+
+def discover_routes(includes, only=None):
+    """Files matching any include glob ('*' also matches '/'), walking only each glob's fixed prefix."""
+    routes = set()
+    for include in includes:
+        root = os.path.dirname(include.split('*', 1)[0]) or '.'
+        for path in find_ts_files(root, only=only):
+            if fnmatch.fnmatch(os.path.normpath(path), include):
+                routes.add(os.path.normpath(path))
+    return sorted(routes)
+
+def main():
+    parser = argparse.ArgumentParser(description='Move route handlers to createSupabaseRouteClient')
+    parser.add_argument('--include', action='append', metavar='GLOB',
+                        help=f"route files to consider (repeatable, default: {' '.join(DEFAULT_INCLUDE)})")
+    add_jobs_argument(parser)
+    add_cache_arguments(parser)
+    add_changed_since_argument(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    profile = profile_from_args(args, [ROUTE_RULES])
+    manifest = manifest_from_args(args, 'update-kb-routes', source_version(__file__))
+
+    targets = discover_routes(args.include or DEFAULT_INCLUDE, only=changed_files_from_args(args))
+    paths = manifest.filter(targets)
+    statuses = map_files(process_route, paths, args.jobs)
+    manifest.record_all(paths, statuses)
+    manifest.save()
+
+    updated = 0
+    for file_path, status in zip(paths, statuses):
+        if status == MODIFIED:
+            updated += 1
+            print(f"✅ Updated {file_path}")
+
+    print(f"\n📊 {len(targets)} route files matched, {updated} updated")
+    print_prefilter_summary(statuses)
+    print(manifest.summary(len(targets)))
+    if profile:
+        profile.report(args.profile_json)
+    print("\n✨ All routes updated!")
+
+if __name__ == '__main__':
+    main()
@@ -3,12 +3,10 @@
 Add status tracking nodes to N8N workflow
 """
 
-import json
-import uuid
+from workflow_graph import WorkflowGraph
 
 # Load the workflow
-with open('/Users/tvonlinz/Downloads/SAM Master Campaign Orchestrator COMPLETE - FIXED TRACKING.json', 'r') as f:
-    workflow = json.load(f)
+graph = WorkflowGraph.load('/Users/tvonlinz/Downloads/SAM Master Campaign Orchestrator COMPLETE - FIXED TRACKING.json')
 
 # Define status updates to add after each node
 STATUS_UPDATES = {
@@ -85,42 +83,18 @@ def create_status_update_node(node_name, status, position):
             "jsonBody": f"={{{{ \n  prospect_id: $json.prospect.id,\n  campaign_id: $json.campaign_id,\n  status: '{status}',\n  sent_at: $now.toISO()\n }}}}",
             "options": {}
         },
-        "id": str(uuid.uuid4()),
+        "id": graph.node_id(node_name),
         "name": node_name,
         "type": "n8n-nodes-base.httpRequest",
         "typeVersion": 3,
         "position": position
     }
 
-# Find nodes by name
-def find_node_by_name(nodes, name):
-    for i, node in enumerate(nodes):
-        if node.get('name') == name:
-            return i, node
-    return None, None
-
-# Find where a node connects to
-def find_connections_to_node(connections, node_name):
-    """Find all nodes that connect TO this node"""
-    result = []
-    for from_node, conn_data in connections.items():
-        if 'main' in conn_data:
-            for branch_index, branch in enumerate(conn_data['main']):
-                if branch:
-                    for conn in branch:
-                        if conn.get('node') == node_name:
-                            result.append({
-                                'from_node': from_node,
-                                'branch_index': branch_index,
-                                'connection': conn
-                            })
-    return result
-
 print("🔧 Adding status tracking nodes...\n")
 
 # Step 1: Fix wrong status values
 nodes_updated = 0
-for node in workflow['nodes']:
+for node in graph.nodes:
     if node.get('parameters', {}).get('bodyParameters'):
         for param in node['parameters']['bodyParameters'].get('parameters', []):
             if param.get('name') == 'status':
@@ -137,12 +111,13 @@ print(f"\n📝 Fixed {nodes_updated} status values\n")
 print("📋 Status tracking nodes that need to be added:\n")
 
 for key, config in STATUS_UPDATES.items():
-    idx, node = find_node_by_name(workflow['nodes'], config['insert_after_node'])
+    node = graph.node(config['insert_after_node'])
     if node:
         print(f"✓ Found '{config['insert_after_node']}'")
         print(f"  → Add node: '{config['new_node_name']}'")
         print(f"  → Status: {config['status']}")
         print(f"  → Position: after node at position {node.get('position')}")
+        print(f"  → Currently feeds: {', '.join(graph.successors(config['insert_after_node'])) or 'nothing'}")
         print()
     else:
         print(f"✗ Could not find node: '{config['insert_after_node']}'")
@@ -150,8 +125,7 @@ for key, config in STATUS_UPDATES.items():
 
 # Save the workflow with fixed statuses
 output_path = '/Users/tvonlinz/Downloads/SAM Master Campaign Orchestrator COMPLETE - WITH TRACKING.json'
-with open(output_path, 'w') as f:
-    json.dump(workflow, f, indent=2)
+graph.save(output_path, canonical=True)
 
 print(f"\n✅ Saved updated workflow to: {output_path}")
 print("\n⚠️  IMPORTANT: The status values have been fixed, but you still need to:")
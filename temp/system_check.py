@@ -4,10 +4,11 @@ SAM System Comprehensive Check - December 4, 2025
 Queries Supabase for cron status, reply tracking, follow-ups, and prospect pipeline.
 """
 
+import sys
 import requests
 import json
 from collections import defaultdict
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 # Supabase config
 SUPABASE_URL = "https://latxadqrvrrrcvkktrog.supabase.co"
@@ -19,19 +20,41 @@ headers = {
     "Content-Type": "application/json"
 }
 
-def query_table(table, select="*", filters="", limit=None):
-    """Query Supabase table"""
-    url = f"{SUPABASE_URL}/rest/v1/{table}?select={select}"
-    if filters:
-        url += f"&{filters}"
-    if limit:
-        url += f"&limit={limit}"
+# Rows per request - and the most rows held in memory at once
+PAGE_SIZE = 1000
+
+session = requests.Session()
+session.headers.update(headers)
 
-    response = requests.get(url, headers=headers)
-    if response.status_code != 200:
-        print(f"Error querying {table}: {response.text}")
-        return []
-    return response.json()
+def query_table(table, select="*", filters="", page_size=PAGE_SIZE):
+    """
+    Yield the rows of a Supabase table one page at a time.
+
+    Keyset pagination on id (order=id.asc&id=gt.<last id>) keeps every page an
+    index range scan however deep the table is. The stream only ends on an
+    empty page, so a server max-rows cap below page_size makes pages smaller
+    instead of silently truncating the result.
+    """
+    if select != "*" and "id" not in select.split(","):
+        select += ",id"
+    url = f"{SUPABASE_URL}/rest/v1/{table}"
+    if filters:
+        url += f"?{filters}"
+    last_id = None
+    while True:
+        params = {"select": select, "order": "id.asc", "limit": page_size}
+        if last_id is not None:
+            params["id"] = f"gt.{last_id}"
+        response = session.get(url, params=params)
+        if response.status_code != 200:
+            # Stop rather than report partial counts as if they were complete
+            print(f"Error querying {table}: {response.text}")
+            sys.exit(1)
+        rows = response.json()
+        if not rows:
+            return
+        yield from rows
+        last_id = rows[-1]['id']
 
 print("=" * 80)
 print("SAM SYSTEM COMPREHENSIVE CHECK - December 4, 2025")
@@ -40,9 +63,8 @@ print("=" * 80)
 # 1. PROSPECT PIPELINE STATUS
 print("\n1. PROSPECT PIPELINE STATUS")
 print("-" * 80)
-prospects = query_table("campaign_prospects", "status")
 status_counts = defaultdict(int)
-for p in prospects:
+for p in query_table("campaign_prospects", "status"):
     status_counts[p['status']] += 1
 
 total = sum(status_counts.values())
@@ -58,20 +80,19 @@ print(f"{'TOTAL':<30} {total:>10} {100.0:>9.1f}%")
 # 2. REPLY TRACKING
 print("\n2. REPLY TRACKING")
 print("-" * 80)
-replied = query_table("campaign_prospects", "campaign_id,status,responded_at", "status=eq.replied")
-print(f"Total Prospects with Replies: {len(replied)}")
-
-if replied:
-    # Last 7 days
-    from datetime import timezone
-    seven_days_ago = datetime.now(timezone.utc) - timedelta(days=7)
-    recent_replies = [r for r in replied if r['responded_at'] and datetime.fromisoformat(r['responded_at'].replace('Z', '+00:00')) > seven_days_ago]
-    print(f"Replies in Last 7 Days: {len(recent_replies)}")
-
-    # By campaign
-    replies_by_campaign = defaultdict(int)
-    for r in replied:
-        replies_by_campaign[r['campaign_id']] += 1
+seven_days_ago = datetime.now(timezone.utc) - timedelta(days=7)
+total_replies = 0
+recent_replies = 0
+replies_by_campaign = defaultdict(int)
+for r in query_table("campaign_prospects", "campaign_id,status,responded_at", "status=eq.replied"):
+    total_replies += 1
+    if r['responded_at'] and datetime.fromisoformat(r['responded_at'].replace('Z', '+00:00')) > seven_days_ago:
+        recent_replies += 1
+    replies_by_campaign[r['campaign_id']] += 1
+print(f"Total Prospects with Replies: {total_replies}")
+
+if total_replies:
+    print(f"Replies in Last 7 Days: {recent_replies}")
 
     print(f"\nReplies by Campaign:")
     for campaign_id, count in sorted(replies_by_campaign.items(), key=lambda x: x[1], reverse=True):
@@ -80,26 +101,32 @@ if replied:
 # 3. FOLLOW-UP MESSAGES
 print("\n3. FOLLOW-UP MESSAGES")
 print("-" * 80)
-follow_ups = query_table("campaign_prospects", "status,last_follow_up_at,follow_up_due_at", "last_follow_up_at=not.is.null")
-print(f"Total Prospects with Follow-ups Sent: {len(follow_ups)}")
+follow_ups = sum(1 for _ in query_table("campaign_prospects", "id", "last_follow_up_at=not.is.null"))
+print(f"Total Prospects with Follow-ups Sent: {follow_ups}")
 
 # Pending follow-ups (connected, due date in past, no reply)
-connected = query_table("campaign_prospects", "status,follow_up_due_at", "status=eq.connected&follow_up_due_at=not.is.null")
-from datetime import timezone
 now = datetime.now(timezone.utc)
-pending_followups = [c for c in connected if c['follow_up_due_at'] and datetime.fromisoformat(c['follow_up_due_at'].replace('Z', '+00:00')) <= now]
-print(f"Pending Follow-ups (due now): {len(pending_followups)}")
+pending_followups = sum(
+    1 for c in query_table("campaign_prospects", "status,follow_up_due_at", "status=eq.connected&follow_up_due_at=not.is.null")
+    if c['follow_up_due_at'] and datetime.fromisoformat(c['follow_up_due_at'].replace('Z', '+00:00')) <= now
+)
+print(f"Pending Follow-ups (due now): {pending_followups}")
 
 # 4. SEND QUEUE STATUS
 print("\n4. SEND QUEUE STATUS")
 print("-" * 80)
-queue = query_table("send_queue", "status,message_type,scheduled_for,sent_at", "order=created_at.desc", limit=1000)
-
+today = datetime.now().date()
 queue_status_counts = defaultdict(int)
 queue_type_counts = defaultdict(int)
-for q in queue:
+pending_queue = 0
+today_pending = 0
+for q in query_table("send_queue", "status,message_type,scheduled_for"):
     queue_status_counts[q['status']] += 1
     queue_type_counts[q.get('message_type', 'unknown')] += 1
+    if q['status'] == 'pending':
+        pending_queue += 1
+        if q['scheduled_for'] and datetime.fromisoformat(q['scheduled_for'].replace('Z', '+00:00')).date() == today:
+            today_pending += 1
 
 print(f"{'Queue Status':<30} {'Count':>10}")
 print("-" * 80)
@@ -112,20 +139,18 @@ for msg_type in sorted(queue_type_counts.keys()):
     print(f"{msg_type:<30} {queue_type_counts[msg_type]:>10}")
 
 # Pending queue items scheduled for today
-pending_queue = [q for q in queue if q['status'] == 'pending']
-print(f"\nTotal Pending in Queue: {len(pending_queue)}")
-
-today = datetime.now().date()
-today_pending = [q for q in pending_queue if q['scheduled_for'] and datetime.fromisoformat(q['scheduled_for'].replace('Z', '+00:00')).date() == today]
-print(f"Pending for Today: {len(today_pending)}")
+print(f"\nTotal Pending in Queue: {pending_queue}")
+print(f"Pending for Today: {today_pending}")
 
 # 5. CAMPAIGNS STATUS
 print("\n5. ACTIVE CAMPAIGNS")
 print("-" * 80)
-campaigns = query_table("campaigns", "id,campaign_name,status")
 campaign_status_counts = defaultdict(int)
-for c in campaigns:
+active_campaigns = []
+for c in query_table("campaigns", "id,campaign_name,status"):
     campaign_status_counts[c['status']] += 1
+    if c['status'] == 'active':
+        active_campaigns.append(c)
 
 print(f"{'Campaign Status':<30} {'Count':>10}")
 print("-" * 80)
@@ -133,7 +158,6 @@ for status in sorted(campaign_status_counts.keys()):
     print(f"{status:<30} {campaign_status_counts[status]:>10}")
 
 # Active campaigns with names
-active_campaigns = [c for c in campaigns if c['status'] == 'active']
 print(f"\nActive Campaigns ({len(active_campaigns)}):")
 for c in active_campaigns:
     name = c['campaign_name'] or "(Unnamed)"
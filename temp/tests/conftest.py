@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The workflow tools import their siblings (workflow_graph, workflow_expr, ...) directly
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
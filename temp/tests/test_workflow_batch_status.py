@@ -0,0 +1,66 @@
+import json
+
+from workflow_batch_status import FLUSH_NODES, batch_status_updates, flush_problems
+from workflow_graph import WorkflowGraph
+
+WORKFLOW = {
+    'name': 'Status test',
+    'nodes': [
+        {'name': 'Webhook', 'type': 'n8n-nodes-base.webhook', 'typeVersion': 1, 'position': [0, 0],
+         'parameters': {'path': 'status-test'}},
+        {'name': 'Update Status - CR Sent', 'type': 'n8n-nodes-base.httpRequest', 'typeVersion': 3,
+         'position': [220, 0], 'continueOnFail': True, 'retryOnFail': True, 'maxTries': 3,
+         'parameters': {
+             'method': 'POST',
+             'url': 'https://app.meet-sam.com/api/campaigns/webhook/prospect-status',
+             'sendBody': True,
+             'specifyBody': 'json',
+             'jsonBody': "={{ { prospect_id: $json.body.id, status: 'connection_requested' } }}",
+         }},
+    ],
+    'connections': {
+        'Webhook': {'main': [[{'node': 'Update Status - CR Sent', 'type': 'main', 'index': 0}]]},
+    },
+}
+
+
+def transformed(**options):
+    graph = WorkflowGraph(json.loads(json.dumps(WORKFLOW)))
+    replaced = batch_status_updates(graph, **options)
+    return graph, replaced
+
+
+def test_converts_status_node_and_adds_flush():
+    graph, replaced = transformed()
+
+    assert replaced == ['Update Status - CR Sent']
+    node = graph.node('Update Status - CR Sent')
+    assert node['type'] == 'n8n-nodes-base.redis'
+    assert node['parameters']['operation'] == 'push'
+    assert all(name in graph for name in FLUSH_NODES)
+    assert flush_problems(graph) == []
+
+
+def test_rerun_leaves_output_unchanged():
+    graph, _ = transformed(redis_credential='Redis prod')
+    first = json.dumps(graph.to_workflow(), sort_keys=True)
+
+    assert batch_status_updates(graph, redis_credential='Redis prod') == []
+    assert json.dumps(graph.to_workflow(), sort_keys=True) == first
+
+
+def test_redis_credential_is_attached_as_credentials():
+    graph, _ = transformed(redis_credential='Redis prod')
+
+    for node in graph.nodes:
+        if node['type'].endswith('.redis'):
+            assert node['credentials'] == {'redis': {'name': 'Redis prod'}}
+            assert 'redis' not in node
+
+
+def test_push_keeps_error_setting_and_drops_http_retries():
+    graph, _ = transformed()
+
+    node = graph.node('Update Status - CR Sent')
+    assert node['continueOnFail'] is True
+    assert 'retryOnFail' not in node and 'maxTries' not in node
@@ -0,0 +1,103 @@
+import asyncio
+import json
+import time
+
+from workflow_executor import Clock, Executor, Store
+from workflow_graph import WorkflowGraph
+
+WAIT_HOURS = 2
+WORKFLOW = {
+    'name': 'Resume test',
+    'nodes': [
+        {'name': 'Webhook', 'type': 'n8n-nodes-base.webhook', 'typeVersion': 1, 'parameters': {'path': 'resume-test'}},
+        {'name': 'Remember', 'type': 'n8n-nodes-base.set', 'typeVersion': 3.3, 'parameters': {
+            'assignments': {'assignments': [{'name': 'who', 'value': '={{ $json.body.name }}', 'type': 'string'}]}}},
+        {'name': 'Wait', 'type': 'n8n-nodes-base.wait', 'typeVersion': 1,
+         'parameters': {'amount': WAIT_HOURS, 'unit': 'hours'}},
+        {'name': 'Build', 'type': 'n8n-nodes-base.code', 'typeVersion': 2, 'parameters': {
+            'jsCode': "return [{ json: { who: $('Remember').first().json.who, waited: $json.who } }];"}},
+        {'name': 'Respond', 'type': 'n8n-nodes-base.respondToWebhook', 'typeVersion': 1, 'parameters': {}},
+    ],
+    'connections': {
+        'Webhook': {'main': [[{'node': 'Remember', 'type': 'main', 'index': 0}]]},
+        'Remember': {'main': [[{'node': 'Wait', 'type': 'main', 'index': 0}]]},
+        'Wait': {'main': [[{'node': 'Build', 'type': 'main', 'index': 0}]]},
+        'Build': {'main': [[{'node': 'Respond', 'type': 'main', 'index': 0}]]},
+    },
+}
+
+
+def run_process(db, start=None, payloads=(), release=False):
+    """One executor process: start payloads, run until everything left is parked, close the store."""
+
+    async def main():
+        store = Store(db)
+        released = store.release_claims() if release else 0
+        executor = Executor(WorkflowGraph(json.loads(json.dumps(WORKFLOW))), store, Clock(start=start), env={},
+                            log=lambda *args: None)
+        for payload in payloads:
+            executor.start(payload)
+        await executor.scheduler(exit_when_parked=True, poll=0.01)
+        store.close()
+        return released
+
+    return asyncio.run(main())
+
+
+def executions(db):
+    store = Store(db)
+    rows = store.db.execute('SELECT status, last_node, response FROM executions').fetchall()
+    waits = store.db.execute('SELECT node, claimed FROM waits').fetchall()
+    store.close()
+    return [(status, node, json.loads(response) if response else None) for status, node, response in rows], waits
+
+
+def test_wait_parks_in_store(tmp_path):
+    db = str(tmp_path / 'executor.db')
+
+    run_process(db, payloads=[{'name': 'Ada'}])
+
+    rows, waits = executions(db)
+    assert rows == [('waiting', 'Wait', None)]
+    assert waits == [('Wait', 0)]
+
+
+def test_not_yet_due_wait_stays_parked(tmp_path):
+    db = str(tmp_path / 'executor.db')
+    run_process(db, payloads=[{'name': 'Ada'}])
+
+    run_process(db, start=time.time() + WAIT_HOURS * 3600 - 600)
+
+    rows, waits = executions(db)
+    assert rows == [('waiting', 'Wait', None)]
+    assert waits == [('Wait', 0)]
+
+
+def test_resume_after_restart_keeps_node_outputs(tmp_path):
+    db = str(tmp_path / 'executor.db')
+    run_process(db, payloads=[{'name': 'Ada'}])
+
+    run_process(db, start=time.time() + WAIT_HOURS * 3600 + 60)
+
+    rows, waits = executions(db)
+    assert rows == [('success', 'Respond', {'who': 'Ada', 'waited': 'Ada'})]
+    assert waits == []
+
+
+def test_claimed_resume_runs_again_after_crash(tmp_path):
+    db = str(tmp_path / 'executor.db')
+    run_process(db, payloads=[{'name': 'Ada'}, {'name': 'Grace'}])
+    # A process claimed both Waits and died before finishing them
+    store = Store(db)
+    assert len(store.claim_due(time.time() + WAIT_HOURS * 3600 + 60, 10)) == 2
+    store.close()
+
+    released = run_process(db, start=time.time() + WAIT_HOURS * 3600 + 60, release=True)
+
+    rows, waits = executions(db)
+    assert released == 2
+    assert sorted(rows, key=lambda row: row[2]['who']) == [
+        ('success', 'Respond', {'who': 'Ada', 'waited': 'Ada'}),
+        ('success', 'Respond', {'who': 'Grace', 'waited': 'Grace'}),
+    ]
+    assert waits == []
@@ -0,0 +1,111 @@
+import math
+
+import pytest
+
+from workflow_expr import UNDEFINED, ExpressionError, evaluate, resolve, run_code
+
+CONTEXT = {
+    '$json': {'name': 'Ada', 'count': '3', 'empty': '', 'missing': None, 'nested': {'list': [1, 2, 3]}},
+}
+
+
+@pytest.mark.parametrize('source, expected', [
+    # arithmetic, with JavaScript coercions
+    ('1 + 2 * 3', 7),
+    ('(1 + 2) * 3', 9),
+    ("'a' + 1", 'a1'),
+    ("1 + '2'", '12'),
+    ("[1, 2] + ''", '1,2'),
+    ("'10' - 4", 6),
+    ('$json.count * 2', 6),
+    ('7 % 3', 1),
+    ('-7 % 3', -1),
+    ("-'3'", -3),
+    ('+true', 1),
+    # comparison and equality
+    ("'b' > 'a'", True),
+    ("'10' < 9", False),
+    ("1 == '1'", True),
+    ("1 === '1'", False),
+    ('null == undefined', True),
+    ('null === undefined', False),
+    ("1 != '1'", False),
+    ("1 !== '1'", True),
+    # logical, nullish and conditional operators
+    ("0 || 'x'", 'x'),
+    ("$json.empty ?? 'x'", ''),
+    ("$json.missing ?? 'x'", 'x'),
+    ('1 && 2', 2),
+    ('0 && 2', 0),
+    ("!''", True),
+    ("$json.name ? 'yes' : 'no'", 'yes'),
+    ("'name' in $json", True),
+    ('1 in [5, 6]', True),
+    # typeof, member access and optional chaining
+    ('typeof null', 'object'),
+    ('typeof $json.nope', 'undefined'),
+    ('typeof (() => 1)', 'function'),
+    ('$json.nested.list.length', 3),
+    ('$json.missing?.deep.value', UNDEFINED),
+    ("$json.nested['list'][1]", 2),
+    # literals, spread, arrows and methods
+    ('[...$json.nested.list, 4]', [1, 2, 3, 4]),
+    ('({...{a: 1}, b: 2})', {'a': 1, 'b': 2}),
+    ('`${$json.name}!`', 'Ada!'),
+    ('$json.nested.list.filter(n => n > 1).map(n => n * 10)', [20, 30]),
+    ('[3, 1, 2].sort((a, b) => a - b)', [1, 2, 3]),
+    ("JSON.stringify({a: [1, 'x']})", '{"a":[1,"x"]}'),
+    ("parseInt('08')", 8),
+])
+def test_operators(source, expected):
+    assert evaluate(source, CONTEXT) == expected
+
+
+def test_division_by_zero_follows_javascript():
+    assert evaluate('1 / 0', {}) == math.inf
+    assert evaluate('-1 / 0', {}) == -math.inf
+    assert math.isnan(evaluate('0 / 0', {}))
+    assert evaluate('NaN < 1 || NaN >= 1', {}) is False
+
+
+@pytest.mark.parametrize('source, message', [
+    ('a = 1', 'unexpected'),
+    ('for (;;) {}', "'for' is not supported"),
+    ('class A {}', "'class' is not supported"),
+    ("/re/.test('x')", 'regex literals are not supported'),
+    ('nope', 'ReferenceError: nope is not defined'),
+    ('$json.missing.x', "TypeError: Cannot read properties of null (reading 'x')"),
+    ("JSON.parse('{')", 'JSON.parse'),
+    ("'x' in 'y'", "'in' needs an object"),
+    ('(1', "expected ')'"),
+])
+def test_errors(source, message):
+    with pytest.raises(ExpressionError, match=message.replace('(', r'\(').replace(')', r'\)')):
+        evaluate(source, CONTEXT)
+
+
+def test_resolve_keeps_type_of_lone_expression():
+    assert resolve('={{ $json.nested.list }}', CONTEXT) == [1, 2, 3]
+    assert resolve('=Hi {{ $json.name }}, {{ $json.count * 2 }}', CONTEXT) == 'Hi Ada, 6'
+    assert resolve({'a': ['={{ 1 + 1 }}', 'plain']}, CONTEXT) == {'a': [2, 'plain']}
+
+
+def test_run_code_statements():
+    code = (
+        "const items = $json.nested.list;\n"
+        "let label = 'few';\n"
+        "if (items.length > 2) { label = 'many'; }\n"
+        "return label;\n"
+    )
+    with pytest.raises(ExpressionError, match='assignment is not supported'):
+        run_code(code, CONTEXT)
+
+    code = (
+        "const items = $json.nested.list;\n"
+        "if (items.length > 2) {\n"
+        "  return items.map(n => ({ json: { n } }));\n"
+        "} else {\n"
+        "  return [];\n"
+        "}\n"
+    )
+    assert run_code(code, CONTEXT) == [{'json': {'n': 1}}, {'json': {'n': 2}}, {'json': {'n': 3}}]
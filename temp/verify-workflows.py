@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Verify every N8N workflow export in a set of directories at once.
+
+Each argument is a directory (its *.json files are checked), a glob or a
+file; by default the repo's export locations and the tracking scripts'
+Downloads copies. Files are checked in parallel worker processes with
+workflow_verify.analyze, and results are cached by content hash in
+.workflow-verify-cache.json, so unchanged exports are not parsed again.
+Exits non-zero if any workflow has errors.
+
+Examples:
+    python temp/verify-workflows.py
+    python temp/verify-workflows.py n8n-workflows temp -j 0
+    python temp/verify-workflows.py --json --output workflow-report.json
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from workflow_verify import verify_file
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_TARGETS = [
+    REPO_ROOT,
+    os.path.join(REPO_ROOT, 'workflows'),
+    os.path.join(REPO_ROOT, 'n8n-workflows'),
+    os.path.join(REPO_ROOT, 'temp'),
+    os.path.join(REPO_ROOT, 'scripts'),
+    os.path.expanduser('~/Downloads/SAM Master Campaign Orchestrator*.json'),
+]
+DEFAULT_CACHE_FILE = os.path.join(REPO_ROOT, '.workflow-verify-cache.json')
+
+
+def verifier_version():
+    """Hash of the verifier sources; a change invalidates every cached result."""
+    digest = hashlib.sha1()
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in ('workflow_graph.py', 'workflow_verify.py'):
+        with open(os.path.join(here, name), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def expand_targets(targets):
+    """Sorted, de-duplicated JSON files named by directories, globs or paths."""
+    paths = set()
+    for target in targets:
+        if os.path.isdir(target):
+            paths.update(glob.glob(os.path.join(target, '*.json')))
+        else:
+            paths.update(path for path in glob.glob(target) if os.path.isfile(path))
+    return sorted(os.path.relpath(path) for path in paths)
+
+
+def load_cache(cache_file, version):
+    try:
+        with open(cache_file, 'r') as f:
+            cache = json.load(f)
+        if cache.get('version') == version:
+            return cache['results']
+    except (OSError, ValueError, KeyError):
+        pass
+    return {}
+
+
+def save_cache(cache_file, version, results):
+    tmp_file = f"{cache_file}.tmp"
+    with open(tmp_file, 'w') as f:
+        json.dump({'version': version, 'results': results}, f, separators=(',', ':'))
+    os.replace(tmp_file, cache_file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Verify N8N workflow exports in bulk')
+    parser.add_argument('targets', nargs='*', help='directories, globs or files (default: repo export locations)')
+    parser.add_argument('--jobs', '-j', type=int, default=0,
+                        help='number of worker processes (0 = one per CPU, default: 0)')
+    parser.add_argument('--cache-file', default=DEFAULT_CACHE_FILE)
+    parser.add_argument('--no-cache', action='store_true', help='re-verify every file')
+    parser.add_argument('--json', action='store_true', help='print the combined report as JSON')
+    parser.add_argument('--output', metavar='FILE', help='also write the combined JSON report to FILE')
+    args = parser.parse_args()
+
+    paths = expand_targets(args.targets or DEFAULT_TARGETS)
+    version = verifier_version()
+    cache = {} if args.no_cache else load_cache(args.cache_file, version)
+
+    # Hash every file; only those not seen before go to the workers
+    digests = {}
+    results = {}
+    pending = []
+    for path in paths:
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError as e:
+            results[path] = {'error': f"{type(e).__name__}: {e}"}
+            continue
+        digest = digests[path] = hashlib.sha1(data).hexdigest()
+        if digest in cache:
+            results[path] = cache[digest]
+        elif b'"nodes"' not in data or b'"connections"' not in data:
+            results[path] = {'skipped': 'not a workflow export'}
+        else:
+            pending.append(path)
+
+    jobs = args.jobs or os.cpu_count() or 1
+    if jobs == 1 or len(pending) < 2:
+        fresh = map(verify_file, pending)
+        results.update(zip(pending, fresh))
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(pending))) as pool:
+            results.update(zip(pending, pool.map(verify_file, pending)))
+
+    if not args.no_cache:
+        save_cache(args.cache_file, version, {digests[path]: results[path] for path in paths if path in digests})
+
+    files = {path: results[path] for path in paths}
+    reports = [report for result in files.values() for report in result.get('workflows', [])]
+    summary = {
+        'files': len(paths),
+        # Only files whose checks actually ran; load/parse failures count as unreadable
+        'verified': sum(1 for path in pending if 'workflows' in results[path]),
+        'cached': sum(1 for path in paths if digests.get(path) in cache),
+        'skipped': sum(1 for result in files.values() if 'skipped' in result),
+        'unreadable': sum(1 for result in files.values() if 'error' in result),
+        'workflows': len(reports),
+        'failed': sum(1 for report in reports if not report['ok']),
+        'errors': sum(report['errors'] for report in reports),
+        'warnings': sum(report['warnings'] for report in reports),
+    }
+    combined = {'summary': summary, 'files': files}
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(combined, f, indent=2)
+
+    if args.json:
+        print(json.dumps(combined, indent=2))
+    else:
+        print(f"{'Workflow export':<70} {'nodes':>6} {'errors':>7} {'warn':>5}")
+        print("-" * 91)
+        for path, result in files.items():
+            if 'error' in result:
+                print(f"❌ {path:<67} unreadable: {result['error']}")
+            for report in result.get('workflows', []):
+                icon = '✅' if report['ok'] else '❌'
+                print(f"{icon} {path:<67} {report['nodes']:>6} {report['errors']:>7} {report['warnings']:>5}"
+                      f"  {report['workflow'] or ''}")
+        print(f"\n📊 {summary['files']} files ({summary['verified']} verified, {summary['cached']} cached, "
+              f"{summary['skipped']} not workflows, {summary['unreadable']} unreadable): "
+              f"{summary['workflows']} workflows")
+        print(f"   {summary['failed']} workflows failed - {summary['errors']} errors, {summary['warnings']} warnings")
+        if args.output:
+            print(f"   Report written to {args.output}")
+
+    sys.exit(1 if summary['failed'] or summary['unreadable'] else 0)
+
+
+if __name__ == '__main__':
+    main()
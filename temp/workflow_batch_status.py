@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Replace inline prospect-status HTTP nodes with a buffered, batched design.
+
+The tracking scripts put one HTTPS POST to .../prospect-status after every
+Send node, so each prospect costs up to 8 extra round trips and function
+invocations. This transform rewrites every such node, in place and under the
+same name (connections and $('Node') references keep working), into a Redis
+push of the same event onto a per-minute list, and adds a flush path:
+
+    Status Flush Schedule (every minute)
+      → List Status Buckets       Redis KEYS <prefix>*: every bucket not yet deleted
+      → Status Buckets To Flush   those no execution still pushes to, oldest first
+      → Read Status Bucket        Redis LRANGE of each bucket
+      → Batch Status Events       chunks of --batch-size events, per bucket
+      → Post Status Batch         POST {"events": [...]} to the bulk endpoint
+      → (success output) Flushed Buckets → Delete Status Bucket
+
+A Redis list is used rather than workflow static data because n8n saves
+static data whole at the end of each execution, so concurrent prospect
+executions would overwrite each other's events. Buckets have no TTL and the
+flush lists them by prefix rather than by age, so a bucket whose POST failed
+(or that piled up while the flush was down) is picked up again on the next
+run; failed batches go to the POST's error output and keep their bucket.
+
+Each converted node keeps its continueOnFail / onError setting, so with the
+export's continueOnFail a Redis outage is ignored like a failed status POST
+was, instead of failing the prospect's execution.
+
+Running the transform again is a no-op: the bulk POST and the other flush
+nodes are never converted, and the flush path is only added once.
+
+Bulk endpoint contract (--bulk-url):
+    POST, Authorization: Bearer <N8N_WEBHOOK_SECRET_TOKEN>
+    {"events": [<ProspectStatusUpdate>, ...]}   at most --batch-size events,
+    each as accepted by /api/campaigns/webhook/prospect-status.
+    Delivery is at least once (a bucket is deleted only after every batch
+    was accepted), so the endpoint must be idempotent on
+    (prospect_id, campaign_id, status) and answer 2xx only once all events
+    of the request are stored.
+
+After the rewrite every funnel stage the old nodes emitted is checked to
+still be emitted by the same node, the flush is checked to list every bucket
+the buffer nodes push to and to delete buckets only on the POST's success
+output, and the graph is re-verified.
+
+Example:
+    python temp/workflow_batch_status.py n8n-workflow-fixed-v2.json batched.json --redis-credential "SAM Redis"
+"""
+
+import argparse
+import json
+import re
+import sys
+from collections import Counter
+
+from workflow_graph import WorkflowGraph
+from workflow_verify import analyze
+
+DEFAULT_BULK_URL = 'https://app.meet-sam.com/api/campaigns/webhook/prospect-status/bulk'
+DEFAULT_KEY_PREFIX = 'sam:prospect-status:'
+BUCKET_FORMAT = 'yyyyMMddHHmm'
+FLUSH_NODES = ('Status Flush Schedule', 'List Status Buckets', 'Status Buckets To Flush', 'Read Status Bucket',
+               'Batch Status Events', 'Post Status Batch', 'Flushed Buckets', 'Delete Status Bucket')
+
+EXPRESSION = re.compile(r'\{\{(.*?)\}\}', re.DOTALL)
+# status: 'x' / "status": "x" in a body expression or JSON text
+STATUS_VALUE = re.compile(r"""["']?status["']?\s*:\s*\\?(["'])([A-Za-z0-9_]+)\\?\1""")
+# add-status-tracking.py writes {{ key: value, ... }} without the object braces
+BARE_FIELDS = re.compile(r'^\(\s*\w+\s*:')
+
+
+def is_status_node(node):
+    return (node.get('type', '').endswith('.httpRequest')
+            and 'prospect-status' in str(node.get('parameters', {}).get('url', '')))
+
+
+def is_inline_status_node(node, bulk_url=DEFAULT_BULK_URL):
+    """A per-prospect status POST still to be converted (not the flush path's bulk POST)."""
+    url = str(node.get('parameters', {}).get('url', ''))
+    return (is_status_node(node) and node.get('name') not in FLUSH_NODES
+            and url != bulk_url and 'prospect-status/bulk' not in url)
+
+
+def is_buffer_node(node, key_prefix=DEFAULT_KEY_PREFIX):
+    params = node.get('parameters', {})
+    return (node.get('type', '').endswith('.redis') and params.get('operation') == 'push'
+            and key_prefix in str(params.get('list', '')))
+
+
+def is_bucket_listing(node, key_prefix=DEFAULT_KEY_PREFIX):
+    params = node.get('parameters', {})
+    return (node.get('type', '').endswith('.redis') and params.get('operation') == 'keys'
+            and params.get('keyPattern') == f"{key_prefix}*")
+
+
+def is_bucket_delete(node):
+    return node.get('type', '').endswith('.redis') and node.get('parameters', {}).get('operation') == 'delete'
+
+
+def _template_literal(text):
+    return text.replace('\\', '\\\\').replace('`', '\\`').replace('${', '\\${')
+
+
+def to_js(value):
+    """An n8n parameter value ('=...{{ expr }}...' or a literal) as a JavaScript expression."""
+    if not (isinstance(value, str) and value.startswith('=')):
+        return json.dumps(value)
+    parts = EXPRESSION.split(value[1:])
+    if len(parts) == 3 and not parts[0].strip() and not parts[2].strip():
+        return f"({parts[1].strip()})"
+    return '`' + ''.join(
+        _template_literal(part) if index % 2 == 0 else '${' + part.strip() + '}'
+        for index, part in enumerate(parts)
+    ) + '`'
+
+
+def event_expression(node):
+    """n8n expression producing the status event of an HTTP status node as a JSON string."""
+    params = node.get('parameters', {})
+    if params.get('specifyBody') == 'json' or 'jsonBody' in params:
+        body = params.get('jsonBody', '{}')
+        js = to_js(body)
+        if BARE_FIELDS.match(js):
+            js = '({' + js[1:-1] + '})'
+        if not body.startswith('=') or js.startswith(('`', '(JSON.stringify(')):
+            return body if not body.startswith('=') else f"={{{{ {js} }}}}"  # already JSON text
+        return f"={{{{ JSON.stringify({js}) }}}}"
+    fields = ', '.join(
+        f"{json.dumps(param.get('name', ''))}: {to_js(param.get('value', ''))}"
+        for param in params.get('bodyParameters', {}).get('parameters', [])
+    )
+    return f"={{{{ JSON.stringify({{ {fields} }}) }}}}"
+
+
+def node_statuses(node):
+    """Funnel stages a status node (or its buffered replacement) emits."""
+    params = node.get('parameters', {})
+    statuses = [match.group(2) for match in STATUS_VALUE.finditer(
+        str(params.get('jsonBody', '')) + str(params.get('messageData', '')))]
+    for param in params.get('bodyParameters', {}).get('parameters', []):
+        if param.get('name') == 'status':
+            statuses.append(str(param.get('value')))
+    return statuses
+
+
+def emitted_stages(graph, key_prefix=DEFAULT_KEY_PREFIX):
+    """Counter of (node name, status) for every node that reports a funnel stage."""
+    stages = Counter()
+    for node in graph.nodes:
+        if is_status_node(node) or is_buffer_node(node, key_prefix):
+            for status in node_statuses(node):
+                stages[(node['name'], status)] += 1
+    return stages
+
+
+def _reachable(graph, starts, stop, branch=None):
+    """Names reachable from starts (on one branch of them if given) without passing a stop node."""
+    seen = set()
+    todo = [target for start in starts for target in graph.successors(start, branch)]
+    while todo:
+        name = todo.pop()
+        if name in seen or name not in graph:
+            continue
+        seen.add(name)
+        if not stop(graph.node(name)):
+            todo.extend(graph.successors(name))
+    return seen
+
+
+def flush_problems(graph, key_prefix=DEFAULT_KEY_PREFIX):
+    """
+    Check the failure path of the flush: every bucket a buffer node pushes to
+    is listed again on each run, and a bucket is only deleted after its POST
+    succeeded (never without a POST, never from the POST's error output).
+    """
+    buffers = [node for node in graph.nodes if is_buffer_node(node, key_prefix)]
+    if not buffers:
+        return []
+    problems = []
+    listings = [node['name'] for node in graph.nodes if is_bucket_listing(node, key_prefix)]
+    if not listings:
+        problems.append(f"no Redis node lists '{key_prefix}*', so unflushed buckets are never read again")
+    for node in buffers:
+        if not str(node['parameters'].get('list', '')).lstrip('=').startswith(key_prefix):
+            problems.append(f"{node['name']} pushes to a key outside '{key_prefix}*'")
+
+    posts = [node['name'] for node in graph.nodes if is_status_node(node)]
+    deletes = {node['name'] for node in graph.nodes if is_bucket_delete(node)}
+    for name in sorted(deletes & _reachable(graph, listings, is_status_node)):
+        problems.append(f"{name} deletes buckets without posting them")
+    for post in posts:
+        node = graph.node(post)
+        if node.get('continueOnFail') or node.get('onError') == 'continueRegularOutput':
+            problems.append(f"{post} passes failed batches on as posted")
+        failed = set()
+        for branch in range(1, len(graph.branches(post))):
+            failed |= _reachable(graph, [post], lambda node: False, branch)
+        for name in sorted(deletes & failed):
+            problems.append(f"{name} deletes buckets whose POST failed")
+    return problems
+
+
+def _redis_credentials(name):
+    return {'credentials': {'redis': {'name': name}}} if name else {}
+
+
+def _node(graph, name, node_type, type_version, parameters, position, **extra):
+    node = {'parameters': parameters, 'id': graph.node_id(name), 'name': name, 'type': node_type,
+            'typeVersion': type_version, 'position': position}
+    node.update(extra)
+    return node
+
+
+def batch_status_updates(graph, bulk_url=DEFAULT_BULK_URL, batch_size=100, key_prefix=DEFAULT_KEY_PREFIX,
+                         redis_credential=None, flush_lag_minutes=2, max_buckets=30):
+    """Rewrite graph in place; returns the names of the status nodes that now buffer."""
+    status_nodes = [node for node in graph.nodes if is_inline_status_node(node, bulk_url)]
+    if not status_nodes:
+        return []
+
+    authorization = 'Bearer {{ $env.N8N_WEBHOOK_SECRET_TOKEN }}'
+    for node in status_nodes:
+        for header in node['parameters'].get('headerParameters', {}).get('parameters', []):
+            if header.get('name', '').lower() == 'authorization':
+                authorization = header.get('value')
+                break
+
+    bucket = f"={key_prefix}{{{{ $now.toUTC().toFormat('{BUCKET_FORMAT}') }}}}"
+    for node in status_nodes:
+        message = event_expression(node)
+        # HTTP retry settings and credentials do not apply to the push; continueOnFail / onError stay
+        for key in ('retryOnFail', 'maxTries', 'waitBetween', 'credentials'):
+            node.pop(key, None)
+        node.update({
+            'type': 'n8n-nodes-base.redis',
+            'typeVersion': 1,
+            'parameters': {'operation': 'push', 'list': bucket, 'messageData': message, 'tail': True},
+        })
+        node.update(_redis_credentials(redis_credential))
+    if any(name in graph for name in FLUSH_NODES):
+        return [node['name'] for node in status_nodes]
+
+    # Flush path, laid out under the existing canvas
+    positions = [node.get('position', [0, 0]) for node in graph.nodes]
+    x = min(position[0] for position in positions)
+    y = max(position[1] for position in positions) + 400
+
+    flush = [
+        _node(graph, 'Status Flush Schedule', 'n8n-nodes-base.scheduleTrigger', 1.1,
+              {'rule': {'interval': [{'field': 'minutes', 'minutesInterval': 1}]}}, [x, y]),
+        _node(graph, 'List Status Buckets', 'n8n-nodes-base.redis', 1,
+              {'operation': 'keys', 'keyPattern': f"{key_prefix}*", 'getValues': False}, [x + 220, y],
+              **_redis_credentials(redis_credential)),
+        _node(graph, 'Status Buckets To Flush', 'n8n-nodes-base.code', 2, {'jsCode': (
+            f"// Pending buckets old enough that no execution still pushes to them, oldest first;\n"
+            f"// anything left over (failed POST, flush down) is listed again next run\n"
+            f"const PREFIX = '{key_prefix}';\n"
+            f"const cutoff = PREFIX + $now.minus({{ minutes: {flush_lag_minutes} }}).toUTC().toFormat('{BUCKET_FORMAT}');\n"
+            f"const keys = ($json.keys || [])\n"
+            f"  .filter(key => /^\\d{{12}}$/.test(key.slice(PREFIX.length)) && key <= cutoff)\n"
+            f"  .sort()\n"
+            f"  .slice(0, {max_buckets});\n"
+            f"return keys.map(key => ({{ json: {{ key }} }}));")}, [x + 440, y]),
+        _node(graph, 'Read Status Bucket', 'n8n-nodes-base.redis', 1,
+              {'operation': 'get', 'propertyName': 'events', 'key': '={{ $json.key }}', 'keyType': 'list',
+               'options': {}}, [x + 660, y], **_redis_credentials(redis_credential)),
+        _node(graph, 'Batch Status Events', 'n8n-nodes-base.code', 2, {'jsCode': (
+            f"// Batches never mix buckets, so one failed POST only holds back its own bucket\n"
+            f"const BATCH_SIZE = {batch_size};\n"
+            f"const batches = [];\n"
+            f"for (const item of $input.all()) {{\n"
+            f"  const events = (item.json.events || []).map(event => typeof event === 'string' ? JSON.parse(event) : event);\n"
+            f"  for (let i = 0; i < events.length; i += BATCH_SIZE) {{\n"
+            f"    batches.push({{ json: {{ key: item.json.key, events: events.slice(i, i + BATCH_SIZE) }} }});\n"
+            f"  }}\n"
+            f"}}\n"
+            f"return batches;")}, [x + 880, y]),
+        _node(graph, 'Post Status Batch', 'n8n-nodes-base.httpRequest', 3, {
+            'method': 'POST',
+            'url': bulk_url,
+            'sendHeaders': True,
+            'headerParameters': {'parameters': [
+                {'name': 'Authorization', 'value': authorization},
+                {'name': 'Content-Type', 'value': 'application/json'},
+            ]},
+            'sendBody': True,
+            'specifyBody': 'json',
+            'jsonBody': '={{ JSON.stringify({ events: $json.events }) }}',
+            'options': {},
+        }, [x + 1100, y], retryOnFail=True, maxTries=3, waitBetween=5000, onError='continueErrorOutput'),
+        _node(graph, 'Flushed Buckets', 'n8n-nodes-base.code', 2, {'jsCode': (
+            "// Only accepted batches arrive here (failures take the error output): a bucket\n"
+            "// can go once every one of its batches was accepted\n"
+            "const batches = $('Batch Status Events').all();\n"
+            "const posted = new Set();\n"
+            "for (const item of $input.all()) {\n"
+            "  for (const paired of [].concat(item.pairedItem ?? [])) {\n"
+            "    posted.add(typeof paired === 'number' ? paired : paired.item);\n"
+            "  }\n"
+            "}\n"
+            "const held = new Set(batches.filter((batch, index) => !posted.has(index)).map(batch => batch.json.key));\n"
+            "const keys = new Set(batches.map(batch => batch.json.key).filter(key => !held.has(key)));\n"
+            "return [...keys].map(key => ({ json: { key } }));")}, [x + 1320, y]),
+        _node(graph, 'Delete Status Bucket', 'n8n-nodes-base.redis', 1,
+              {'operation': 'delete', 'key': '={{ $json.key }}'}, [x + 1540, y],
+              **_redis_credentials(redis_credential)),
+    ]
+    for node in flush:
+        graph.add_node(node)
+    for source, target in zip(flush, flush[1:]):
+        graph.connect(source['name'], target['name'])
+    return [node['name'] for node in status_nodes]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Buffer prospect-status updates and post them in batches')
+    parser.add_argument('input', help='workflow JSON export')
+    parser.add_argument('output', help='where to write the transformed workflow')
+    parser.add_argument('--bulk-url', default=DEFAULT_BULK_URL)
+    parser.add_argument('--batch-size', type=int, default=100, help='events per bulk request (default: 100)')
+    parser.add_argument('--key-prefix', default=DEFAULT_KEY_PREFIX, help='Redis list key prefix')
+    parser.add_argument('--redis-credential', metavar='NAME', help='name of the n8n Redis credential to attach')
+    args = parser.parse_args()
+
+    graph = WorkflowGraph.load(args.input)
+    before = emitted_stages(graph, args.key_prefix)
+    unreachable_before = set(analyze(graph)['unreachable'])
+
+    print("🔧 Buffering prospect-status updates...\n")
+    replaced = batch_status_updates(graph, args.bulk_url, args.batch_size, args.key_prefix, args.redis_credential)
+    if not replaced:
+        print("✅ No inline prospect-status nodes found - nothing to do")
+        graph.save(args.output)
+        print(f"   Copied unchanged to: {args.output}")
+        return
+    for name in replaced:
+        print(f"  ✅ {name}: HTTP POST → Redis push ({', '.join(node_statuses(graph.node(name))) or '?'})")
+
+    # Every stage must still be emitted, by the same node, and nothing may have come loose
+    after = emitted_stages(graph, args.key_prefix)
+    report = analyze(graph)
+    missing = before - after
+    problems = [f"{name} no longer emits '{status}'" for name, status in sorted(missing)]
+    problems += [f"{name} became unreachable" for name in report['unreachable'] if name not in unreachable_before]
+    problems += [f"dangling edge {edge['source']} → {edge['target']}" for edge in report['dangling_edges']]
+    problems += flush_problems(graph, args.key_prefix)
+
+    statuses = sorted({status for _, status in before})
+    print(f"\n📊 {len(replaced)} inline status calls replaced; {len(statuses)} funnel stages still emitted:")
+    print(f"   {', '.join(statuses)}")
+    print(f"   Flush: every minute, ≤{args.batch_size} events per POST to {args.bulk_url}")
+    print(f"   Failed POSTs keep their bucket in Redis until a later flush succeeds")
+    if problems:
+        print(f"\n❌ Verification failed:")
+        for problem in problems:
+            print(f"   - {problem}")
+        sys.exit(1)
+
+    graph.save(args.output)
+    print(f"\n✅ Saved to: {args.output}")
+    if not args.redis_credential:
+        print("⚠️  No --redis-credential given: select the Redis credential on the 4 Redis nodes after import")
+
+
+if __name__ == '__main__':
+    main()
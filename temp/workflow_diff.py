@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Semantic diff of two N8N workflow exports.
+
+Nodes are matched by id first and then, for nodes whose id changed (the
+tracking scripts regenerate ids), by name. Every node's content - all keys
+except id, name and position - is hashed once, so matched nodes with equal
+hashes are skipped without comparing parameters. For the rest, the changed
+fields are reported as flattened paths such as parameters.url or
+parameters.bodyParameters.parameters[2].value. Edges are compared per
+source output, so a re-pointed branch shows up as one rewired output.
+
+Everything is dict/set based: linear in nodes + edges.
+
+Examples:
+    python temp/workflow_diff.py temp/SAM-Master-Campaign-Orchestrator-CORRECTED.json n8n-workflow-fixed-v2.json
+    python temp/workflow_diff.py old.json new.json --json
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+
+from workflow_graph import WorkflowGraph
+
+IGNORED_KEYS = ('id', 'name', 'position')
+
+
+def node_content(node):
+    return {key: value for key, value in node.items() if key not in IGNORED_KEYS}
+
+
+def content_hash(node):
+    data = json.dumps(node_content(node), sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+
+def flatten(value, prefix='', out=None):
+    """{'a.b[0].c': leaf, ...} for a nested dict/list structure."""
+    if out is None:
+        out = {}
+    if isinstance(value, dict) and value:
+        for key, item in value.items():
+            flatten(item, f"{prefix}.{key}" if prefix else key, out)
+    elif isinstance(value, list) and value:
+        for index, item in enumerate(value):
+            flatten(item, f"{prefix}[{index}]", out)
+    else:
+        out[prefix] = value
+    return out
+
+
+def changed_fields(old_node, new_node):
+    """[{'path', 'old', 'new'}, ...] for every leaf that differs (missing leaves are None)."""
+    old_fields = flatten(node_content(old_node))
+    new_fields = flatten(node_content(new_node))
+    changes = []
+    for path in list(old_fields) + [path for path in new_fields if path not in old_fields]:
+        old_value = old_fields.get(path)
+        new_value = new_fields.get(path)
+        if old_value != new_value:
+            changes.append({'path': path, 'old': old_value, 'new': new_value})
+    return changes
+
+
+def match_nodes(old, new):
+    """{old name: new name} for nodes present in both (by id, then by name)."""
+    matched = {}
+    taken = set()
+    for node in old.nodes:
+        other = new.node_by_id(node.get('id')) if node.get('id') else None
+        if other is not None:
+            matched[node['name']] = other['name']
+            taken.add(other['name'])
+    for node in old.nodes:
+        name = node['name']
+        if name not in matched and name in new and name not in taken:
+            matched[name] = name
+            taken.add(name)
+    return matched
+
+
+def output_edges(graph, rename=None):
+    """{(source, output type, branch): sorted [target, ...]} with names mapped through rename."""
+    rename = rename or {}
+    outputs = {}
+    for source, conn_data in graph.connections.items():
+        for output_type, branches in conn_data.items():
+            for branch, targets in enumerate(branches):
+                if targets:
+                    key = (rename.get(source, source), output_type, branch)
+                    outputs[key] = sorted(rename.get(conn['node'], conn['node']) for conn in targets)
+    return outputs
+
+
+def diff_workflows(old, new):
+    """Diff two WorkflowGraphs; returns a JSON-able dict."""
+    matched = match_nodes(old, new)
+    new_matched = set(matched.values())
+
+    added = [node['name'] for node in new.nodes if node['name'] not in new_matched]
+    removed = [node['name'] for node in old.nodes if node['name'] not in matched]
+    renamed = [{'old': old_name, 'new': new_name} for old_name, new_name in matched.items() if old_name != new_name]
+
+    modified = []
+    moved = []
+    unchanged = 0
+    for old_name, new_name in matched.items():
+        old_node = old.node(old_name)
+        new_node = new.node(new_name)
+        if old_node.get('position') != new_node.get('position'):
+            moved.append(new_name)
+        if content_hash(old_node) == content_hash(new_node):
+            unchanged += 1
+            continue
+        modified.append({'node': new_name, 'changes': changed_fields(old_node, new_node)})
+
+    # Old edges are expressed in new names, so renames alone do not rewire
+    old_outputs = output_edges(old, matched)
+    new_outputs = output_edges(new)
+    rewired = []
+    for key in list(old_outputs) + [key for key in new_outputs if key not in old_outputs]:
+        before = old_outputs.get(key, [])
+        after = new_outputs.get(key, [])
+        if before != after:
+            source, output_type, branch = key
+            rewired.append({'source': source, 'type': output_type, 'branch': branch,
+                            'old': before, 'new': after})
+
+    return {
+        'old': old.workflow.get('name'),
+        'new': new.workflow.get('name'),
+        'added': added,
+        'removed': removed,
+        'renamed': renamed,
+        'modified': modified,
+        'moved': moved,
+        'rewired': rewired,
+        'unchanged': unchanged,
+        'identical': not (added or removed or renamed or modified or rewired),
+    }
+
+
+def _short(value, width=70):
+    text = json.dumps(value, ensure_ascii=False) if not isinstance(value, str) else value
+    text = text.replace('\n', '\\n')
+    return text if len(text) <= width else text[:width - 3] + '...'
+
+
+def print_diff(diff):
+    print(f"🔍 {diff['old']} → {diff['new']}\n")
+    for name in diff['added']:
+        print(f"  ➕ Added: {name}")
+    for name in diff['removed']:
+        print(f"  ➖ Removed: {name}")
+    for rename in diff['renamed']:
+        print(f"  ✏️  Renamed: {rename['old']} → {rename['new']}")
+    for entry in diff['modified']:
+        print(f"  🔧 Modified: {entry['node']}")
+        for change in entry['changes']:
+            print(f"       {change['path']}: {_short(change['old'])} → {_short(change['new'])}")
+    for edge in diff['rewired']:
+        output = edge['source'] if edge['type'] == 'main' else f"{edge['source']} ({edge['type']})"
+        print(f"  🔀 Rewired: {output} [{edge['branch']}]: "
+              f"{', '.join(edge['old']) or 'nothing'} → {', '.join(edge['new']) or 'nothing'}")
+    print(f"\n📊 {len(diff['added'])} added, {len(diff['removed'])} removed, {len(diff['renamed'])} renamed, "
+          f"{len(diff['modified'])} modified, {len(diff['rewired'])} outputs rewired, "
+          f"{diff['unchanged']} unchanged ({len(diff['moved'])} moved on the canvas)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Semantic diff of two N8N workflow exports')
+    parser.add_argument('old')
+    parser.add_argument('new')
+    parser.add_argument('--json', action='store_true', help='print the diff as JSON')
+    args = parser.parse_args()
+
+    graphs = []
+    for path in (args.old, args.new):
+        try:
+            graphs.append(WorkflowGraph.load(path))
+        except (OSError, ValueError) as e:
+            print(f"❌ Cannot read {path}: {e}")
+            sys.exit(2)
+
+    diff = diff_workflows(*graphs)
+    if args.json:
+        print(json.dumps(diff, indent=2, ensure_ascii=False))
+    else:
+        print_diff(diff)
+    sys.exit(0 if diff['identical'] else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,1001 @@
+#!/usr/bin/env python3
+"""
+Run N8N workflow exports natively on asyncio: every prospect is a small
+task instead of an n8n execution holding a slot for days.
+
+Supported nodes: webhook / manual / schedule triggers, httpRequest, IF (v1
+and v2 conditions), Set (v1 - v3), Code / Function / FunctionItem in
+Code-lite (the JavaScript subset of workflow_expr), Wait (time interval or
+specific time), respondToWebhook and noOp. Any other node type fails the
+execution with "unsupported node type".
+
+Wait nodes hold nothing open. The items at the Wait and the last output of
+every node so far (for $('Node') / $node[...] references) go to a SQLite
+store with the due timestamp, and the scheduler loop resumes rows as they
+fall due. Stopping the process loses nothing that is parked: rows that were
+being resumed are released on the next start, so a resume runs at least
+once.
+
+When a node outputs several items (the Code node that splits the webhook's
+prospect list), each item continues as its own execution, so prospects are
+independent; --no-fan-out keeps n8n's all-items-together semantics. An HTTP
+node that calls one of this workflow's own Wait/Webhook URLs (`Loop Back to
+Wait`) continues at that node in-process.
+
+--http-base sends every request to a stand-in server instead of the real
+host (path and query kept, original host in X-Forwarded-Host). `serve` runs
+such a stand-in from a routes file, first match wins, `delay` in seconds:
+
+    {"POST /api/v1/users/invite": {"status": 201, "body": {"object": "UserInvitationSent"}},
+     "GET /api/v1/users/*": {"body": {"provider_id": "p1", "is_connected": true}, "delay": 0.05},
+     "*": {"body": {}}}
+
+Examples:
+    python temp/workflow_executor.py serve stand-in.json --port 8765
+    python temp/workflow_executor.py run n8n-workflow-fixed-v2.json --payload campaign.json \\
+        --http-base http://127.0.0.1:8765 --speed 86400 --env UNIPILE_DSN=unipile.local
+    python temp/workflow_executor.py run n8n-workflow-fixed-v2.json     # resume what is parked
+    python temp/workflow_executor.py status
+"""
+
+import argparse
+import asyncio
+import fnmatch
+import json
+import os
+import re
+import sqlite3
+import ssl
+import sys
+import time
+import uuid
+from collections import Counter, deque
+from datetime import datetime, timezone
+from urllib.parse import urlencode, urlsplit
+
+from workflow_expr import (UNDEFINED, DateTime, ExpressionError, parse_datetime, resolve, run_code, to_json,
+                           to_number, to_string, truthy)
+from workflow_graph import WorkflowGraph
+from workflow_verify import is_entry, output_count, resume_edges
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DB = os.path.join(REPO_ROOT, '.workflow-executor.db')
+UNIT_SECONDS = {'seconds': 1, 'minutes': 60, 'hours': 3600, 'days': 86400}
+
+
+class NodeError(Exception):
+    """A node failed; the execution stops unless the node continues on fail."""
+
+
+NODE_REFERENCE = re.compile(r"""\$\(\s*(['"])(.+?)\1\s*\)|\$node\[\s*(['"])(.+?)\3\s*\]""")
+
+
+def referenced_nodes(graph):
+    """Names used in $('Name') / $node['Name']: the only outputs an execution has to keep."""
+    names = set()
+    for node in graph.nodes:
+        for match in NODE_REFERENCE.finditer(json.dumps(node.get('parameters', {}), ensure_ascii=False)
+                                             .replace('\\"', '"')):
+            names.add(match.group(2) or match.group(4))
+    return names
+
+
+# ---------------------------------------------------------------------------
+# Clock and store
+# ---------------------------------------------------------------------------
+
+class Clock:
+    """Wall clock, optionally running `speed` times faster than real time."""
+
+    def __init__(self, speed=1.0, start=None):
+        self.speed = speed
+        self.real_start = time.time()
+        self.virtual_start = max(self.real_start, start or 0)
+
+    def time(self):
+        return self.virtual_start + (time.time() - self.real_start) * self.speed
+
+    def now(self):
+        return datetime.fromtimestamp(self.time(), timezone.utc)
+
+    async def sleep(self, seconds):
+        await asyncio.sleep(max(0.0, seconds) / self.speed)
+
+
+class Store:
+    """SQLite state: executions and the Waits they are parked in."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS executions (
+            id TEXT PRIMARY KEY, workflow TEXT, status TEXT, started_at REAL, finished_at REAL,
+            last_node TEXT, error TEXT, run_data TEXT, response TEXT);
+        CREATE INDEX IF NOT EXISTS executions_status ON executions (status);
+        CREATE TABLE IF NOT EXISTS waits (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, execution_id TEXT, node TEXT, due_at REAL,
+            items TEXT, claimed INTEGER DEFAULT 0);
+        CREATE INDEX IF NOT EXISTS waits_due ON waits (claimed, due_at);
+        CREATE INDEX IF NOT EXISTS waits_execution ON waits (execution_id);
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+    """
+
+    def __init__(self, path):
+        self.db = sqlite3.connect(path)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.executescript(self.SCHEMA)
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
+
+    def get_meta(self, key, default=None):
+        row = self.db.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_meta(self, key, value):
+        self.db.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, json.dumps(value)))
+        self.db.commit()
+
+    def start_execution(self, execution_id, workflow, started_at):
+        self.db.execute('INSERT OR REPLACE INTO executions (id, workflow, status, started_at) VALUES (?, ?, ?, ?)',
+                        (execution_id, workflow, 'running', started_at))
+
+    def park(self, execution_id, node, due_at, items, run_data):
+        self.db.execute('INSERT INTO waits (execution_id, node, due_at, items) VALUES (?, ?, ?, ?)',
+                        (execution_id, node, due_at, json.dumps(items)))
+        self.db.execute('UPDATE executions SET run_data = ? WHERE id = ?', (json.dumps(run_data), execution_id))
+        self.db.commit()
+
+    def claim_due(self, now, limit):
+        rows = self.db.execute(
+            'SELECT id, execution_id, node, items FROM waits WHERE claimed = 0 AND due_at <= ? ORDER BY due_at LIMIT ?',
+            (now, limit)).fetchall()
+        if rows:
+            self.db.executemany('UPDATE waits SET claimed = 1 WHERE id = ?', [(row[0],) for row in rows])
+            self.db.executemany("UPDATE executions SET status = 'running' WHERE id = ?", [(row[1],) for row in rows])
+            self.db.commit()
+        return [(wait_id, execution_id, node, json.loads(items)) for wait_id, execution_id, node, items in rows]
+
+    def run_data(self, execution_id):
+        row = self.db.execute('SELECT run_data FROM executions WHERE id = ?', (execution_id,)).fetchone()
+        return json.loads(row[0]) if row and row[0] else {}
+
+    def release(self, wait_id):
+        self.db.execute('DELETE FROM waits WHERE id = ?', (wait_id,))
+
+    def release_claims(self):
+        """Resumes that were in flight when the last process stopped run again."""
+        count = self.db.execute('UPDATE waits SET claimed = 0 WHERE claimed = 1').rowcount
+        self.db.commit()
+        return count
+
+    def has_waits(self, execution_id):
+        return self.db.execute('SELECT 1 FROM waits WHERE execution_id = ? LIMIT 1', (execution_id,)).fetchone() is not None
+
+    def finish(self, execution_id, status, finished_at, last_node=None, error=None, response=None, run_data=None):
+        self.db.execute(
+            'UPDATE executions SET status = ?, finished_at = ?, last_node = ?, error = ?, response = ?, run_data = ? '
+            'WHERE id = ?',
+            (status, finished_at if status != 'waiting' else None, last_node, error,
+             json.dumps(response) if response is not None else None,
+             json.dumps(run_data) if run_data is not None else None, execution_id))
+        self.db.commit()
+
+    def next_due(self):
+        return self.db.execute('SELECT MIN(due_at) FROM waits WHERE claimed = 0').fetchone()[0]
+
+    def summary(self):
+        statuses = dict(self.db.execute('SELECT status, COUNT(*) FROM executions GROUP BY status').fetchall())
+        parked = dict(self.db.execute('SELECT node, COUNT(*) FROM waits GROUP BY node ORDER BY 2 DESC').fetchall())
+        errors = self.db.execute(
+            "SELECT last_node, error, COUNT(*) FROM executions WHERE status = 'error' "
+            'GROUP BY last_node, error ORDER BY 3 DESC LIMIT 10').fetchall()
+        return {'executions': statuses, 'parked': parked, 'next_due': self.next_due(),
+                'errors': [{'node': node, 'error': error, 'count': count} for node, error, count in errors]}
+
+
+# ---------------------------------------------------------------------------
+# HTTP: a small asyncio client and the stand-in server
+# ---------------------------------------------------------------------------
+
+async def _read_head(reader):
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    headers = {}
+    for line in lines[1:]:
+        if ':' in line:
+            key, _, value = line.partition(':')
+            headers[key.strip().lower()] = value.strip()
+    return lines[0], headers
+
+
+async def _read_body(reader, headers):
+    if headers.get('transfer-encoding', '').lower() == 'chunked':
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b';')[0].strip() or b'0', 16)
+            if size == 0:
+                await reader.readline()
+                return b''.join(chunks)
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+    if 'content-length' in headers:
+        return await reader.readexactly(int(headers['content-length']))
+    return await reader.read()
+
+
+async def http_request(method, url, headers=None, body=b'', timeout=30.0):
+    """(status, headers, body bytes) for one HTTP/1.1 request on a fresh connection."""
+    parts = urlsplit(url)
+    try:
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+    except ValueError:
+        port = None
+    if parts.scheme not in ('http', 'https') or not parts.hostname or port is None:
+        raise NodeError(f"invalid URL {url!r}")
+    context = ssl.create_default_context() if parts.scheme == 'https' else None
+
+    async def exchange():
+        reader, writer = await asyncio.open_connection(parts.hostname, port, ssl=context)
+        try:
+            target = (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+            lines = [f"{method} {target} HTTP/1.1", f"Host: {parts.netloc}", 'Connection: close',
+                     f"Content-Length: {len(body)}"]
+            lines += [f"{key}: {value}" for key, value in (headers or {}).items()]
+            writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+            await writer.drain()
+            status_line, response_headers = await _read_head(reader)
+            data = await _read_body(reader, response_headers)
+            return int(status_line.split()[1]), response_headers, data
+        finally:
+            writer.close()
+
+    try:
+        return await asyncio.wait_for(exchange(), timeout)
+    except asyncio.TimeoutError:
+        raise NodeError(f"{method} {url} timed out after {timeout:g}s")
+    except (OSError, asyncio.IncompleteReadError, ValueError, IndexError) as e:
+        raise NodeError(f"{method} {url} failed: {e}")
+
+
+class StandIn:
+    """Local HTTP server answering from a {'METHOD /path/glob': response} routes dict."""
+
+    def __init__(self, routes):
+        self.routes = []
+        for key, response in routes.items():
+            method, _, path = key.partition(' ')
+            if not path:
+                method, path = '*', key
+            self.routes.append((method.upper(), path, key, response))
+        self.hits = Counter()
+        self.server = None
+
+    def match(self, method, path):
+        for route_method, pattern, key, response in self.routes:
+            if fnmatch.fnmatchcase(method, route_method) and fnmatch.fnmatchcase(path, pattern):
+                return key, response
+        return None, {'status': 404, 'body': {'error': f"no stand-in route for {method} {path}"}}
+
+    async def handle(self, reader, writer):
+        try:
+            request_line, headers = await _read_head(reader)
+            await _read_body(reader, headers) if 'content-length' in headers else None
+            method, target = request_line.split()[:2]
+            key, response = self.match(method, urlsplit(target).path)
+            self.hits[key or f"{method} {urlsplit(target).path} (404)"] += 1
+            if response.get('delay'):
+                await asyncio.sleep(response['delay'])
+            body = response.get('body', {})
+            data = (body if isinstance(body, str) else json.dumps(body)).encode('utf-8')
+            content_type = 'text/plain' if isinstance(body, str) else 'application/json'
+            writer.write((f"HTTP/1.1 {response.get('status', 200)} Stand-in\r\nContent-Type: {content_type}\r\n"
+                          f"Content-Length: {len(data)}\r\nConnection: close\r\n\r\n").encode('latin-1') + data)
+            await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host='127.0.0.1', port=0):
+        self.server = await asyncio.start_server(self.handle, host, port, backlog=1024)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+
+
+# ---------------------------------------------------------------------------
+# Executor
+# ---------------------------------------------------------------------------
+
+class Execution:
+    def __init__(self, execution_id, run_data=None):
+        self.id = execution_id
+        self.run_data = run_data or {}  # node name -> last output items
+        self.response = None
+        self.queue = deque()            # (node name, items) still to run in this stretch
+        self.last_node = None
+
+
+class _NodeLookup(dict):
+    """$node['Name'] without building an entry per node on every evaluation."""
+
+    def __init__(self, executor, execution):
+        super().__init__()
+        self.executor = executor
+        self.execution = execution
+
+    def get(self, name, default=None):
+        items = self.execution.run_data.get(name)
+        if items is None:
+            return default
+        first = items[0] if items else {'json': {}}
+        return {'json': first['json'], 'parameter': self.executor.graph.node(name).get('parameters', {}),
+                'runIndex': 0}
+
+
+def _items(value):
+    """Normalize what a Code / Function node returned into n8n items."""
+    if value is UNDEFINED or value is None:
+        raise NodeError("Code doesn't return items properly (it returned nothing)")
+    if isinstance(value, dict):
+        value = [value]
+    if not isinstance(value, list):
+        raise NodeError(f"Code doesn't return items properly (it returned {to_string(value)!r})")
+    items = []
+    for entry in value:
+        if isinstance(entry, dict) and isinstance(entry.get('json'), dict):
+            items.append({'json': to_json(entry['json'])})
+        elif isinstance(entry, dict):
+            items.append({'json': to_json(entry)})
+        else:
+            raise NodeError('Code returned an item that is not an object')
+    return items
+
+
+def _set_path(target, path, value):
+    keys = path.split('.')
+    for key in keys[:-1]:
+        if not isinstance(target.get(key), dict):
+            target[key] = {}
+        target = target[key]
+    target[keys[-1]] = value
+
+
+def _convert(value, kind):
+    if kind in ('number', 'numberValue'):
+        return to_number(value)
+    if kind in ('boolean', 'booleanValue'):
+        return value.strip().lower() == 'true' if isinstance(value, str) else truthy(value)
+    if kind in ('string', 'stringValue'):
+        return to_string(value)
+    if kind in ('array', 'object', 'arrayValue', 'objectValue') and isinstance(value, str):
+        try:
+            return json.loads(value)
+        except ValueError:
+            raise NodeError(f"{value!r} is not valid JSON for a {kind} field")
+    return value
+
+
+def _to_bool(value):
+    if isinstance(value, str):
+        return value.strip().lower() == 'true'
+    return truthy(value)
+
+
+def _empty(value):
+    return value in (None, UNDEFINED, '') or (isinstance(value, (list, dict)) and not value)
+
+
+# IF v1 operation names and the v2 names they mean
+IF_ALIASES = {'equal': 'equals', 'notEqual': 'notEquals', 'larger': 'gt', 'largerEqual': 'gte',
+              'smaller': 'lt', 'smallerEqual': 'lte', 'isEmpty': 'empty', 'isNotEmpty': 'notEmpty',
+              'after': 'gt', 'before': 'lt', 'afterOrEquals': 'gte', 'beforeOrEquals': 'lte'}
+
+
+def compare(kind, operation, left, right, case_sensitive=True):
+    """One IF condition."""
+    operation = IF_ALIASES.get(operation, operation)
+    if operation in ('exists', 'notExists'):
+        return (left not in (None, UNDEFINED)) == (operation == 'exists')
+    if operation in ('empty', 'notEmpty'):
+        return _empty(left) == (operation == 'empty')
+    if kind == 'boolean':
+        left = _to_bool(left)
+        if operation in ('true', 'false'):
+            return left == (operation == 'true')
+        right = _to_bool(right)
+    elif kind == 'number':
+        left, right = to_number(left), to_number(right)
+    elif kind == 'dateTime':
+        left, right = (parse_datetime(value) for value in (left, right))
+        if left is None or right is None:
+            raise NodeError('IF: value is not a valid date')
+    elif kind == 'array':
+        if operation in ('contains', 'notContains'):
+            found = any(to_string(entry) == to_string(right) for entry in (left or []))
+            return found == (operation == 'contains')
+        if operation.startswith('length'):
+            left, right, operation = len(left or []), to_number(right), operation[6:].lower() or 'equals'
+            operation = {'equal': 'equals', 'notequal': 'notEquals', 'gt': 'gt', 'lt': 'lt',
+                         'gte': 'gte', 'lte': 'lte'}.get(operation, operation)
+    else:
+        left, right = to_string(left), to_string(right)
+        if not case_sensitive:
+            left, right = left.lower(), right.lower()
+    checks = {
+        'equals': lambda: left == right, 'notEquals': lambda: left != right,
+        'gt': lambda: left > right, 'lt': lambda: left < right,
+        'gte': lambda: left >= right, 'lte': lambda: left <= right,
+        'contains': lambda: right in left, 'notContains': lambda: right not in left,
+        'startsWith': lambda: left.startswith(right), 'notStartsWith': lambda: not left.startswith(right),
+        'endsWith': lambda: left.endswith(right), 'notEndsWith': lambda: not left.endswith(right),
+    }
+    if operation not in checks:
+        raise NodeError(f"IF operation {kind}.{operation} is not supported")
+    try:
+        return checks[operation]()
+    except TypeError:
+        raise NodeError(f"IF: cannot compare {to_string(left)!r} and {to_string(right)!r} with {operation}")
+
+
+class Executor:
+    """Runs executions of one workflow against a Store."""
+
+    def __init__(self, graph, store, clock, env=None, http_base=None, fan_out=True, concurrency=100,
+                 http_timeout=30.0, trace=False, log=print):
+        self.graph = graph
+        self.store = store
+        self.clock = clock
+        self.env = env if env is not None else dict(os.environ)
+        self.http_base = http_base.rstrip('/') if http_base else None
+        self.fan_out = fan_out
+        self.slots = asyncio.Semaphore(concurrency)
+        self.http_timeout = http_timeout
+        self.trace = trace
+        self.log = log
+        self.workflow_name = graph.workflow.get('name')
+        self.resumes = dict(resume_edges(graph))
+        self.referenced = referenced_nodes(graph)
+        self.tasks = set()
+        self.wake = asyncio.Event()  # a Wait was parked or a task ended
+        self.stats = Counter()
+        self.http_hosts = Counter()
+
+    # Scheduling
+
+    def spawn(self, coroutine):
+        task = asyncio.create_task(coroutine)
+        self.tasks.add(task)
+        task.add_done_callback(self._task_done)
+        return task
+
+    def _task_done(self, task):
+        self.tasks.discard(task)
+        self.wake.set()
+
+    def remember(self, execution, name, items):
+        if name in self.referenced:
+            execution.run_data[name] = items
+
+    def start(self, payload, entry=None, headers=None):
+        """Start one execution at the entry node with a webhook payload."""
+        entry = entry or next((n['name'] for n in self.graph.nodes if n['type'].endswith('.webhook')), None) \
+            or next((n['name'] for n in self.graph.nodes if is_entry(n)), None)
+        if entry is None:
+            raise ValueError('workflow has no webhook or trigger node')
+        execution = Execution(uuid.uuid4().hex[:16])
+        self.store.start_execution(execution.id, self.workflow_name, self.clock.time())
+        item = {'json': {'headers': headers or {'content-type': 'application/json'}, 'params': {}, 'query': {},
+                         'body': payload}}
+        execution.queue.append((entry, [item]))
+        self.stats['started'] += 1
+        return self.spawn(self.run(execution))
+
+    async def scheduler(self, exit_when_parked=False, poll=1.0, batch=500):
+        """Resume due Waits until nothing runs and nothing is parked (or only parked, with exit_when_parked)."""
+        saved = time.time()
+        while True:
+            if time.time() - saved > 10:
+                self.store.set_meta('clock', self.clock.time())
+                saved = time.time()
+            due = self.store.claim_due(self.clock.time(), batch)
+            for wait_id, execution_id, node, items in due:
+                self.spawn(self.resume(wait_id, execution_id, node, items))
+            if len(due) == batch:
+                await asyncio.sleep(0)
+                continue
+            next_due = self.store.next_due()
+            if not self.tasks and (next_due is None or exit_when_parked):
+                return
+            self.wake.clear()
+            timeout = poll if next_due is None else min(poll, max(0.0, (next_due - self.clock.time()) / self.clock.speed))
+            try:
+                await asyncio.wait_for(self.wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def resume(self, wait_id, execution_id, node, items):
+        execution = Execution(execution_id, self.store.run_data(execution_id))
+        self.remember(execution, node, items)
+        for target in self.graph.successors(node, 0):
+            execution.queue.append((target, items))
+        self.stats['resumed'] += 1
+        await self.run(execution, wait_id)
+
+    # Running
+
+    async def run(self, execution, wait_id=None):
+        """Run an execution's queue until it finishes, fails or is fully parked."""
+        async with self.slots:
+            try:
+                while execution.queue:
+                    name, items = execution.queue.popleft()
+                    execution.last_node = name
+                    outputs = await self.run_node(execution, self.graph.node(name), items)
+                    if self.trace:
+                        self.log(f"  {execution.id} {name}: {len(items)} in → "
+                                 + ('parked / handed off' if outputs is None else
+                                    ' | '.join(str(len(output)) for output in outputs) + ' out'))
+                    if outputs is None:  # parked, or jumped elsewhere
+                        continue
+                    self.route(execution, name, outputs)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if not isinstance(e, (NodeError, ExpressionError)):
+                    e = f"internal error: {type(e).__name__}: {e}"
+                if wait_id is not None:
+                    self.store.release(wait_id)
+                self.stats['error'] += 1
+                self.store.finish(execution.id, 'error', self.clock.time(), execution.last_node, str(e),
+                                  execution.response, execution.run_data)
+                if self.stats['error'] <= 20:
+                    self.log(f"  ❌ {execution.id} at {execution.last_node}: {e}")
+                return
+            if wait_id is not None:
+                self.store.release(wait_id)  # only now: a crash before this resumes the Wait again
+            status = 'waiting' if self.store.has_waits(execution.id) else 'success'
+            self.stats[status] += 1
+            self.store.finish(execution.id, status, self.clock.time(), execution.last_node,
+                              response=execution.response,
+                              run_data=execution.run_data if status == 'waiting' else None)
+
+    def route(self, execution, name, outputs):
+        """Queue the node's successors; with fan-out every further item becomes its own execution."""
+        pairs = [(branch, item) for branch, items in enumerate(outputs) for item in items]
+        if self.fan_out and len(pairs) > 1:
+            run_data = json.dumps(execution.run_data)
+            for index, (branch, item) in enumerate(pairs[1:], 1):
+                child = Execution(f"{execution.id}.{index}", json.loads(run_data))
+                self.remember(child, name, [item])
+                child.response = execution.response
+                for target in self.graph.successors(name, branch):
+                    child.queue.append((target, [item]))
+                self.store.start_execution(child.id, self.workflow_name, self.clock.time())
+                self.stats['started'] += 1
+                self.spawn(self.run(child))
+            branch, item = pairs[0]
+            outputs = [[item] if index == branch else [] for index in range(len(outputs))]
+        self.remember(execution, name, [item for items in outputs for item in items])
+        for branch, items in enumerate(outputs):
+            if items:
+                for target in self.graph.successors(name, branch):
+                    execution.queue.append((target, items))
+
+    async def run_node(self, execution, node, items):
+        """Output items per branch, or None when the node parked / handed off the items."""
+        if node.get('disabled'):
+            return [items]
+        node_type = node['type'].rsplit('.', 1)[-1]
+        handler = self.NODE_TYPES.get(node_type)
+        if handler is None:
+            raise NodeError(f"{node['name']}: unsupported node type {node['type']}")
+        self.stats['nodes'] += 1
+        try:
+            outputs = await handler(self, execution, node, items)
+        except (NodeError, ExpressionError) as e:
+            on_error = node.get('onError') or ('continueRegularOutput' if node.get('continueOnFail') else None)
+            if on_error not in ('continueRegularOutput', 'continueErrorOutput'):
+                raise NodeError(f"{node['name']}: {e}") from None
+            error_items = [{'json': {'error': str(e)}} for _ in items or [None]]
+            if on_error == 'continueErrorOutput':
+                return [[]] * (output_count(node) or 1) + [error_items]
+            return [error_items]
+        if outputs is not None and node.get('alwaysOutputData') and not any(outputs):
+            outputs = [[{'json': {}}]] + outputs[1:]
+        return outputs
+
+    def context(self, execution, items, index):
+        """Variables for expressions / Code-lite evaluated against items[index]."""
+        item = items[index] if index < len(items) else {'json': {}}
+
+        def node_items(name):
+            if name not in execution.run_data:
+                raise ExpressionError(f"Referenced node '{name}' hasn't been executed")
+            output = execution.run_data[name]
+            return {
+                'first': lambda: output[0] if output else UNDEFINED,
+                'last': lambda: output[-1] if output else UNDEFINED,
+                'all': lambda: output,
+                'item': output[min(index, len(output) - 1)] if output else UNDEFINED,
+                'isExecuted': True,
+            }
+
+        return {
+            '$json': item['json'],
+            '$input': {'first': lambda: items[0] if items else UNDEFINED,
+                       'last': lambda: items[-1] if items else UNDEFINED,
+                       'all': lambda: items, 'item': item},
+            '$': node_items,
+            '$node': _NodeLookup(self, execution),
+            '$now': DateTime(self.clock.now()),
+            '$today': DateTime(self.clock.now().replace(hour=0, minute=0, second=0, microsecond=0)),
+            '$env': self.env,
+            '$execution': {'id': execution.id, 'mode': 'production'},
+            '$workflow': {'id': self.graph.workflow.get('id'), 'name': self.workflow_name, 'active': True},
+            '$runIndex': 0,
+            '$itemIndex': index,
+            '$clock': self.clock.now,
+            'items': items,
+        }
+
+    def param(self, node, key, context, default=None):
+        value = node.get('parameters', {}).get(key, default)
+        return resolve(value, context)
+
+    # Node types
+
+    async def passthrough_node(self, execution, node, items):
+        return [items]
+
+    async def http_request_node(self, execution, node, items):
+        target = self.resumes.get(node['name'])
+        if target is not None:
+            # Calls this workflow's own Wait / Webhook: continue there in-process
+            self.remember(execution, node['name'], items)
+            target_node = self.graph.node(target)
+            if target_node.get('parameters', {}).get('resume') in ('webhook', 'form'):
+                self.route(execution, target, [items])
+            else:
+                execution.queue.append((target, items))
+            self.stats['internal_resumes'] += 1
+            return None
+        outputs = []
+        for index in range(len(items)):
+            outputs.extend(await self.http_call(node, self.context(execution, items, index)))
+        return [outputs]
+
+    async def http_call(self, node, context):
+        params = node.get('parameters', {})
+        method = to_string(resolve(params.get('method', params.get('requestMethod', 'GET')), context)).upper()
+        url = to_string(resolve(params.get('url', ''), context))
+        headers = {}
+        if params.get('sendHeaders') or 'headerParameters' in params:
+            for header in params.get('headerParameters', {}).get('parameters', []):
+                headers[to_string(resolve(header.get('name', ''), context))] = to_string(resolve(header.get('value', ''), context))
+        query = {}
+        if params.get('sendQuery') or 'queryParameters' in params:
+            for entry in params.get('queryParameters', {}).get('parameters', []):
+                query[to_string(resolve(entry.get('name', ''), context))] = to_string(resolve(entry.get('value', ''), context))
+        if query:
+            url += ('&' if '?' in url else '?') + urlencode(query)
+
+        body = b''
+        if params.get('sendBody') or 'jsonBody' in params or 'bodyParameters' in params:
+            content_type = params.get('contentType', 'json')
+            if params.get('specifyBody') == 'json' or 'jsonBody' in params:
+                value = resolve(params.get('jsonBody', '{}'), context)
+                if isinstance(value, str):
+                    try:
+                        value = json.loads(value)
+                    except ValueError:
+                        raise NodeError('JSON parameter needs to be valid JSON')
+            else:
+                value = {to_string(resolve(entry.get('name', ''), context)): resolve(entry.get('value', ''), context)
+                         for entry in params.get('bodyParameters', {}).get('parameters', [])}
+            if content_type == 'form-urlencoded':
+                body = urlencode({key: to_string(item) for key, item in value.items()}).encode('utf-8')
+                headers.setdefault('Content-Type', 'application/x-www-form-urlencoded')
+            else:
+                body = json.dumps(to_json(value)).encode('utf-8')
+                if not any(key.lower() == 'content-type' for key in headers):
+                    headers['Content-Type'] = 'application/json'
+
+        if urlsplit(url).scheme not in ('http', 'https'):
+            raise NodeError(f"invalid URL {url!r}")
+        if self.http_base:
+            parts = urlsplit(url)
+            headers['X-Forwarded-Host'] = parts.netloc
+            url = self.http_base + (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+        self.http_hosts[urlsplit(url).netloc if not self.http_base else headers['X-Forwarded-Host']] += 1
+
+        options = params.get('options', {})
+        timeout = to_number(options.get('timeout', self.http_timeout * 1000)) / 1000
+        tries = int(node.get('maxTries', 3)) if node.get('retryOnFail') else 1
+        never_error = options.get('response', {}).get('response', {}).get('neverError', False)
+        for attempt in range(1, tries + 1):
+            self.stats['http_calls'] += 1
+            try:
+                status, response_headers, data = await http_request(method, url, headers, body, timeout)
+                if status < 400 or never_error:
+                    break
+                raise NodeError(f"{method} {url} returned {status}: {data[:200].decode('utf-8', 'replace')}")
+            except NodeError:
+                if attempt == tries:
+                    raise
+                await self.clock.sleep(to_number(node.get('waitBetween', 1000)) / 1000)
+
+        text = data.decode('utf-8', 'replace')
+        try:
+            parsed = json.loads(text) if text.strip() else {}
+        except ValueError:
+            parsed = {'data': text}
+        if isinstance(parsed, list):
+            return [{'json': entry if isinstance(entry, dict) else {'data': entry}} for entry in parsed]
+        return [{'json': parsed if isinstance(parsed, dict) else {'data': parsed}}]
+
+    async def if_node(self, execution, node, items):
+        true_items, false_items = [], []
+        params = node.get('parameters', {})
+        conditions = params.get('conditions', {})
+        for index, item in enumerate(items):
+            context = self.context(execution, items, index)
+            if 'conditions' in conditions:  # v2
+                case_sensitive = conditions.get('options', {}).get('caseSensitive', True)
+                results = []
+                for condition in conditions['conditions']:
+                    operator = condition.get('operator', {})
+                    results.append(compare(operator.get('type', 'string'), operator.get('operation', 'equals'),
+                                           resolve(condition.get('leftValue'), context),
+                                           resolve(condition.get('rightValue'), context), case_sensitive))
+                combine = all if conditions.get('combinator', 'and') == 'and' else any
+            else:  # v1: {boolean: [...], number: [...], string: [...]}
+                results = [compare(kind, condition.get('operation', 'equal'),
+                                   resolve(condition.get('value1'), context), resolve(condition.get('value2'), context))
+                           for kind in ('boolean', 'number', 'string', 'dateTime')
+                           for condition in conditions.get(kind, [])]
+                combine = all if params.get('combineOperation', 'all') == 'all' else any
+            (true_items if combine(results) else false_items).append(item)
+        return [true_items, false_items]
+
+    async def set_node(self, execution, node, items):
+        params = node.get('parameters', {})
+        version = node.get('typeVersion', 1)
+        output = []
+        for index, item in enumerate(items):
+            context = self.context(execution, items, index)
+            if version >= 3.3:
+                fields = [(a.get('name', ''), a.get('value'), a.get('type', 'string'))
+                          for a in params.get('assignments', {}).get('assignments', [])]
+                keep_others = params.get('includeOtherFields', False)
+            elif version >= 3:
+                fields = [(f.get('name', ''), f.get(f.get('type', 'stringValue')), f.get('type', 'stringValue'))
+                          for f in params.get('fields', {}).get('values', [])]
+                keep_others = params.get('include', 'all') == 'all' and params.get('includeOtherFields', True)
+            else:
+                fields = [(f.get('name', ''), f.get('value'), kind)
+                          for kind in ('string', 'number', 'boolean') for f in params.get('values', {}).get(kind, [])]
+                keep_others = not params.get('keepOnlySet', False)
+            data = json.loads(json.dumps(item['json'])) if keep_others else {}
+            dot_notation = params.get('options', {}).get('dotNotation', True)
+            for name, value, kind in fields:
+                value = _convert(to_json(resolve(value, context)), kind)
+                if dot_notation:
+                    _set_path(data, to_string(resolve(name, context)), value)
+                else:
+                    data[to_string(resolve(name, context))] = value
+            output.append({'json': data})
+        return [output]
+
+    async def code_node(self, execution, node, items):
+        params = node.get('parameters', {})
+        if params.get('language', 'javaScript') != 'javaScript':
+            raise NodeError(f"{params['language']} Code nodes are not supported")
+        code = params.get('jsCode') or params.get('functionCode') or ''
+        if node['type'].endswith('.functionItem') or params.get('mode') == 'runOnceForEachItem':
+            output = []
+            for index, item in enumerate(items):
+                context = self.context(execution, items, index)
+                context['item'] = item['json']
+                result = run_code(code, context)
+                output.extend(_items(result))
+            return [output]
+        return [_items(run_code(code, self.context(execution, items, 0)))]
+
+    async def wait_node(self, execution, node, items):
+        params = node.get('parameters', {})
+        context = self.context(execution, items, 0)
+        resume = params.get('resume', 'timeInterval')
+        if resume == 'specificTime':
+            moment = parse_datetime(resolve(params.get('dateTime'), context))
+            if moment is None:
+                raise NodeError('Wait: dateTime is not a valid date')
+            due = moment.timestamp()
+        elif resume in ('webhook', 'form'):
+            limit = params.get('options', {})
+            due = None
+            if limit.get('limitWaitTime'):
+                amount = to_number(resolve(limit.get('resumeAmount', 1), context))
+                due = self.clock.time() + amount * UNIT_SECONDS.get(limit.get('resumeUnit', 'hours'), 3600)
+        else:
+            amount = to_number(resolve(params.get('amount', 1), context))
+            if not isinstance(amount, (int, float)) or amount != amount or amount < 0:
+                raise NodeError(f"Wait amount {to_string(resolve(params.get('amount', 1), context))!r} is not a number")
+            due = self.clock.time() + amount * UNIT_SECONDS.get(params.get('unit', 'hours'), 3600)
+        self.remember(execution, node['name'], items)
+        self.store.park(execution.id, node['name'], due, items, execution.run_data)
+        self.stats['parked'] += 1
+        self.wake.set()
+        return None
+
+    async def respond_node(self, execution, node, items):
+        params = node.get('parameters', {})
+        context = self.context(execution, items, 0)
+        respond_with = params.get('respondWith', 'firstIncomingItem')
+        if respond_with == 'json':
+            body = resolve(params.get('responseBody', '{}'), context)
+            execution.response = json.loads(body) if isinstance(body, str) and body.strip() else to_json(body)
+        elif respond_with == 'text':
+            execution.response = to_string(resolve(params.get('responseBody', ''), context))
+        elif respond_with == 'allIncomingItems':
+            execution.response = [item['json'] for item in items]
+        elif respond_with != 'noData':
+            execution.response = items[0]['json'] if items else {}
+        return [items]
+
+    NODE_TYPES = {
+        'webhook': passthrough_node, 'manualTrigger': passthrough_node, 'scheduleTrigger': passthrough_node,
+        'noOp': passthrough_node, 'start': passthrough_node,
+        'httpRequest': http_request_node,
+        'if': if_node,
+        'set': set_node,
+        'code': code_node, 'function': code_node, 'functionItem': code_node,
+        'wait': wait_node,
+        'respondToWebhook': respond_node,
+    }
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def _load_payloads(paths):
+    payloads = []
+    for path in paths or []:
+        with open(path, 'r') as f:
+            data = json.load(f)
+        payloads.extend(data if isinstance(data, list) else [data])
+    return payloads
+
+
+def print_summary(summary, executor=None, stand_in=None, clock=None):
+    executions = summary['executions']
+    print(f"\n📊 Executions: {sum(executions.values())} "
+          f"({', '.join(f'{count} {status}' for status, count in sorted(executions.items())) or 'none'})")
+    if summary['parked']:
+        print(f"   ⏸️  Parked in Waits: {sum(summary['parked'].values())}")
+        for node, count in summary['parked'].items():
+            print(f"      {node:<44} {count:>7}")
+        if summary['next_due'] is not None:
+            print(f"   Next resume due: {datetime.fromtimestamp(summary['next_due'], timezone.utc).isoformat()}")
+    if executor is not None:
+        stats = executor.stats
+        print(f"   This run: {stats['started']} started, {stats['resumed']} resumed, {stats['nodes']} node runs, "
+              f"{stats['http_calls']} HTTP calls, {stats['internal_resumes']} in-process resumes")
+        for host, count in executor.http_hosts.most_common():
+            print(f"      {host:<44} {count:>7} calls")
+    if stand_in is not None and stand_in.hits:
+        print("   Stand-in routes hit:")
+        for route, count in stand_in.hits.most_common():
+            print(f"      {route:<44} {count:>7}")
+    for error in summary['errors']:
+        print(f"   ❌ {error['count']}× {error['error']}")
+
+
+async def _run(args):
+    graph = WorkflowGraph.load(args.workflow)
+    store = Store(args.db)
+    clock = Clock(args.speed, store.get_meta('clock'))
+    env = dict(os.environ)
+    for assignment in args.env or []:
+        key, _, value = assignment.partition('=')
+        env[key] = value
+    released = store.release_claims()
+    if released:
+        print(f"🔁 {released} resumes from the last run will run again")
+
+    stand_in = None
+    http_base = args.http_base
+    if args.stand_in:
+        with open(args.stand_in, 'r') as f:
+            stand_in = StandIn(json.load(f))
+        http_base = f"http://127.0.0.1:{await stand_in.start()}"
+        print(f"🧪 Stand-in serving {args.stand_in} on {http_base}")
+
+    executor = Executor(graph, store, clock, env, http_base, not args.no_fan_out, args.concurrency, args.http_timeout,
+                        args.trace)
+    payloads = _load_payloads(args.payload)
+    print(f"🚀 {graph.workflow.get('name')}: {len(payloads)} new executions"
+          + (f", clock ×{args.speed:g}" if args.speed != 1 else ''))
+    started = time.time()
+    for payload in payloads:
+        executor.start(payload, args.entry)
+    try:
+        await executor.scheduler(exit_when_parked=args.exit_when_parked)
+    finally:
+        store.set_meta('clock', clock.time())
+        print(f"\n⏱️  {time.time() - started:.1f}s real, {(clock.time() - clock.virtual_start) / 3600:.1f}h workflow time")
+        print_summary(store.summary(), executor, stand_in)
+        if stand_in:
+            await stand_in.stop()
+        store.close()
+
+
+async def _serve(args):
+    with open(args.routes, 'r') as f:
+        stand_in = StandIn(json.load(f))
+    port = await stand_in.start(args.host, args.port)
+    print(f"🧪 Stand-in serving {args.routes} on http://{args.host}:{port} (Ctrl+C to stop)")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        for route, count in stand_in.hits.most_common():
+            print(f"   {route:<50} {count:>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run N8N workflow exports on asyncio with persisted Waits')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='start executions and/or resume parked ones')
+    run.add_argument('workflow', help='workflow JSON export')
+    run.add_argument('--payload', action='append', metavar='FILE',
+                     help='webhook body JSON (a list starts one execution per element; repeatable)')
+    run.add_argument('--entry', help='node to start at (default: the first webhook node)')
+    run.add_argument('--db', default=DEFAULT_DB, help='SQLite state file (default: .workflow-executor.db)')
+    run.add_argument('--env', action='append', metavar='KEY=VALUE', help='set $env values (repeatable)')
+    target = run.add_mutually_exclusive_group()
+    target.add_argument('--http-base', metavar='URL', help='send all HTTP requests to this base URL')
+    target.add_argument('--stand-in', metavar='ROUTES', help='start a stand-in server from a routes file and use it')
+    run.add_argument('--speed', type=float, default=1.0, help='run the clock this many times faster (e.g. 86400)')
+    run.add_argument('--concurrency', type=int, default=200, help='executions running at once (parked ones are free)')
+    run.add_argument('--http-timeout', type=float, default=30.0, help='seconds per HTTP request (default: 30)')
+    run.add_argument('--no-fan-out', action='store_true', help='keep multiple items in one execution')
+    run.add_argument('--trace', action='store_true', help='print every node run (for small payloads)')
+    run.add_argument('--exit-when-parked', action='store_true',
+                     help='stop once nothing is running; parked executions stay in the store')
+
+    serve = commands.add_parser('serve', help='run a stand-in HTTP server from a routes file')
+    serve.add_argument('routes')
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8765)
+
+    status = commands.add_parser('status', help='summarize the store')
+    status.add_argument('--db', default=DEFAULT_DB)
+    status.add_argument('--json', action='store_true')
+
+    args = parser.parse_args()
+    if args.command == 'status':
+        if not os.path.exists(args.db):
+            print(f"❌ No store at {args.db}")
+            sys.exit(1)
+        store = Store(args.db)
+        summary = store.summary()
+        store.close()
+        if args.json:
+            print(json.dumps(summary, indent=2))
+        else:
+            print_summary(summary)
+        return
+    try:
+        asyncio.run(_run(args) if args.command == 'run' else _serve(args))
+    except KeyboardInterrupt:
+        print("\n⏹️  Stopped - parked executions stay in the store; run again to resume them")
+
+
+if __name__ == '__main__':
+    main()
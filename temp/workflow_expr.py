@@ -0,0 +1,1157 @@
+#!/usr/bin/env python3
+"""
+Evaluator for the JavaScript subset N8N workflows use in `={{ ... }}`
+expressions and small Code / Function nodes ("Code-lite").
+
+Supported: literals (including template strings), object / array literals
+with spread, member access with optional chaining, calls, arrow functions
+(expression or block bodies), `new Date(...)`, typeof, the arithmetic,
+comparison, logical, ?? and ternary operators, and the statements const /
+let / var, return, if / else and expression statements. Globals are the
+usual Math, JSON, Object, Array, Number, String, Boolean, parseInt,
+parseFloat, Date and encodeURIComponent; the $-variables ($json, $input,
+$('Node'), $node, $now, $env, ...) are supplied by the caller as a context
+dict. Anything else (assignment, loops, regex literals, classes) raises
+ExpressionError naming the construct, so unsupported code fails loudly
+instead of running wrong.
+
+    evaluate("$json.a.b || 'x'", context)
+    resolve('=Hello {{ $json.name }}', context)   # an n8n parameter value
+    run_code(node['parameters']['jsCode'], context)
+"""
+
+import json
+import math
+import re
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from urllib.parse import quote
+
+
+class ExpressionError(ValueError):
+    """Syntax the evaluator does not support, or a JavaScript runtime error."""
+
+
+class _Undefined:
+    def __repr__(self):
+        return 'undefined'
+
+    def __bool__(self):
+        return False
+
+
+UNDEFINED = _Undefined()
+
+# ---------------------------------------------------------------------------
+# Tokenizer
+# ---------------------------------------------------------------------------
+
+TOKEN = re.compile(r'''
+    (?P<ws>\s+|//[^\n]*|/\*.*?\*/)
+  | (?P<num>(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?)
+  | (?P<name>[A-Za-z_$][\w$]*)
+  | (?P<str>'(?:\\.|[^'\\\n])*'|"(?:\\.|[^"\\\n])*")
+  | (?P<tpl>`)
+  | (?P<op>\.\.\.|===|!==|\?\?|\?\.(?!\d)|=>|==|!=|<=|>=|&&|\|\||[-+*/%<>!=?:.,;()\[\]{}])
+''', re.VERBOSE | re.DOTALL)
+
+ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', 'v': '\v', '0': '\0'}
+KEYWORDS = {'true': True, 'false': False, 'null': None, 'undefined': UNDEFINED}
+
+
+def _unescape(text):
+    def replace(match):
+        char = match.group(1)
+        if char[0] == 'u':
+            return chr(int(char[1:], 16))
+        return ESCAPES.get(char, char)
+    return re.sub(r'\\(u[0-9a-fA-F]{4}|.)', replace, text, flags=re.DOTALL)
+
+
+def _matching_brace(source, pos):
+    """Index just past the '}' closing the '{' at source[pos - 1], skipping strings."""
+    depth = 1
+    while pos < len(source):
+        char = source[pos]
+        if char in '\'"`':
+            end = pos + 1
+            while end < len(source) and source[end] != char:
+                end += 2 if source[end] == '\\' else 1
+            pos = end + 1
+            continue
+        if char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return pos + 1
+        pos += 1
+    raise ExpressionError('unterminated ${ in template string')
+
+
+def tokenize(source):
+    """[(kind, value), ...] ending with ('end', None)."""
+    tokens = []
+    pos = 0
+    while pos < len(source):
+        match = TOKEN.match(source, pos)
+        if not match:
+            raise ExpressionError(f"unexpected character {source[pos]!r} at {pos}"
+                                  + (' (regex literals are not supported)' if source[pos] == '/' else ''))
+        kind = match.lastgroup
+        pos = match.end()
+        if kind == 'ws':
+            continue
+        if kind == 'num':
+            text = match.group()
+            tokens.append(('num', float(text) if any(c in text for c in '.eE') else int(text)))
+        elif kind == 'str':
+            tokens.append(('str', _unescape(match.group()[1:-1])))
+        elif kind == 'tpl':
+            strings, expressions = [], []
+            start = pos
+            while True:
+                if pos >= len(source):
+                    raise ExpressionError('unterminated template string')
+                if source[pos] == '\\':
+                    pos += 2
+                elif source[pos] == '`':
+                    strings.append(_unescape(source[start:pos]))
+                    pos += 1
+                    break
+                elif source.startswith('${', pos):
+                    strings.append(_unescape(source[start:pos]))
+                    end = _matching_brace(source, pos + 2)
+                    expressions.append(parse_expression(source[pos + 2:end - 1]))
+                    pos = start = end
+                else:
+                    pos += 1
+            tokens.append(('tpl', (strings, expressions)))
+        else:
+            tokens.append((kind, match.group()))
+    tokens.append(('end', None))
+    return tokens
+
+
+# ---------------------------------------------------------------------------
+# Parser (tuples as AST nodes)
+# ---------------------------------------------------------------------------
+
+BINARY = {
+    '??': 1, '||': 2, '&&': 3,
+    '==': 6, '!=': 6, '===': 6, '!==': 6,
+    '<': 7, '>': 7, '<=': 7, '>=': 7, 'in': 7,
+    '+': 9, '-': 9,
+    '*': 10, '/': 10, '%': 10,
+}
+UNSUPPORTED = {'for', 'while', 'do', 'switch', 'function', 'class', 'try', 'throw', 'await', 'async',
+               'yield', 'delete', 'instanceof', 'break', 'continue', 'import', 'export'}
+
+
+class Parser:
+    def __init__(self, source):
+        self.tokens = tokenize(source)
+        self.pos = 0
+
+    def peek(self, offset=0):
+        return self.tokens[min(self.pos + offset, len(self.tokens) - 1)]
+
+    def next(self):
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def at(self, value, offset=0):
+        token = self.peek(offset)
+        return token[0] in ('op', 'name') and token[1] == value
+
+    def expect(self, value):
+        token = self.next()
+        if token[0] not in ('op', 'name') or token[1] != value:
+            raise ExpressionError(f"expected {value!r}, got {token[1]!r}")
+        return token
+
+    def accept(self, value):
+        if self.at(value):
+            self.pos += 1
+            return True
+        return False
+
+    # Statements
+
+    def program(self):
+        statements = []
+        while self.peek()[0] != 'end':
+            statements.append(self.statement())
+        return ('block', statements)
+
+    def statement(self):
+        token = self.peek()
+        if token[0] == 'op' and token[1] == '{':
+            self.next()
+            statements = []
+            while not self.accept('}'):
+                statements.append(self.statement())
+            return ('block', statements)
+        if token[0] == 'op' and token[1] == ';':
+            self.next()
+            return ('block', [])
+        if token[0] == 'name':
+            if token[1] in ('const', 'let', 'var'):
+                self.next()
+                declarations = []
+                while True:
+                    name = self.next()
+                    if name[0] != 'name':
+                        raise ExpressionError('destructuring declarations are not supported')
+                    value = ('lit', UNDEFINED)
+                    if self.accept('='):
+                        value = self.expression()
+                    declarations.append(('decl', name[1], value))
+                    if not self.accept(','):
+                        break
+                self.accept(';')
+                return declarations[0] if len(declarations) == 1 else ('block', declarations)
+            if token[1] == 'return':
+                self.next()
+                value = ('lit', UNDEFINED)
+                if not (self.at(';') or self.at('}') or self.peek()[0] == 'end'):
+                    value = self.expression()
+                self.accept(';')
+                return ('return', value)
+            if token[1] == 'if':
+                self.next()
+                self.expect('(')
+                condition = self.expression()
+                self.expect(')')
+                then = self.statement()
+                otherwise = self.statement() if self.accept('else') else ('block', [])
+                return ('if', condition, then, otherwise)
+            if token[1] in UNSUPPORTED:
+                raise ExpressionError(f"'{token[1]}' is not supported in Code-lite")
+        value = self.expression()
+        if self.at('='):
+            raise ExpressionError('assignment is not supported in Code-lite (declare a new const instead)')
+        self.accept(';')
+        return ('expr', value)
+
+    # Expressions
+
+    def expression(self):
+        if self._arrow_ahead():
+            return self.arrow()
+        condition = self.binary(0)
+        if self.accept('?'):
+            then = self.expression()
+            self.expect(':')
+            otherwise = self.expression()
+            return ('cond', condition, then, otherwise)
+        return condition
+
+    def _arrow_ahead(self):
+        token = self.peek()
+        if token[0] == 'name' and self.at('=>', 1):
+            return True
+        if not self.at('('):
+            return False
+        offset = 1
+        while True:
+            kind, value = self.peek(offset)
+            if kind == 'op' and value == ')':
+                return self.at('=>', offset + 1)
+            if kind != 'name':
+                return False
+            offset += 1
+            if self.at(',', offset):
+                offset += 1
+
+    def arrow(self):
+        if self.peek()[0] == 'name':
+            params = [self.next()[1]]
+        else:
+            self.expect('(')
+            params = []
+            while not self.accept(')'):
+                params.append(self.next()[1])
+                self.accept(',')
+        self.expect('=>')
+        if self.at('{'):
+            return ('arrow', params, self.statement())
+        return ('arrow', params, ('return', self.expression()))
+
+    def binary(self, min_precedence):
+        left = self.unary()
+        while True:
+            kind, op = self.peek()
+            precedence = BINARY.get(op) if kind in ('op', 'name') else None
+            if precedence is None or precedence <= min_precedence:
+                return left
+            self.next()
+            left = ('bin', op, left, self.binary(precedence))
+
+    def unary(self):
+        kind, value = self.peek()
+        if (kind == 'op' and value in ('!', '-', '+')) or (kind == 'name' and value == 'typeof'):
+            self.next()
+            return ('unary', value, self.unary())
+        return self.postfix()
+
+    def postfix(self):
+        node = self.primary()
+        optional = False
+        while True:
+            if self.accept('.'):
+                node = ('get', node, ('lit', self._property_name()), False)
+            elif self.accept('?.'):
+                optional = True
+                if self.accept('('):
+                    node = ('call', node, self.arguments(), True)
+                elif self.accept('['):
+                    node = ('get', node, self.expression(), True)
+                    self.expect(']')
+                else:
+                    node = ('get', node, ('lit', self._property_name()), True)
+            elif self.accept('['):
+                node = ('get', node, self.expression(), False)
+                self.expect(']')
+            elif self.accept('('):
+                node = ('call', node, self.arguments(), False)
+            else:
+                return ('chain', node) if optional else node
+
+    def _property_name(self):
+        kind, value = self.next()
+        if kind != 'name':
+            raise ExpressionError(f"expected a property name, got {value!r}")
+        return value
+
+    def arguments(self):
+        args = []
+        while not self.accept(')'):
+            args.append(('spread', self.expression()) if self.accept('...') else self.expression())
+            if not self.at(')'):
+                self.expect(',')
+        return args
+
+    def primary(self):
+        kind, value = self.next()
+        if kind in ('num', 'str'):
+            return ('lit', value)
+        if kind == 'tpl':
+            return ('tpl', value[0], value[1])
+        if kind == 'name':
+            if value in KEYWORDS:
+                return ('lit', KEYWORDS[value])
+            if value == 'new':
+                callee = self.next()
+                args = self.arguments() if self.accept('(') else []
+                return ('new', callee[1], args)
+            if value in UNSUPPORTED:
+                raise ExpressionError(f"'{value}' is not supported in Code-lite")
+            return ('name', value)
+        if value == '(':
+            node = self.expression()
+            self.expect(')')
+            return node
+        if value == '[':
+            elements = []
+            while not self.accept(']'):
+                elements.append(('spread', self.expression()) if self.accept('...') else self.expression())
+                if not self.at(']'):
+                    self.expect(',')
+            return ('arr', elements)
+        if value == '{':
+            entries = []
+            while not self.accept('}'):
+                if self.accept('...'):
+                    entries.append(('spread', self.expression()))
+                else:
+                    key_kind, key = self.next()
+                    if key_kind == 'op' and key == '[':
+                        key_node = self.expression()
+                        self.expect(']')
+                    elif key_kind in ('name', 'str', 'num'):
+                        key_node = ('lit', key if key_kind != 'num' else to_string(key))
+                    else:
+                        raise ExpressionError(f"unexpected {key!r} in object literal")
+                    if self.accept(':'):
+                        entries.append((key_node, self.expression()))
+                    elif key_kind == 'name':
+                        entries.append((key_node, ('name', key)))  # shorthand { key }
+                    else:
+                        raise ExpressionError(f"expected ':' after {key!r}")
+                if not self.at('}'):
+                    self.expect(',')
+            return ('obj', entries)
+        if kind == 'end':
+            raise ExpressionError('unexpected end of expression')
+        if value == '/':
+            raise ExpressionError('regex literals are not supported')
+        raise ExpressionError(f"unexpected {value!r}")
+
+
+@lru_cache(maxsize=4096)
+def parse_expression(source):
+    parser = Parser(source)
+    node = parser.expression()
+    if parser.peek()[0] != 'end':
+        raise ExpressionError(f"unexpected {parser.peek()[1]!r} after expression")
+    return node
+
+
+@lru_cache(maxsize=1024)
+def parse_program(source):
+    return Parser(source).program()
+
+
+# ---------------------------------------------------------------------------
+# JavaScript value semantics
+# ---------------------------------------------------------------------------
+
+def is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _number(value):
+    """Integral floats back to int, so JSON output reads 3 rather than 3.0."""
+    if isinstance(value, float) and value.is_integer() and abs(value) < 2 ** 53:
+        return int(value)
+    return value
+
+
+def truthy(value):
+    if value is None or value is UNDEFINED or value is False or value == '':
+        return False
+    if is_number(value):
+        return value != 0 and not math.isnan(value)
+    return True
+
+
+def to_string(value):
+    if value is None:
+        return 'null'
+    if value is UNDEFINED:
+        return 'undefined'
+    if value is True or value is False:
+        return 'true' if value else 'false'
+    if is_number(value):
+        if isinstance(value, float):
+            if math.isnan(value):
+                return 'NaN'
+            if math.isinf(value):
+                return 'Infinity' if value > 0 else '-Infinity'
+            return repr(_number(value))
+        return str(value)
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list):
+        return ','.join('' if item is None or item is UNDEFINED else to_string(item) for item in value)
+    if isinstance(value, dict):
+        return '[object Object]'
+    if hasattr(value, 'js_string'):
+        return value.js_string()
+    return str(value)
+
+
+def to_number(value):
+    if is_number(value):
+        return value
+    if value is True or value is False:
+        return int(value)
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        text = value.strip()
+        if not text:
+            return 0
+        try:
+            return _number(float(text)) if not text.lower().startswith(('0x', 'inf', '+inf', '-inf', 'nan')) else float('nan')
+        except ValueError:
+            return float('nan')
+    if hasattr(value, 'js_number'):
+        return value.js_number()
+    if isinstance(value, list) and len(value) <= 1:
+        return to_number(value[0]) if value else 0
+    return float('nan')
+
+
+def strict_equals(a, b):
+    if is_number(a) and is_number(b):
+        return a == b
+    if type(a) is not type(b) and not (isinstance(a, str) and isinstance(b, str)):
+        return False
+    if isinstance(a, (dict, list)) or hasattr(a, 'js_number'):
+        return a is b
+    return a == b
+
+
+def loose_equals(a, b):
+    nullish = (None, UNDEFINED)
+    if a in nullish or b in nullish:
+        return a in nullish and b in nullish
+    if type(a) is type(b) or (is_number(a) and is_number(b)):
+        return strict_equals(a, b)
+    if isinstance(a, (dict, list)) and isinstance(b, (dict, list)):
+        return a is b
+    if isinstance(a, (dict, list)):
+        a = to_string(a)
+    if isinstance(b, (dict, list)):
+        b = to_string(b)
+    if isinstance(a, str) and isinstance(b, str):
+        return a == b
+    return to_number(a) == to_number(b)
+
+
+def type_of(value):
+    if value is UNDEFINED:
+        return 'undefined'
+    if value is True or value is False:
+        return 'boolean'
+    if is_number(value):
+        return 'number'
+    if isinstance(value, str):
+        return 'string'
+    if callable(value):
+        return 'function'
+    return 'object'
+
+
+def to_json(value):
+    """A JSON-able copy (Dates as ISO strings, undefined dropped from objects)."""
+    if isinstance(value, dict):
+        return {key: to_json(item) for key, item in value.items() if item is not UNDEFINED and not callable(item)}
+    if isinstance(value, list):
+        return [None if item is UNDEFINED or callable(item) else to_json(item) for item in value]
+    if hasattr(value, 'js_json'):
+        return value.js_json()
+    if isinstance(value, float) and (math.isnan(value) or math.isinf(value)):
+        return None
+    return value
+
+
+def json_stringify(value, replacer=None, indent=None):
+    if value is UNDEFINED:
+        return UNDEFINED
+    if is_number(indent):
+        indent = int(indent)
+    elif not isinstance(indent, str):
+        indent = None
+    separators = (',', ': ') if indent else (',', ':')
+    return json.dumps(to_json(value), ensure_ascii=False, indent=indent or None, separators=separators)
+
+
+def json_parse(text):
+    try:
+        return json.loads(to_string(text))
+    except ValueError as e:
+        raise ExpressionError(f"JSON.parse: {e}")
+
+
+def _binary(op, a, b):
+    if op == '+':
+        if isinstance(a, (dict, list)) or hasattr(a, 'js_string'):
+            a = to_string(a)
+        if isinstance(b, (dict, list)) or hasattr(b, 'js_string'):
+            b = to_string(b)
+        if isinstance(a, str) or isinstance(b, str):
+            return to_string(a) + to_string(b)
+        return _number(to_number(a) + to_number(b))
+    if op in ('-', '*', '/', '%'):
+        x, y = to_number(a), to_number(b)
+        if op == '-':
+            return _number(x - y)
+        if op == '*':
+            return _number(x * y)
+        if op == '/':
+            if y == 0:
+                return float('nan') if x == 0 or math.isnan(x) else math.copysign(math.inf, x) * math.copysign(1, y)
+            return _number(x / y)
+        if y == 0:
+            return float('nan')
+        return _number(math.fmod(x, y))
+    if op in ('<', '>', '<=', '>='):
+        if not (isinstance(a, str) and isinstance(b, str)):
+            a, b = to_number(a), to_number(b)
+            if (isinstance(a, float) and math.isnan(a)) or (isinstance(b, float) and math.isnan(b)):
+                return False
+        return {'<': a < b, '>': a > b, '<=': a <= b, '>=': a >= b}[op]
+    if op == '===':
+        return strict_equals(a, b)
+    if op == '!==':
+        return not strict_equals(a, b)
+    if op == '==':
+        return loose_equals(a, b)
+    if op == '!=':
+        return not loose_equals(a, b)
+    if op == 'in':
+        if isinstance(b, dict):
+            return to_string(a) in b
+        if isinstance(b, list):
+            return is_number(to_number(a)) and 0 <= to_number(a) < len(b)
+        raise ExpressionError("'in' needs an object on the right")
+    raise ExpressionError(f"operator {op!r} is not supported")
+
+
+# ---------------------------------------------------------------------------
+# Dates: JavaScript Date and the Luxon DateTime behind $now / $today
+# ---------------------------------------------------------------------------
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def parse_datetime(value):
+    """ISO string, epoch milliseconds, JSDate or DateTime -> aware datetime (None if invalid)."""
+    if isinstance(value, (JSDate, DateTime)):
+        return value.datetime
+    if is_number(value):
+        return EPOCH + timedelta(milliseconds=value)
+    if isinstance(value, str):
+        try:
+            parsed = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+        except ValueError:
+            return None
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+    return None
+
+
+def _iso(moment):
+    return moment.astimezone(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+
+class JSDate:
+    """Enough of Date for comparisons, arithmetic and ISO output."""
+
+    def __init__(self, moment):
+        self.datetime = moment
+
+    def js_number(self):
+        return float('nan') if self.datetime is None else _number((self.datetime - EPOCH) / timedelta(milliseconds=1))
+
+    def js_string(self):
+        return 'Invalid Date' if self.datetime is None else _iso(self.datetime)
+
+    def js_json(self):
+        return None if self.datetime is None else _iso(self.datetime)
+
+    def js_get(self, key):
+        utc = self.datetime.astimezone(timezone.utc) if self.datetime else None
+        getters = {
+            'getTime': self.js_number, 'valueOf': self.js_number,
+            'toISOString': self._iso, 'toJSON': self.js_json, 'toString': self.js_string,
+            'getFullYear': lambda: utc.year, 'getMonth': lambda: utc.month - 1, 'getDate': lambda: utc.day,
+            'getDay': lambda: (utc.weekday() + 1) % 7, 'getHours': lambda: utc.hour,
+            'getMinutes': lambda: utc.minute, 'getSeconds': lambda: utc.second,
+        }
+        getters.update({name.replace('get', 'getUTC', 1): fn for name, fn in list(getters.items())
+                        if name.startswith('get') and name != 'getTime'})
+        return getters.get(key, UNDEFINED)
+
+    def _iso(self):
+        if self.datetime is None:
+            raise ExpressionError('RangeError: Invalid time value')
+        return _iso(self.datetime)
+
+
+LUXON_FORMAT = [('yyyy', '%Y'), ('MM', '%m'), ('dd', '%d'), ('HH', '%H'), ('mm', '%M'), ('ss', '%S'),
+                ('SSS', '{ms}'), ('yy', '%y')]
+LUXON_UNITS = {'weeks': 'weeks', 'days': 'days', 'hours': 'hours', 'minutes': 'minutes',
+               'seconds': 'seconds', 'milliseconds': 'milliseconds'}
+
+
+class DateTime:
+    """The Luxon DateTime methods N8N workflows use on $now / $today."""
+
+    def __init__(self, moment):
+        self.datetime = moment
+
+    def js_number(self):
+        return _number((self.datetime - EPOCH) / timedelta(milliseconds=1))
+
+    def js_string(self):
+        return self.datetime.isoformat(timespec='milliseconds')
+
+    js_json = js_string
+
+    def _shift(self, sign, amounts):
+        if is_number(amounts):
+            return DateTime(self.datetime + sign * timedelta(milliseconds=amounts))
+        delta = timedelta()
+        for unit, amount in (amounts or {}).items():
+            unit = unit if unit.endswith('s') else unit + 's'
+            if unit not in LUXON_UNITS:
+                raise ExpressionError(f"DateTime.plus/minus: unit {unit!r} is not supported")
+            delta += timedelta(**{LUXON_UNITS[unit]: to_number(amount)})
+        return DateTime(self.datetime + sign * delta)
+
+    def _format(self, pattern):
+        result = []
+        for part in re.split(r"('[^']*')", pattern):
+            if part.startswith("'"):
+                result.append(part[1:-1])
+                continue
+            for token, directive in LUXON_FORMAT:
+                part = part.replace(token, directive)
+            result.append(self.datetime.strftime(part).replace('{ms}', f"{self.datetime.microsecond // 1000:03d}"))
+        return ''.join(result)
+
+    def js_get(self, key):
+        return {
+            'toISO': self.js_string, 'toString': self.js_string, 'toJSON': self.js_json,
+            'toMillis': self.js_number, 'valueOf': self.js_number, 'toSeconds': lambda: self.js_number() / 1000,
+            'toUTC': lambda: DateTime(self.datetime.astimezone(timezone.utc)),
+            'toJSDate': lambda: JSDate(self.datetime),
+            'toFormat': self._format,
+            'plus': lambda amounts: self._shift(1, amounts),
+            'minus': lambda amounts: self._shift(-1, amounts),
+            'startOf': lambda unit: DateTime(self.datetime.replace(hour=0, minute=0, second=0, microsecond=0))
+                        if unit == 'day' else self._unsupported(f"startOf({unit!r})"),
+            'year': self.datetime.year, 'month': self.datetime.month, 'day': self.datetime.day,
+            'hour': self.datetime.hour, 'minute': self.datetime.minute, 'weekday': self.datetime.isoweekday(),
+        }.get(key, UNDEFINED)
+
+    def _unsupported(self, what):
+        raise ExpressionError(f"DateTime.{what} is not supported")
+
+
+# ---------------------------------------------------------------------------
+# Built-in methods and globals
+# ---------------------------------------------------------------------------
+
+def _callback(fn):
+    if not callable(fn):
+        raise ExpressionError(f"{to_string(fn)} is not a function")
+    return fn
+
+
+def _index(value, length, default):
+    if value is UNDEFINED:
+        return default
+    value = int(to_number(value))
+    return max(length + value, 0) if value < 0 else min(value, length)
+
+
+def _array_method(array, key):
+    methods = {
+        'filter': lambda fn: [item for i, item in enumerate(array) if truthy(_callback(fn)(item, i, array))],
+        'map': lambda fn: [_callback(fn)(item, i, array) for i, item in enumerate(array)],
+        'forEach': lambda fn: _for_each(array, fn),
+        'some': lambda fn: any(truthy(_callback(fn)(item, i, array)) for i, item in enumerate(array)),
+        'every': lambda fn: all(truthy(_callback(fn)(item, i, array)) for i, item in enumerate(array)),
+        'find': lambda fn: next((item for i, item in enumerate(array) if truthy(_callback(fn)(item, i, array))), UNDEFINED),
+        'findIndex': lambda fn: next((i for i, item in enumerate(array) if truthy(_callback(fn)(item, i, array))), -1),
+        'reduce': lambda fn, *initial: _reduce(array, fn, initial),
+        'includes': lambda value: any(strict_equals(item, value) or (item != item and value != value) for item in array),
+        'indexOf': lambda value: next((i for i, item in enumerate(array) if strict_equals(item, value)), -1),
+        'join': lambda separator=',': (to_string(separator) if separator is not UNDEFINED else ',').join(
+            '' if item is None or item is UNDEFINED else to_string(item) for item in array),
+        'slice': lambda start=UNDEFINED, end=UNDEFINED: array[_index(start, len(array), 0):_index(end, len(array), len(array))],
+        'concat': lambda *others: array + [x for other in others for x in (other if isinstance(other, list) else [other])],
+        'flat': lambda: [x for item in array for x in (item if isinstance(item, list) else [item])],
+        'pop': lambda: array.pop() if array else UNDEFINED,
+        'shift': lambda: array.pop(0) if array else UNDEFINED,
+        'push': lambda *items: array.extend(items) or len(array),
+        'reverse': lambda: array.reverse() or array,
+        'sort': lambda fn=UNDEFINED: _sort(array, fn),
+        'toString': lambda: to_string(array),
+    }
+    if key == 'length':
+        return len(array)
+    if key in methods:
+        return methods[key]
+    if is_number(key) or (isinstance(key, str) and key.isdigit()):
+        index = int(key)
+        return array[index] if 0 <= index < len(array) else UNDEFINED
+    return UNDEFINED
+
+
+def _for_each(array, fn):
+    for i, item in enumerate(array):
+        _callback(fn)(item, i, array)
+    return UNDEFINED
+
+
+def _assign(target, *sources):
+    for source in sources:
+        if isinstance(source, dict):
+            target.update(source)
+    return target
+
+
+def _reduce(array, fn, initial):
+    items = list(array)
+    if initial:
+        accumulator = initial[0]
+    elif items:
+        accumulator = items.pop(0)
+    else:
+        raise ExpressionError('TypeError: Reduce of empty array with no initial value')
+    offset = len(array) - len(items)
+    for i, item in enumerate(items):
+        accumulator = _callback(fn)(accumulator, item, i + offset, array)
+    return accumulator
+
+
+def _sort(array, fn):
+    import functools
+    if fn is UNDEFINED:
+        array.sort(key=to_string)
+    else:
+        array.sort(key=functools.cmp_to_key(lambda a, b: to_number(fn(a, b))))
+    return array
+
+
+def _string_method(text, key):
+    methods = {
+        'split': lambda separator=UNDEFINED, limit=UNDEFINED: _split(text, separator, limit),
+        'trim': text.strip, 'trimStart': text.lstrip, 'trimEnd': text.rstrip,
+        'toLowerCase': text.lower, 'toUpperCase': text.upper,
+        'includes': lambda sub: to_string(sub) in text,
+        'startsWith': lambda sub: text.startswith(to_string(sub)),
+        'endsWith': lambda sub: text.endswith(to_string(sub)),
+        'indexOf': lambda sub: text.find(to_string(sub)),
+        'replace': lambda old, new: text.replace(to_string(old), to_string(new), 1),
+        'replaceAll': lambda old, new: text.replace(to_string(old), to_string(new)),
+        'slice': lambda start=UNDEFINED, end=UNDEFINED: text[_index(start, len(text), 0):_index(end, len(text), len(text))],
+        'substring': lambda start, end=UNDEFINED: text[max(0, int(to_number(start))):(len(text) if end is UNDEFINED else max(0, int(to_number(end))))],
+        'padStart': lambda width, fill=' ': text.rjust(int(to_number(width)), to_string(fill)[:1] or ' '),
+        'padEnd': lambda width, fill=' ': text.ljust(int(to_number(width)), to_string(fill)[:1] or ' '),
+        'charAt': lambda i=0: text[int(to_number(i))] if 0 <= int(to_number(i)) < len(text) else '',
+        'repeat': lambda count: text * int(to_number(count)),
+        'toString': lambda: text,
+    }
+    if key == 'length':
+        return len(text)
+    if key in methods:
+        return methods[key]
+    if is_number(key):
+        return text[key] if 0 <= key < len(text) else UNDEFINED
+    return UNDEFINED
+
+
+def _split(text, separator, limit):
+    if separator is UNDEFINED:
+        parts = [text]
+    elif separator == '':
+        parts = list(text)
+    else:
+        parts = text.split(to_string(separator))
+    return parts if limit is UNDEFINED else parts[:int(to_number(limit))]
+
+
+def _number_method(value, key):
+    return {
+        'toFixed': lambda digits=0: f"{value:.{int(to_number(digits))}f}",
+        'toString': lambda: to_string(value),
+    }.get(key, UNDEFINED)
+
+
+def get_property(obj, key, optional=False):
+    if obj is None or obj is UNDEFINED:
+        if optional:
+            raise _ShortCircuit()
+        raise ExpressionError(f"TypeError: Cannot read properties of {to_string(obj)} (reading '{to_string(key)}')")
+    if isinstance(obj, dict):
+        value = obj.get(key if isinstance(key, str) else to_string(key), UNDEFINED)
+        if value is UNDEFINED and key == 'hasOwnProperty':
+            return lambda name: to_string(name) in obj
+        return value
+    if isinstance(obj, list):
+        return _array_method(obj, key)
+    if isinstance(obj, str):
+        return _string_method(obj, key)
+    if is_number(obj):
+        return _number_method(obj, key)
+    if hasattr(obj, 'js_get'):
+        return obj.js_get(key)
+    return UNDEFINED
+
+
+class _ShortCircuit(Exception):
+    """An optional chain hit null / undefined."""
+
+
+def _parse_int(text, radix=10):
+    match = re.match(r'\s*([+-]?\d+)', to_string(text)) if radix in (10, UNDEFINED) else None
+    if match:
+        return int(match.group(1))
+    try:
+        return int(to_string(text).strip(), int(to_number(radix)))
+    except ValueError:
+        return float('nan')
+
+
+def _parse_float(text, *_):
+    match = re.match(r'\s*([+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)', to_string(text))
+    return _number(float(match.group(1))) if match else float('nan')
+
+
+def _js_min_max(fn, default):
+    return lambda *values: _number(fn((to_number(v) for v in values), default=default))
+
+
+def _date_now(context):
+    clock = context.get('$clock')
+    return clock() if clock else datetime.now(timezone.utc)
+
+
+GLOBALS = {
+    'Math': {
+        'floor': lambda x: _number(math.floor(to_number(x))), 'ceil': lambda x: _number(math.ceil(to_number(x))),
+        'round': lambda x: _number(math.floor(to_number(x) + 0.5)), 'abs': lambda x: abs(to_number(x)),
+        'min': _js_min_max(min, math.inf), 'max': _js_min_max(max, -math.inf),
+        'pow': lambda x, y: _number(to_number(x) ** to_number(y)), 'sqrt': lambda x: _number(math.sqrt(to_number(x))),
+        'random': __import__('random').random, 'PI': math.pi,
+    },
+    'JSON': {'stringify': json_stringify, 'parse': json_parse},
+    'Object': {
+        'keys': lambda obj: list(obj) if isinstance(obj, dict) else [str(i) for i in range(len(obj))],
+        'values': lambda obj: list(obj.values()) if isinstance(obj, dict) else list(obj),
+        'entries': lambda obj: [[key, value] for key, value in obj.items()],
+        'assign': _assign,
+        'fromEntries': lambda pairs: {to_string(pair[0]): pair[1] for pair in pairs},
+    },
+    'Array': {'isArray': lambda value: isinstance(value, list), 'from': lambda value: list(value)},
+    # Extra arguments are ignored, as in JavaScript (e.g. .filter(Boolean) passes index and array)
+    'Number': lambda value=0, *_: to_number(value),
+    'String': lambda value='', *_: to_string(value),
+    'Boolean': lambda value=False, *_: truthy(value),
+    'parseInt': _parse_int,
+    'parseFloat': _parse_float,
+    'isNaN': lambda value, *_: isinstance(to_number(value), float) and math.isnan(to_number(value)),
+    'encodeURIComponent': lambda value, *_: quote(to_string(value), safe="-_.!~*'()"),
+    'NaN': float('nan'),
+    'Infinity': math.inf,
+}
+
+
+# ---------------------------------------------------------------------------
+# Evaluation
+# ---------------------------------------------------------------------------
+
+class _Return(Exception):
+    def __init__(self, value):
+        self.value = value
+
+
+class Scope:
+    def __init__(self, variables, parent=None):
+        self.variables = variables
+        self.parent = parent
+
+    def lookup(self, name):
+        scope = self
+        while scope is not None:
+            if name in scope.variables:
+                return scope.variables[name]
+            scope = scope.parent
+        if name in GLOBALS:
+            return GLOBALS[name]
+        if name == 'Date':
+            return {'now': lambda: JSDate(_date_now(self.root())).js_number()}
+        raise ExpressionError(f"ReferenceError: {name} is not defined")
+
+    def root(self):
+        scope = self
+        while scope.parent is not None:
+            scope = scope.parent
+        return scope.variables
+
+
+class Closure:
+    def __init__(self, params, body, scope):
+        self.params = params
+        self.body = body
+        self.scope = scope
+
+    def __call__(self, *args):
+        variables = {name: args[i] if i < len(args) else UNDEFINED for i, name in enumerate(self.params)}
+        return run_statement_body(self.body, Scope(variables, self.scope))
+
+
+def run_statement_body(body, scope):
+    try:
+        execute(body, scope)
+    except _Return as result:
+        return result.value
+    return UNDEFINED
+
+
+def execute(statement, scope):
+    kind = statement[0]
+    if kind == 'block':
+        inner = Scope({}, scope) if any(s[0] == 'decl' for s in statement[1]) and scope.parent is not None else scope
+        for child in statement[1]:
+            execute(child, inner)
+    elif kind == 'decl':
+        scope.variables[statement[1]] = evaluate_node(statement[2], scope)
+    elif kind == 'return':
+        raise _Return(evaluate_node(statement[1], scope))
+    elif kind == 'if':
+        execute(statement[2] if truthy(evaluate_node(statement[1], scope)) else statement[3], scope)
+    elif kind == 'expr':
+        evaluate_node(statement[1], scope)
+
+
+def _spread_into(values, node, scope):
+    for element in node:
+        if element[0] == 'spread':
+            spread = evaluate_node(element[1], scope)
+            if isinstance(spread, str):
+                values.extend(spread)
+            elif isinstance(spread, list):
+                values.extend(spread)
+            elif spread not in (None, UNDEFINED):
+                raise ExpressionError(f"TypeError: {to_string(spread)} is not iterable")
+        else:
+            values.append(evaluate_node(element, scope))
+    return values
+
+
+def evaluate_node(node, scope):
+    kind = node[0]
+    if kind == 'lit':
+        return node[1]
+    if kind == 'name':
+        return scope.lookup(node[1])
+    if kind == 'tpl':
+        strings, expressions = node[1], node[2]
+        parts = [strings[0]]
+        for expression, text in zip(expressions, strings[1:]):
+            parts.append(to_string(evaluate_node(expression, scope)))
+            parts.append(text)
+        return ''.join(parts)
+    if kind == 'get':
+        obj = evaluate_node(node[1], scope)
+        return get_property(obj, evaluate_node(node[2], scope), node[3])
+    if kind == 'chain':
+        try:
+            return evaluate_node(node[1], scope)
+        except _ShortCircuit:
+            return UNDEFINED
+    if kind == 'call':
+        callee_node = node[1]
+        fn = evaluate_node(callee_node, scope)
+        if fn in (None, UNDEFINED) and node[3]:
+            raise _ShortCircuit()
+        if not callable(fn):
+            name = callee_node[2][1] if callee_node[0] == 'get' and callee_node[2][0] == 'lit' else callee_node[1]
+            raise ExpressionError(f"TypeError: {to_string(name)} is not a function")
+        args = _spread_into([], node[2], scope)
+        if isinstance(fn, Closure):
+            return fn(*args)
+        try:
+            return fn(*args)
+        except TypeError as e:
+            raise ExpressionError(f"TypeError: {e}")
+    if kind == 'bin':
+        op = node[1]
+        left = evaluate_node(node[2], scope)
+        if op == '&&':
+            return evaluate_node(node[3], scope) if truthy(left) else left
+        if op == '||':
+            return left if truthy(left) else evaluate_node(node[3], scope)
+        if op == '??':
+            return evaluate_node(node[3], scope) if left is None or left is UNDEFINED else left
+        return _binary(op, left, evaluate_node(node[3], scope))
+    if kind == 'unary':
+        op = node[1]
+        if op == 'typeof':
+            try:
+                return type_of(evaluate_node(node[2], scope))
+            except ExpressionError:
+                return 'undefined'
+        value = evaluate_node(node[2], scope)
+        if op == '!':
+            return not truthy(value)
+        return _number(-to_number(value)) if op == '-' else to_number(value)
+    if kind == 'cond':
+        return evaluate_node(node[2] if truthy(evaluate_node(node[1], scope)) else node[3], scope)
+    if kind == 'arr':
+        return _spread_into([], node[1], scope)
+    if kind == 'obj':
+        result = {}
+        for entry in node[1]:
+            if entry[0] == 'spread':
+                value = evaluate_node(entry[1], scope)
+                if isinstance(value, dict):
+                    result.update(value)
+                elif isinstance(value, list):
+                    result.update((str(i), item) for i, item in enumerate(value))
+            else:
+                result[to_string(evaluate_node(entry[0], scope))] = evaluate_node(entry[1], scope)
+        return result
+    if kind == 'arrow':
+        return Closure(node[1], node[2], scope)
+    if kind == 'new':
+        if node[1] != 'Date':
+            raise ExpressionError(f"'new {node[1]}' is not supported")
+        args = _spread_into([], node[2], scope)
+        if not args:
+            return JSDate(_date_now(scope.root()))
+        return JSDate(parse_datetime(args[0]))
+    raise ExpressionError(f"cannot evaluate {kind!r}")
+
+
+def evaluate(source, context):
+    """Value of one JavaScript expression with the given variables."""
+    try:
+        return evaluate_node(parse_expression(source), Scope(context))
+    except _ShortCircuit:
+        return UNDEFINED
+    except RecursionError:
+        raise ExpressionError('expression nested too deeply')
+
+
+def run_code(source, context):
+    """Run a Code-lite program; returns its `return` value (undefined if none)."""
+    return run_statement_body(parse_program(source), Scope(dict(context)))
+
+
+@lru_cache(maxsize=4096)
+def split_template(text):
+    """'a {{ x }} b' -> ('a ', ' x ', ' b') (odd indexes are expressions), brace-aware."""
+    parts = []
+    pos = 0
+    while True:
+        start = text.find('{{', pos)
+        if start < 0:
+            parts.append(text[pos:])
+            return tuple(parts)
+        parts.append(text[pos:start])
+        depth = 0
+        end = start + 2
+        while end < len(text):
+            char = text[end]
+            if char in '\'"`':
+                close = end + 1
+                while close < len(text) and text[close] != char:
+                    close += 2 if text[close] == '\\' else 1
+                end = close + 1
+                continue
+            if text.startswith('}}', end) and depth == 0:
+                break
+            depth += {'{': 1, '}': -1}.get(char, 0)
+            end += 1
+        else:
+            raise ExpressionError('unterminated {{ in expression')
+        parts.append(text[start + 2:end])
+        pos = end + 2
+
+
+def resolve(value, context):
+    """
+    Resolve an N8N parameter value: '=...' strings are expressions (a lone
+    {{ }} keeps its type, mixed text becomes a string), dicts and lists are
+    resolved recursively, anything else is returned as is.
+    """
+    if isinstance(value, dict):
+        return {key: resolve(item, context) for key, item in value.items()}
+    if isinstance(value, list):
+        return [resolve(item, context) for item in value]
+    if not (isinstance(value, str) and value.startswith('=')):
+        return value
+    parts = split_template(value[1:])
+    if len(parts) == 3 and not parts[0].strip() and not parts[2].strip():
+        return evaluate(parts[1], context)
+    return ''.join(part if index % 2 == 0 else to_string(evaluate(part, context))
+                   for index, part in enumerate(parts))
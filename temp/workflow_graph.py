@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+In-memory graph over an N8N workflow export, shared by the tracking scripts.
+
+Nodes are indexed by name and by id, and the connection table is kept with a
+reverse (incoming) index, so lookups and rewiring are O(1) per edge instead
+of a scan over workflow['nodes'] or all of workflow['connections'].
+
+As in N8N itself, connections are keyed by the *name* of the source node:
+
+    connections[source_name][output_type][branch] = [{'node': target_name, 'type': ..., 'index': ...}]
+
+Branch 0 of an IF node is its TRUE output, branch 1 its FALSE output.
+
+save(canonical=True) writes canonical JSON (keys sorted, UTF-8, streamed in
+chunks), pretty or compact. Together with node_id() - ids derived from the
+workflow and node name instead of uuid4 - re-running a script on the same
+input gives a byte-identical export, which diffs and caches cheaply.
+"""
+
+import json
+import uuid
+from collections import defaultdict, namedtuple
+
+# uuid5 namespace for node_id()
+NODE_ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, 'https://app.meet-sam.com/n8n/workflow-node')
+
+# One splice for WorkflowGraph.insert_many: put `node` (a node dict to add, or
+# the name of a node already in the graph) on `anchor`'s output `branch`,
+# optionally moving it to `position` ([x, y]).
+Insertion = namedtuple('Insertion', ['anchor', 'branch', 'node', 'position'], defaults=[0, None, None])
+
+
+def node_id(workflow_name, node_name):
+    """Deterministic node id: a UUID hashed from the workflow and node name."""
+    return str(uuid.uuid5(NODE_ID_NAMESPACE, f"{workflow_name}/{node_name}"))
+
+
+def iter_json(data, compact=False, depth=3):
+    """
+    Canonical JSON of `data` in chunks: sorted keys, UTF-8, 2-space indent or
+    no whitespace. Containers down to `depth` levels (export list, workflow,
+    nodes) are streamed; each value below is encoded in one go, which lets the
+    compact variant use the C encoder (json.JSONEncoder.iterencode never does).
+    """
+    if compact:
+        encoder = json.JSONEncoder(ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    else:
+        encoder = json.JSONEncoder(ensure_ascii=False, sort_keys=True, indent=2)
+    yield from _iter_json(data, encoder, compact, depth, 0)
+    yield '\n'
+
+
+def _iter_json(value, encoder, compact, depth, level):
+    if level >= depth or not isinstance(value, (dict, list)) or not value:
+        text = encoder.encode(value)
+        yield text if compact or not level else text.replace('\n', '\n' + '  ' * level)
+        return
+    if isinstance(value, dict):
+        items = sorted(value.items(), key=lambda item: item[0])
+        opening, closing = '{', '}'
+    else:
+        items = [(None, item) for item in value]
+        opening, closing = '[', ']'
+    newline = '' if compact else '\n' + '  ' * (level + 1)
+    yield opening
+    for index, (key, item) in enumerate(items):
+        yield (',' if index else '') + newline
+        if key is not None:
+            yield encoder.encode(key) + (':' if compact else ': ')
+        yield from _iter_json(item, encoder, compact, depth, level + 1)
+    yield ('' if compact else '\n' + '  ' * level) + closing
+
+
+def write_json(data, path, compact=False, chunk_size=1 << 16):
+    """Stream canonical JSON (a workflow or a list of them) to path without building one big string."""
+    with open(path, 'w', encoding='utf-8') as f:
+        buffer = []
+        size = 0
+        for chunk in iter_json(data, compact):
+            buffer.append(chunk)
+            size += len(chunk)
+            if size >= chunk_size:
+                f.write(''.join(buffer))
+                buffer = []
+                size = 0
+        f.write(''.join(buffer))
+
+
+class WorkflowGraph:
+    """Indexed view of a workflow dict; edits are applied to the dict in place."""
+
+    def __init__(self, workflow):
+        self.workflow = workflow
+        self.nodes = workflow.setdefault('nodes', [])
+        self.connections = workflow.setdefault('connections', {})
+        self.by_name = {}
+        self.by_id = {}
+        for node in self.nodes:
+            self._index_node(node)
+        # target name -> [(source name, output type, branch), ...], one entry per edge
+        self.incoming = defaultdict(list)
+        for source, outputs in self.connections.items():
+            for output_type, branches in outputs.items():
+                for branch, targets in enumerate(branches):
+                    for conn in targets or []:
+                        self.incoming[conn['node']].append((source, output_type, branch))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r') as f:
+            return cls(json.load(f))
+
+    def save(self, path, canonical=False, compact=False):
+        """Write the workflow; canonical/compact stream sorted-key JSON (see write_json)."""
+        if canonical or compact:
+            write_json(self.workflow, path, compact)
+            return
+        with open(path, 'w') as f:
+            json.dump(self.workflow, f, indent=2)
+
+    def node_id(self, name):
+        """Deterministic id for a new node called `name` in this workflow."""
+        return node_id(self.workflow.get('name', ''), name)
+
+    def _index_node(self, node):
+        self.by_name[node['name']] = node
+        if node.get('id'):
+            self.by_id[node['id']] = node
+
+    # --- Nodes --------------------------------------------------------------
+
+    def __contains__(self, name):
+        return name in self.by_name
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def node(self, name):
+        """Node dict by name, or None."""
+        return self.by_name.get(name)
+
+    def node_by_id(self, node_id):
+        """Node dict by id, or None."""
+        return self.by_id.get(node_id)
+
+    def add_node(self, node):
+        """Append a node; names (and ids) must be unique."""
+        if node['name'] in self.by_name:
+            raise ValueError(f"Duplicate node name: {node['name']}")
+        if node.get('id') in self.by_id:
+            raise ValueError(f"Duplicate node id: {node['id']}")
+        self.nodes.append(node)
+        self._index_node(node)
+        return node
+
+    # --- Edges --------------------------------------------------------------
+
+    def branches(self, name, output_type='main'):
+        """The node's output branches (lists of connection dicts); [] if it has none."""
+        return self.connections.get(name, {}).get(output_type, [])
+
+    def targets(self, name, branch=0, output_type='main'):
+        """Connection dicts leaving one output branch of a node."""
+        branches = self.branches(name, output_type)
+        return (branches[branch] or []) if branch < len(branches) else []
+
+    def successors(self, name, branch=None, output_type='main'):
+        """Names of the nodes a node feeds, on one branch or all of them."""
+        if branch is not None:
+            return [conn['node'] for conn in self.targets(name, branch, output_type)]
+        return [conn['node'] for targets in self.branches(name, output_type) for conn in targets or []]
+
+    def predecessors(self, name):
+        """[(source name, output type, branch), ...] for every edge into a node."""
+        return list(self.incoming.get(name, ()))
+
+    def _branch_list(self, source, branch, output_type):
+        branches = self.connections.setdefault(source, {}).setdefault(output_type, [])
+        while len(branches) <= branch:
+            branches.append([])
+        if branches[branch] is None:
+            branches[branch] = []
+        return branches[branch]
+
+    def connect(self, source, target, branch=0, target_index=0, output_type='main'):
+        """Add an edge from source's output branch to target."""
+        self._branch_list(source, branch, output_type).append(
+            {'node': target, 'type': output_type, 'index': target_index})
+        self.incoming[target].append((source, output_type, branch))
+
+    def set_targets(self, source, branch, targets, output_type='main'):
+        """Replace everything one output branch feeds; returns the previous connection dicts."""
+        branch_list = self._branch_list(source, branch, output_type)
+        previous = list(branch_list)
+        for conn in previous:
+            self.incoming[conn['node']].remove((source, output_type, branch))
+        branch_list[:] = targets
+        for conn in targets:
+            self.incoming[conn['node']].append((source, output_type, branch))
+        return previous
+
+    def disconnect(self, source, target, branch=None, output_type='main'):
+        """Remove source -> target edges (on one branch, or all); returns how many were removed."""
+        removed = 0
+        for index, targets in enumerate(self.branches(source, output_type)):
+            if branch is not None and index != branch or not targets:
+                continue
+            kept = [conn for conn in targets if conn['node'] != target]
+            for _ in range(len(targets) - len(kept)):
+                self.incoming[target].remove((source, output_type, index))
+            removed += len(targets) - len(kept)
+            targets[:] = kept
+        return removed
+
+    def insert_after(self, anchor, name, branch=0, output_type='main'):
+        """
+        Splice node `name` into anchor's output branch: anchor -> name -> whatever
+        the branch fed before. Returns the names name now feeds.
+        """
+        previous = self.set_targets(anchor, branch, [{'node': name, 'type': output_type, 'index': 0}], output_type)
+        for conn in previous:
+            self.connect(name, conn['node'], 0, conn.get('index', 0), output_type)
+        return [conn['node'] for conn in previous]
+
+    def insert_many(self, insertions, output_type='main'):
+        """
+        Apply a batch of Insertions in one pass over the connection table.
+
+        Insertions on the same anchor branch are chained in list order
+        (anchor -> first -> second -> whatever the branch fed before), so
+        each anchor branch is rewired exactly once. Returns one report row
+        per insertion: {'anchor', 'branch', 'node', 'status', 'next'}, where
+        status is 'inserted', 'anchor not found', 'node not found' or
+        'duplicate node' (already in the graph, already placed by this
+        batch, or the anchor itself).
+        """
+        report = []
+        chains = {}  # (anchor, branch) -> [(report row, node name), ...]
+        placed = set()
+        for insertion in insertions:
+            node = insertion.node
+            name = node if isinstance(node, str) else node['name']
+            row = {'anchor': insertion.anchor, 'branch': insertion.branch, 'node': name, 'next': []}
+            report.append(row)
+            if insertion.anchor not in self.by_name:
+                row['status'] = 'anchor not found'
+                continue
+            if name in placed or name == insertion.anchor:
+                row['status'] = 'duplicate node'
+                continue
+            if isinstance(node, str):
+                if name not in self.by_name:
+                    row['status'] = 'node not found'
+                    continue
+                node = self.by_name[name]
+            elif name in self.by_name or node.get('id') in self.by_id:
+                row['status'] = 'duplicate node'
+                continue
+            else:
+                self.add_node(node)
+            if insertion.position is not None:
+                node['position'] = list(insertion.position)
+            row['status'] = 'inserted'
+            placed.add(name)
+            chains.setdefault((insertion.anchor, insertion.branch), []).append((row, name))
+
+        for (anchor, branch), chain in chains.items():
+            names = [name for _, name in chain]
+            previous = self.set_targets(anchor, branch, [{'node': names[0], 'type': output_type, 'index': 0}], output_type)
+            for (row, name), next_name in zip(chain, names[1:]):
+                self.connect(name, next_name, 0, 0, output_type)
+                row['next'] = [next_name]
+            for conn in previous:
+                self.connect(names[-1], conn['node'], 0, conn.get('index', 0), output_type)
+            chain[-1][0]['next'] = [conn['node'] for conn in previous]
+        return report
+
+    def branch_label(self, name, branch):
+        """'TRUE'/'FALSE' for IF outputs, 'output N' for other branches past the first."""
+        node = self.by_name.get(name, {})
+        if node.get('type', '').endswith('.if') and branch in (0, 1):
+            return 'TRUE' if branch == 0 else 'FALSE'
+        return f"output {branch}" if branch else ''
+
+    def print_insertion_report(self, report):
+        """Print an insert_many report; returns the number of nodes inserted."""
+        inserted = 0
+        for row in report:
+            label = self.branch_label(row['anchor'], row['branch'])
+            anchor = f"{row['anchor']} ({label})" if label else row['anchor']
+            if row['status'] == 'inserted':
+                inserted += 1
+                print(f"  ✅ Inserted: {anchor} → {row['node']} → {', '.join(row['next']) or 'END'}")
+            else:
+                print(f"  ❌ {row['node']}: {row['status']} ({anchor})")
+        print(f"\n  {inserted}/{len(report)} nodes inserted")
+        return inserted
+
+    def to_workflow(self):
+        """The (edited) workflow dict, ready for json.dump."""
+        return self.workflow
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Discrete-event capacity model of an N8N workflow export.
+
+Every synthetic prospect is one execution starting at the workflow's webhook.
+On a virtual clock, Wait nodes park the execution for their configured delay
+(expression amounts take --default-amount in the node's unit, or a --delay
+override), HTTP nodes take --http-latency, and IF/Switch nodes pick a branch
+at random with the --prob probabilities (0.5 / uniform by default). An HTTP
+node that calls one of this workflow's own Wait/Webhook URLs continues
+there, so the `Loop Back to Wait` retry cycle is replayed too.
+
+Reported: peak concurrent executions (running and parked in Waits), HTTP
+calls per hour by node and by target (Unipile, SAM status webhooks, n8n
+resumes), and the time until the campaign has drained.
+
+Examples:
+    python temp/workflow_simulate.py n8n-workflow-fixed-v2.json -n 10000 --arrivals-per-hour 500 \\
+        --prob "Connection Accepted?=0.3" --prob "Should Retry Check?=0.9" --delay "Wait FU1 Delay=2d"
+    python temp/workflow_simulate.py n8n-workflow-fixed-v2.json -n 10000 --json
+"""
+
+import argparse
+import heapq
+import json
+import random
+import re
+import sys
+from collections import Counter, defaultdict
+
+from workflow_graph import WorkflowGraph
+from workflow_verify import is_entry, output_count, resume_edges
+
+UNIT_SECONDS = {'seconds': 1, 'minutes': 60, 'hours': 3600, 'days': 86400}
+DURATION = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*([smhd]?)\s*$')
+DURATION_UNITS = {'': 1, 's': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_duration(text):
+    """'90', '90s', '15m', '4h', '2.5d' -> seconds."""
+    match = DURATION.match(text)
+    if not match:
+        raise argparse.ArgumentTypeError(f"invalid duration: {text!r} (use e.g. 30s, 15m, 4h, 2d)")
+    return float(match.group(1)) * DURATION_UNITS[match.group(2)]
+
+
+def parse_assignments(values, convert):
+    """['Node Name=value', ...] -> {name: convert(value)} (split on the last '=')."""
+    result = {}
+    for value in values or []:
+        name, sep, raw = value.rpartition('=')
+        if not sep or not name:
+            raise SystemExit(f"❌ Expected NODE=VALUE, got {value!r}")
+        result[name] = convert(raw)
+    return result
+
+
+def format_duration(seconds):
+    if seconds >= 86400:
+        return f"{seconds / 86400:.1f}d"
+    if seconds >= 3600:
+        return f"{seconds / 3600:.1f}h"
+    if seconds >= 60:
+        return f"{seconds / 60:.1f}m"
+    return f"{seconds:.0f}s"
+
+
+def http_target(node):
+    """Rough label for what an HTTP node calls."""
+    url = str(node.get('parameters', {}).get('url', ''))
+    if 'unipile' in url.lower():
+        return 'unipile'
+    if 'prospect-status' in url or 'meet-sam.com' in url:
+        return 'sam-status'
+    if '/webhook' in url:
+        return 'n8n-webhook'
+    return 'other'
+
+
+class Simulation:
+    """One replay of N prospects through a WorkflowGraph."""
+
+    def __init__(self, graph, probabilities=None, delays=None, default_amount=1.0,
+                 http_latency=1.0, max_steps=10000, seed=0):
+        self.graph = graph
+        self.probabilities = probabilities or {}
+        self.delays = delays or {}
+        self.default_amount = default_amount
+        self.http_latency = http_latency
+        self.max_steps = max_steps
+        self.random = random.Random(seed)
+        self.entry = next((node['name'] for node in graph.nodes if is_entry(node)), None)
+        self.resumes = defaultdict(list)
+        for source, target in resume_edges(graph):
+            self.resumes[source].append(target)
+
+    def wait_seconds(self, node):
+        params = node.get('parameters', {})
+        if params.get('resume') in ('webhook', 'form'):
+            amount = self.default_amount
+        else:
+            amount = params.get('amount', 1)
+            if isinstance(amount, str):
+                try:
+                    amount = float(amount)
+                except ValueError:
+                    amount = self.default_amount  # expression
+        return amount * UNIT_SECONDS.get(params.get('unit', 'hours'), 3600)
+
+    def duration(self, node):
+        """(seconds the node takes, whether the execution is parked meanwhile)."""
+        if node['name'] in self.delays:
+            return self.delays[node['name']], node['type'].endswith('.wait')
+        if node['type'].endswith('.wait'):
+            return self.wait_seconds(node), True
+        if node['type'].endswith('.httpRequest'):
+            return self.http_latency, False
+        return 0.0, False
+
+    def next_nodes(self, name):
+        node = self.graph.node(name)
+        outputs = output_count(node)
+        if outputs:
+            weights = self.probabilities.get(name)
+            if weights is None:
+                weights = [0.5, 0.5] if outputs == 2 else [1.0 / outputs] * outputs
+            elif len(weights) == 1:
+                weights = [weights[0], 1 - weights[0]]
+            branch = self.random.choices(range(len(weights)), weights)[0]
+            targets = self.graph.successors(name, branch)
+        else:
+            targets = self.graph.successors(name, 0)
+        return [target for target in targets + self.resumes.get(name, []) if target in self.graph]
+
+    def run(self, prospects, arrivals_per_hour=0.0):
+        if self.entry is None:
+            raise ValueError('workflow has no webhook or trigger node')
+        spacing = 3600.0 / arrivals_per_hour if arrivals_per_hour else 0.0
+        events = []  # (time, seq, execution, node name)
+        seq = 0
+        for execution in range(prospects):
+            heapq.heappush(events, (execution * spacing, seq, execution, self.entry))
+            seq += 1
+
+        tokens = [0] * prospects    # tokens in flight per execution
+        parked = [0] * prospects    # of which sitting in a Wait
+        steps = [0] * prospects
+        started = [False] * prospects
+        running = waiting = 0
+        peak_running = peak_waiting = peak_total = 0
+        http_calls = defaultdict(Counter)  # node -> {hour: calls}
+        node_runs = Counter()
+        truncated = 0
+        finished_at = 0.0
+        done_events = []  # (time, seq, execution, node name, parked?)
+
+        def state(execution):
+            if not tokens[execution]:
+                return None
+            return 'waiting' if parked[execution] == tokens[execution] else 'running'
+
+        while events or done_events:
+            # Completions before arrivals at the same instant
+            if done_events and (not events or done_events[0][0] <= events[0][0]):
+                now, _, execution, name, was_parked = heapq.heappop(done_events)
+                before = state(execution)
+                tokens[execution] -= 1
+                if was_parked:
+                    parked[execution] -= 1
+                successors = self.next_nodes(name)
+                if steps[execution] + len(successors) > self.max_steps:
+                    truncated += 1
+                    successors = []
+                for target in successors:
+                    heapq.heappush(events, (now, seq, execution, target))
+                    seq += 1
+                    tokens[execution] += 1
+                    steps[execution] += 1
+                if not tokens[execution]:
+                    finished_at = max(finished_at, now)
+            else:
+                now, _, execution, name = heapq.heappop(events)
+                before = state(execution)
+                if not started[execution]:
+                    started[execution] = True
+                    tokens[execution] += 1
+                    steps[execution] += 1
+                node = self.graph.node(name)
+                node_runs[name] += 1
+                if node['type'].endswith('.httpRequest'):
+                    http_calls[name][int(now // 3600)] += 1
+                seconds, is_parked = self.duration(node)
+                if is_parked:
+                    parked[execution] += 1
+                heapq.heappush(done_events, (now + seconds, seq, execution, name, is_parked))
+                seq += 1
+
+            after = state(execution)
+            if before != after:
+                running += (after == 'running') - (before == 'running')
+                waiting += (after == 'waiting') - (before == 'waiting')
+                peak_running = max(peak_running, running)
+                peak_waiting = max(peak_waiting, waiting)
+                peak_total = max(peak_total, running + waiting)
+
+        by_node = []
+        by_target = defaultdict(Counter)
+        all_calls = Counter()
+        for name, hours in http_calls.items():
+            target = http_target(self.graph.node(name))
+            by_target[target].update(hours)
+            all_calls.update(hours)
+            by_node.append({
+                'node': name,
+                'target': target,
+                'calls': sum(hours.values()),
+                'peak_per_hour': max(hours.values()),
+            })
+        by_node.sort(key=lambda row: (-row['peak_per_hour'], row['node']))
+
+        return {
+            'workflow': self.graph.workflow.get('name'),
+            'prospects': prospects,
+            'arrivals_per_hour': arrivals_per_hour,
+            'peak_concurrent_executions': peak_total,
+            'peak_running_executions': peak_running,
+            'peak_waiting_executions': peak_waiting,
+            'drain_seconds': finished_at,
+            'node_runs': dict(node_runs),
+            'http_calls': sum(all_calls.values()),
+            'http_peak_per_hour': max(all_calls.values(), default=0),
+            'http_by_target': {
+                target: {'calls': sum(hours.values()), 'peak_per_hour': max(hours.values())}
+                for target, hours in sorted(by_target.items())
+            },
+            'http_by_node': by_node,
+            'truncated_executions': truncated,
+        }
+
+
+def print_result(result):
+    print(f"📈 {result['workflow']}: {result['prospects']} prospects"
+          + (f" arriving at {result['arrivals_per_hour']:g}/hour" if result['arrivals_per_hour'] else " at once"))
+    print(f"\n   Peak concurrent executions: {result['peak_concurrent_executions']} "
+          f"({result['peak_running_executions']} running, {result['peak_waiting_executions']} parked in Waits)")
+    print(f"   Campaign drained after:     {format_duration(result['drain_seconds'])}")
+    print(f"   HTTP calls:                 {result['http_calls']} total, peak {result['http_peak_per_hour']}/hour")
+    for target, stats in result['http_by_target'].items():
+        print(f"     {target:<14} {stats['calls']:>9} calls, peak {stats['peak_per_hour']}/hour")
+    print(f"\n   {'HTTP node':<44} {'target':<12} {'calls':>9} {'peak/hour':>10}")
+    print("   " + "-" * 78)
+    for row in result['http_by_node']:
+        print(f"   {row['node']:<44} {row['target']:<12} {row['calls']:>9} {row['peak_per_hour']:>10}")
+    if result['truncated_executions']:
+        print(f"\n   ⚠️  {result['truncated_executions']} executions hit --max-steps (runaway loop?)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulate prospects flowing through an N8N workflow')
+    parser.add_argument('path', help='workflow JSON export')
+    parser.add_argument('--prospects', '-n', type=int, default=1000)
+    parser.add_argument('--arrivals-per-hour', type=float, default=0,
+                        help='rate at which prospects enter (default: all at once)')
+    parser.add_argument('--prob', action='append', metavar='NODE=P[,P...]',
+                        help='IF: probability of the TRUE branch; Switch: weight per output (repeatable)')
+    parser.add_argument('--delay', action='append', metavar='NODE=DURATION',
+                        help='override a node duration, e.g. "Wait FU1 Delay=3d" (repeatable)')
+    parser.add_argument('--default-amount', type=float, default=1.0,
+                        help='Wait amount to use when it is an expression (in the node unit, default: 1)')
+    parser.add_argument('--http-latency', type=parse_duration, default=1.0, help='time per HTTP node (default: 1s)')
+    parser.add_argument('--max-steps', type=int, default=10000, help='node visits per execution before giving up')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true', help='print the result as JSON')
+    args = parser.parse_args()
+
+    graph = WorkflowGraph.load(args.path)
+    probabilities = parse_assignments(args.prob, lambda raw: [float(p) for p in raw.split(',')])
+    delays = parse_assignments(args.delay, parse_duration)
+    for name in list(probabilities) + list(delays):
+        if name not in graph:
+            print(f"❌ No node named {name!r} in {args.path}")
+            sys.exit(2)
+
+    simulation = Simulation(graph, probabilities, delays, args.default_amount,
+                            args.http_latency, args.max_steps, args.seed)
+    result = simulation.run(args.prospects, args.arrivals_per_hour)
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print_result(result)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,704 @@
+#!/usr/bin/env python3
+"""
+Trim N8N items down to the fields the rest of the workflow actually reads.
+
+Every node's ={{ }} expressions and Code are parsed (workflow_expr) and the
+$json paths they read are collected: $json.prospect.id, data.campaign_id
+after `const data = $input.first().json`, $('Node').first().json.x and
+$node['Node'].json.x (demands on that node's output). A path used any other
+way - spread, JSON.stringify($json), a computed key, a method call - is read
+whole. Then a backwards liveness pass over the graph works out, per output,
+which fields some downstream node can still see: IF / Wait / NoOp items pass
+through, Code nodes that return {...data, extra} pass through minus what
+they overwrite, Set nodes with "include other fields" likewise, and HTTP
+responses start fresh (an HTTP node that resumes one of this workflow's own
+Waits passes its items to that Wait).
+
+A projection Code node ("Trim after <node>") is inserted after the first
+node on each path whose items may hold unread fields - a webhook, an HTTP
+response, a Code node copying another node's output or returning something
+other than object literals - when those items are carried into a Wait and
+not every field is needed. Re-running the tool rewrites existing Trim
+nodes in place instead of adding new ones. $('Node') references always see
+a node's own, untrimmed output, so they keep working.
+
+Nothing is trimmed past an expression the parser cannot read (it falls back
+to a textual scan of $json paths and treats node references as whole), and
+a dynamic $node[...] / $(...) reference disables trimming altogether.
+
+Examples:
+    python temp/workflow_trim.py n8n-workflow-fixed-v2.json trimmed.json
+    python temp/workflow_trim.py n8n-workflow-fixed-v2.json --dry-run --reads
+"""
+
+import argparse
+import json
+import re
+import sys
+from collections import defaultdict, deque
+
+from workflow_expr import ExpressionError, parse_expression, parse_program, split_template
+from workflow_graph import WorkflowGraph
+from workflow_verify import analyze, is_entry, resume_edges
+
+TRIM_PREFIX = 'Trim after '
+TRIM_NOTE = 'Projection added by temp/workflow_trim.py - re-run the tool after editing downstream nodes'
+
+INPUT = 'input'
+ALL = frozenset({()})
+NOTHING = frozenset()
+
+# Items pass through these unchanged
+PASS_TYPES = ('.if', '.switch', '.filter', '.wait', '.noOp', '.respondToWebhook', '.limit', '.redis')
+CODE_TYPES = ('.code', '.function', '.functionItem')
+# Properties and methods that need the whole value they are read from
+WHOLE_VALUE_PROPERTIES = {'length'}
+
+# Fallback for expressions the parser rejects
+JSON_PATH = re.compile(r'\$json((?:\??\.[A-Za-z_$][\w$]*)*)(\s*[\[(])?')
+NODE_REFERENCE = re.compile(r'''\$\(\s*(['"])(.+?)\1\s*\)|\$node\[\s*(['"])(.+?)\3\s*\]''')
+WHOLE_INPUT = re.compile(r'\$input\b|\bitems\b')
+IDENTIFIER = re.compile(r'^[A-Za-z_$][\w$]*$')
+
+
+# ---------------------------------------------------------------------------
+# Path sets: frozensets of key tuples, () meaning "everything"
+# ---------------------------------------------------------------------------
+
+def normalize(paths):
+    """Drop paths already covered by a shorter prefix in the set."""
+    kept = []
+    for path in sorted(set(paths), key=len):
+        if not any(path[:len(prefix)] == prefix for prefix in kept):
+            kept.append(path)
+    return frozenset(kept)
+
+
+def without(paths, defined):
+    """Paths the input must still provide when the node itself defines `defined`."""
+    return frozenset(path for path in paths
+                     if not any(path[:len(key)] == key for key in defined))
+
+
+def prefixed(prefix, paths):
+    return frozenset(prefix + path for path in paths)
+
+
+def format_paths(paths):
+    if paths == ALL:
+        return 'everything'
+    if not paths:
+        return 'nothing'
+    return ', '.join(sorted('.'.join(path) for path in paths))
+
+
+# ---------------------------------------------------------------------------
+# Expression analysis
+# ---------------------------------------------------------------------------
+
+class Reads:
+    """What one node reads: paths of its input items and of other nodes' outputs."""
+
+    def __init__(self):
+        self.input = set()
+        self.nodes = defaultdict(set)
+        self.dynamic = []   # dynamic $node[...] / $(...) references
+        self.unparsed = []  # expressions read by the textual fallback
+
+    def add(self, root, path):
+        if root == INPUT:
+            self.input.add(path)
+        else:
+            self.nodes[root[1]].add(path)
+
+
+def _node_literal(args):
+    if len(args) == 1 and args[0][0] == 'lit' and isinstance(args[0][1], str):
+        return args[0][1]
+    return None
+
+
+def _item_source(node, env):
+    """Root whose .json is read by `node`: $input.item, $input.first(), items[0], $('X').first(), $node['X']."""
+    kind = node[0]
+    if kind == 'chain':
+        return _item_source(node[1], env)
+    if kind == 'get' and node[2][0] == 'lit':
+        obj, key = node[1], node[2][1]
+        if obj == ('name', '$input') and key == 'item':
+            return INPUT
+        if obj == ('name', 'items') and 'items' not in env and isinstance(key, (int, float)):
+            return INPUT
+        if obj == ('name', '$node') and isinstance(key, str):
+            return ('node', key)
+        if key == 'item' and obj[0] == 'call' and obj[1] == ('name', '$') and _node_literal(obj[2]):
+            return ('node', _node_literal(obj[2]))
+    if kind == 'call' and not node[2] and node[1][0] == 'get' and node[1][2] in (('lit', 'first'), ('lit', 'last')):
+        obj = node[1][1]
+        if obj == ('name', '$input'):
+            return INPUT
+        if obj[0] == 'call' and obj[1] == ('name', '$') and _node_literal(obj[2]):
+            return ('node', _node_literal(obj[2]))
+    return None
+
+
+def root_of(node, env):
+    """(root, path) when `node` is a plain property chain into item data, else None."""
+    kind = node[0]
+    if kind == 'chain':
+        return root_of(node[1], env)
+    if kind == 'name':
+        if node[1] in env:
+            return env[node[1]]
+        return (INPUT, ()) if node[1] == '$json' else None
+    if kind != 'get' or node[2][0] != 'lit':
+        return None
+    key = node[2][1]
+    if key == 'json':
+        source = _item_source(node[1], env)
+        if source is not None:
+            return (source, ())
+    if not isinstance(key, str) or key in WHOLE_VALUE_PROPERTIES:
+        return None
+    parent = root_of(node[1], env)
+    if parent is None:
+        return None
+    return (parent[0], parent[1] + (key,))
+
+
+def visit(node, env, reads):
+    """Record every item path `node` reads into `reads`."""
+    root = root_of(node, env)
+    if root is not None:
+        reads.add(*root)
+        return
+    kind = node[0]
+    if kind == 'lit':
+        return
+    if kind == 'name':
+        name = node[1]
+        if name in env:
+            return
+        if name in ('$input', 'items', '$json'):
+            reads.add(INPUT, ())
+        elif name in ('$node', '$'):
+            reads.dynamic.append(name)
+        return
+    if kind == 'call':
+        callee, args = node[1], node[2]
+        if callee == ('name', '$'):
+            target = _node_literal(args)
+            if target is None:
+                reads.dynamic.append('$(...)')
+            else:
+                reads.add(('node', target), ())
+            return
+        if callee[0] == 'get':
+            # Method call: the receiver is needed whole
+            visit(callee[1], env, reads)
+            visit(callee[2], env, reads)
+        else:
+            visit(callee, env, reads)
+        for arg in args:
+            visit(arg, env, reads)
+        return
+    if kind == 'get' and node[1] == ('name', '$node') and node[2][0] == 'lit':
+        reads.add(('node', node[2][1]), ())
+        return
+    if kind == 'arrow':
+        inner = dict(env)
+        inner.update((param, None) for param in node[1])
+        visit_statement(node[2], inner, reads)
+        return
+    if kind == 'obj':
+        for entry in node[1]:
+            if entry[0] == 'spread':
+                visit(entry[1], env, reads)
+            else:
+                visit(entry[0], env, reads)
+                visit(entry[1], env, reads)
+        return
+    if kind == 'tpl':
+        for expression in node[2]:
+            visit(expression, env, reads)
+        return
+    for child in node[1:]:
+        if isinstance(child, tuple):
+            visit(child, env, reads)
+        elif isinstance(child, list):
+            for item in child:
+                visit(item, env, reads)
+
+
+def visit_statement(statement, env, reads, shape=None):
+    """Walk a Code-lite statement; top-level returns go to `shape` when given."""
+    kind = statement[0]
+    if kind == 'block':
+        for inner in statement[1]:
+            visit_statement(inner, env, reads, shape)
+    elif kind == 'decl':
+        alias = root_of(statement[2], env)
+        if alias is None:
+            visit(statement[2], env, reads)
+        env[statement[1]] = alias
+    elif kind == 'return':
+        if shape is None:
+            visit(statement[1], env, reads)
+        else:
+            shape.add(statement[1], env, reads)
+    elif kind == 'if':
+        visit(statement[1], env, reads)
+        visit_statement(statement[2], env, reads, shape)
+        visit_statement(statement[3], env, reads, shape)
+    else:
+        visit(statement[1], env, reads)
+
+
+class Shape:
+    """Where a Code node's output items come from: passed-through roots plus keys it defines."""
+
+    def __init__(self):
+        self.sources = set()  # (root, path prefix)
+        self.defined = None   # keys defined by every return (intersection)
+        self.opaque = False   # some returned fields come from neither (unknown object, computed key)
+
+    def _define(self, keys):
+        self.defined = set(keys) if self.defined is None else self.defined & set(keys)
+
+    def add(self, node, env, reads):
+        kind = node[0]
+        root = root_of(node, env)
+        if root is not None:
+            self.sources.add(root)
+            self._define(())
+        elif kind == 'obj':
+            entries = node[1]
+            if (len(entries) == 1 and entries[0][0] != 'spread'
+                    and entries[0][0] == ('lit', 'json')):
+                self.add(entries[0][1], env, reads)  # { json: ... } item wrapper
+                return
+            keys = []
+            for entry in entries:
+                if entry[0] == 'spread':
+                    spread = root_of(entry[1], env)
+                    if spread is None:
+                        visit(entry[1], env, reads)
+                        self.opaque = True
+                    else:
+                        self.sources.add(spread)
+                    keys = []  # a later spread may overwrite earlier keys
+                elif entry[0][0] == 'lit':
+                    keys.append((str(entry[0][1]),))
+                    visit(entry[1], env, reads)
+                else:
+                    visit(entry[0], env, reads)
+                    visit(entry[1], env, reads)
+                    self.opaque = True
+            self._define(keys)
+        elif kind == 'arr':
+            for element in node[1]:
+                if element[0] == 'spread':
+                    visit(element[1], env, reads)
+                    self.opaque = True
+                else:
+                    self.add(element, env, reads)
+        elif kind == 'cond':
+            visit(node[1], env, reads)
+            self.add(node[2], env, reads)
+            self.add(node[3], env, reads)
+        elif kind != 'lit':
+            visit(node, env, reads)
+            self.opaque = True
+
+
+def scan_text(text, reads):
+    """Textual fallback for an expression the parser rejects."""
+    reads.unparsed.append(text.strip()[:60])
+    for match in JSON_PATH.finditer(text):
+        path = tuple(part.strip('?') for part in match.group(1).split('.') if part.strip('?'))
+        if match.group(2) and match.group(2).strip() == '(' and path:
+            path = path[:-1]
+        while path and path[-1] in WHOLE_VALUE_PROPERTIES:
+            path = path[:-1]
+        reads.add(INPUT, path)
+    for match in NODE_REFERENCE.finditer(text):
+        reads.add(('node', match.group(2) or match.group(4)), ())
+    if WHOLE_INPUT.search(text):
+        reads.add(INPUT, ())
+
+
+def expression_reads(value, reads, skip=('jsCode', 'functionCode', 'pythonCode')):
+    """Walk a parameter tree; '=...' strings are parsed as N8N templates."""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key not in skip:
+                expression_reads(item, reads, skip)
+    elif isinstance(value, list):
+        for item in value:
+            expression_reads(item, reads, skip)
+    elif isinstance(value, str) and value.startswith('=') and '{{' in value:
+        try:
+            parts = split_template(value[1:])
+        except ExpressionError:
+            scan_text(value, reads)
+            return
+        for source in parts[1::2]:
+            try:
+                visit(parse_expression(source), {}, reads)
+            except ExpressionError:
+                scan_text(source, reads)
+
+
+# ---------------------------------------------------------------------------
+# Per-node summary
+# ---------------------------------------------------------------------------
+
+def is_trim_node(node):
+    return node.get('notes') == TRIM_NOTE and node['name'].startswith(TRIM_PREFIX)
+
+
+class NodeInfo:
+    """
+    reads:   Reads of the node's expressions / code
+    sources: (INPUT or ('node', name), path prefix) its output items are copied from
+    defined: keys it sets on top of those sources
+    opaque:  its output holds fields from elsewhere (webhook, HTTP response, unknown Code result)
+    """
+
+    def __init__(self, reads, sources=(), defined=(), opaque=False):
+        self.reads = reads
+        self.sources = set(sources)
+        self.defined = frozenset(defined)
+        self.opaque = opaque
+
+
+def describe(node):
+    node_type = node.get('type', '')
+    params = node.get('parameters', {})
+    reads = Reads()
+    if is_trim_node(node):
+        return NodeInfo(reads, [(INPUT, ())])
+    expression_reads(params, reads)
+
+    if is_entry(node):
+        return NodeInfo(reads, opaque=True)
+    if node_type.endswith('.httpRequest'):
+        return NodeInfo(reads, opaque=True)
+    if node_type.endswith(PASS_TYPES):
+        if node_type.endswith('.respondToWebhook') and params.get('respondWith') in (
+                None, 'firstIncomingItem', 'allIncomingItems'):
+            reads.add(INPUT, ())
+        defined = [(params['propertyName'],)] if node_type.endswith('.redis') and params.get('propertyName') else []
+        return NodeInfo(reads, [(INPUT, ())], defined)
+    if node_type.endswith('.set'):
+        version = node.get('typeVersion', 1)
+        if version >= 3.3:
+            names = [a.get('name', '') for a in params.get('assignments', {}).get('assignments', [])]
+            keep = params.get('includeOtherFields', False)
+        elif version >= 3:
+            names = [f.get('name', '') for f in params.get('fields', {}).get('values', [])]
+            keep = params.get('include', 'all') == 'all' and params.get('includeOtherFields', True)
+        else:
+            names = [f.get('name', '') for kind in ('string', 'number', 'boolean')
+                     for f in params.get('values', {}).get(kind, [])]
+            keep = not params.get('keepOnlySet', False)
+        dot = params.get('options', {}).get('dotNotation', True)
+        defined = [tuple(name.split('.')) if dot else (name,) for name in names if not name.startswith('=')]
+        if keep:
+            return NodeInfo(reads, [(INPUT, ())], defined)
+        return NodeInfo(reads, defined=defined)
+    if node_type.endswith(CODE_TYPES) and params.get('language', 'javaScript') == 'javaScript':
+        code = params.get('jsCode') or params.get('functionCode') or ''
+        env = {'item': (INPUT, ())} if node_type.endswith('.functionItem') else {}
+        shape = Shape()
+        try:
+            visit_statement(parse_program(code), env, reads, shape)
+        except (ExpressionError, RecursionError):
+            scan_text(code, reads)
+            return NodeInfo(reads, opaque=True)
+        return NodeInfo(reads, shape.sources, shape.defined or (), shape.opaque)
+    # Unknown node type: assume it needs and may forward everything
+    reads.add(INPUT, ())
+    return NodeInfo(reads, opaque=True)
+
+
+# ---------------------------------------------------------------------------
+# Liveness
+# ---------------------------------------------------------------------------
+
+class Liveness:
+    """Fields live at each node's input and output, iterated to a fixpoint (loops included)."""
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.info = {node['name']: describe(node) for node in graph.nodes}
+        self.resumes = defaultdict(list)
+        for source, target in resume_edges(graph):
+            self.resumes[source].append(target)
+            # The HTTP call hands its items to the Wait it resumes
+            self.info[source].sources.add((INPUT, ()))
+            self.info[source].opaque = False
+        self.live_in = {name: NOTHING for name in self.info}
+        self.demand = {name: NOTHING for name in self.info}
+        self.dynamic = sorted({f"{name}: {ref}" for name, info in self.info.items() for ref in info.reads.dynamic})
+        self._solve()
+
+    def next_nodes(self, name):
+        return [target for target in self.graph.successors(name) + self.resumes.get(name, [])
+                if target in self.info]
+
+    def branch_live(self, name, branch):
+        """Fields read downstream of one output branch (what a projection there must keep)."""
+        paths = set()
+        for target in self.graph.successors(name, branch):
+            if target in self.info:
+                paths |= self.live_in[target]
+        return normalize(paths)
+
+    def live_out(self, name):
+        paths = set(self.demand[name])
+        for target in self.next_nodes(name):
+            paths |= self.live_in[target]
+        return normalize(paths)
+
+    def _solve(self):
+        if self.dynamic:
+            self.live_in = {name: ALL for name in self.info}
+            self.demand = {name: ALL for name in self.info}
+            return
+        changed = True
+        while changed:
+            changed = False
+            demand = defaultdict(set)
+            for name, info in self.info.items():
+                out = self.live_out(name)
+                needed = set(info.reads.input)
+                for root, prefix in info.sources:
+                    carried = prefixed(prefix, without(out, info.defined))
+                    if root == INPUT:
+                        needed |= carried
+                    else:
+                        demand[root[1]] |= carried
+                for target, paths in info.reads.nodes.items():
+                    demand[target] |= paths
+                needed = normalize(needed)
+                if needed != self.live_in[name]:
+                    self.live_in[name] = needed
+                    changed = True
+            for name in self.info:
+                paths = normalize(demand.get(name, ()))
+                if paths != self.demand[name]:
+                    self.demand[name] = paths
+                    changed = True
+
+
+def carried_into_wait(liveness, targets):
+    """Do items leaving towards `targets` reach a Wait node while still carrying input fields?"""
+    seen = set()
+    queue = deque(targets)
+    while queue:
+        name = queue.popleft()
+        if name in seen or name not in liveness.info:
+            continue
+        seen.add(name)
+        if liveness.graph.node(name).get('type', '').endswith('.wait'):
+            return True
+        if any(root == INPUT for root, _ in liveness.info[name].sources):
+            queue.extend(liveness.next_nodes(name))
+    return False
+
+
+def plan_projections(graph, liveness):
+    """[(node, branch, paths, existing trim node or None)] in BFS order from the entries."""
+    order = []
+    seen = set()
+    queue = deque(node['name'] for node in graph.nodes if is_entry(node))
+    while queue:
+        name = queue.popleft()
+        if name in seen or name not in liveness.info:
+            continue
+        seen.add(name)
+        order.append(name)
+        queue.extend(liveness.next_nodes(name))
+
+    # Items are narrow once everything they were copied from went through a
+    # projection (nodes not visited yet, i.e. loop back edges, count as narrow)
+    narrow = {}
+    plans = []
+    for name in order:
+        info = liveness.info[name]
+        if is_trim_node(graph.node(name)):
+            narrow[name] = True
+            continue
+        inputs_narrow = all(narrow.get(source, True) for source in graph.predecessors(name))
+        narrow[name] = not info.opaque and all(inputs_narrow if root == INPUT else narrow.get(root[1], True)
+                                               for root, _ in info.sources)
+        if narrow[name]:
+            continue
+        for branch, targets in enumerate(graph.branches(name)):
+            names = [conn['node'] for conn in targets or []]
+            if not names:
+                continue
+            if len(names) == 1 and is_trim_node(graph.node(names[0])):
+                plans.append((name, branch, liveness.branch_live(names[0], 0), names[0]))
+                narrow[name] = True
+                continue
+            paths = liveness.branch_live(name, branch)
+            if paths != ALL and carried_into_wait(liveness, names):
+                plans.append((name, branch, paths, None))
+                narrow[name] = True
+    return plans
+
+
+# ---------------------------------------------------------------------------
+# Projection nodes
+# ---------------------------------------------------------------------------
+
+def _key(key):
+    return key if IDENTIFIER.match(key) else json.dumps(key)
+
+
+def _access(expression, key):
+    return f"{expression}.{key}" if IDENTIFIER.match(key) else f"{expression}[{json.dumps(key)}]"
+
+
+def _tree(paths):
+    tree = {}
+    for path in sorted(paths):
+        level = tree
+        for key in path:
+            level = level.setdefault(key, {})
+    return tree
+
+
+def _object(tree, expression, indent):
+    pad = '  ' * (indent + 1)
+    lines = []
+    for key, subtree in tree.items():
+        value = _access(expression, key)
+        if subtree:
+            value = f"{value} == null ? {value} : {_object(subtree, value, indent + 1)}"
+        lines.append(f"{pad}{_key(key)}: {value},")
+    if not lines:
+        return '{}'
+    return '{\n' + '\n'.join(lines) + '\n' + '  ' * indent + '}'
+
+
+def projection_code(paths):
+    """Code-node JavaScript (per item) that keeps only `paths` of $json."""
+    if paths == ALL:
+        # An existing projection whose downstream now reads everything
+        return ('// Every field is read further down; regenerate with temp/workflow_trim.py\n'
+                'return { json: $json };\n')
+    return ('// Only these fields are read further down; regenerate with temp/workflow_trim.py\n'
+            f"// Keeps: {format_paths(paths)}\n"
+            'const j = $json;\n'
+            f"return {{ json: {_object(_tree(paths), 'j', 0)} }};\n")
+
+
+def _unique_name(graph, base):
+    name, counter = base, 2
+    while name in graph:
+        name = f"{base} ({counter})"
+        counter += 1
+    return name
+
+
+def trim_workflow(graph):
+    """Insert / refresh projection nodes in place; returns (liveness, [(trim node, source, paths, new?)])."""
+    liveness = Liveness(graph)
+    if liveness.dynamic:
+        return liveness, []
+    changes = []
+    for name, branch, paths, existing in plan_projections(graph, liveness):
+        code = projection_code(paths)
+        if existing is not None:
+            node = graph.node(existing)
+            if node['parameters'].get('jsCode') != code:
+                node['parameters']['jsCode'] = code
+                changes.append((existing, name, paths, False))
+            continue
+        source = graph.node(name)
+        x, y = source.get('position', [0, 0])
+        trim_name = _unique_name(graph, f"{TRIM_PREFIX}{name}")
+        graph.add_node({
+            'parameters': {'mode': 'runOnceForEachItem', 'jsCode': code},
+            'id': graph.node_id(trim_name),
+            'name': trim_name,
+            'type': 'n8n-nodes-base.code',
+            'typeVersion': 2,
+            'position': [x + 110, y + 160],
+            'notes': TRIM_NOTE,
+        })
+        graph.insert_after(name, trim_name, branch)
+        changes.append((trim_name, name, paths, True))
+    return liveness, changes
+
+
+def print_reads(liveness):
+    print("📖 Fields read per node:\n")
+    for name, info in liveness.info.items():
+        parts = []
+        if info.reads.input:
+            parts.append(f"$json: {format_paths(normalize(info.reads.input))}")
+        for target, paths in sorted(info.reads.nodes.items()):
+            parts.append(f"$('{target}'): {format_paths(normalize(paths))}")
+        print(f"  {name}")
+        print(f"      reads   {'; '.join(parts) or 'nothing'}")
+        print(f"      needs   {format_paths(liveness.live_in[name])}")
+        if info.reads.unparsed:
+            print(f"      ⚠️  could not parse, scanned as text: {info.reads.unparsed[0]!r}")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Trim N8N items to the fields read downstream')
+    parser.add_argument('input', help='workflow JSON export')
+    parser.add_argument('output', nargs='?', help='where to write the trimmed workflow')
+    parser.add_argument('--dry-run', action='store_true', help='only report what would be trimmed')
+    parser.add_argument('--reads', action='store_true', help='print the fields every node reads and needs')
+    args = parser.parse_args()
+    if not args.output and not args.dry_run:
+        parser.error('give an output path or --dry-run')
+
+    graph = WorkflowGraph.load(args.input)
+    unreachable_before = set(analyze(graph)['unreachable'])
+    liveness, changes = trim_workflow(graph)
+
+    if args.reads:
+        print_reads(liveness)
+    if liveness.dynamic:
+        print("⚠️  Dynamic node references found - every field may be read, nothing trimmed:")
+        for reference in liveness.dynamic:
+            print(f"   - {reference}")
+        sys.exit(1)
+
+    print("✂️  Trimming items to the fields read downstream...\n")
+    for trim_name, source, paths, new in changes:
+        print(f"  {'➕' if new else '🔄'} {trim_name}: keeps {format_paths(paths)}")
+    unparsed = [name for name, info in liveness.info.items() if info.reads.unparsed]
+    if unparsed:
+        print(f"\n⚠️  Scanned as text (expression did not parse): {', '.join(unparsed)}")
+    if not changes:
+        print("✅ Nothing to trim")
+        return
+
+    report = analyze(graph)
+    problems = [f"{name} became unreachable" for name in report['unreachable'] if name not in unreachable_before]
+    problems += [f"dangling edge {edge['source']} → {edge['target']}" for edge in report['dangling_edges']]
+    if problems:
+        print(f"\n❌ Verification failed:")
+        for problem in problems:
+            print(f"   - {problem}")
+        sys.exit(1)
+
+    added = sum(1 for change in changes if change[3])
+    print(f"\n📊 {added} projection nodes added, {len(changes) - added} rewritten")
+    if args.dry_run:
+        return
+    graph.save(args.output)
+    print(f"\n✅ Saved to: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
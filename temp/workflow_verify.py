@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Linear-time structural checks for an N8N workflow (see WorkflowGraph).
+
+analyze() makes one pass over nodes and edges and returns a JSON-able report:
+
+- entries:        webhook / trigger nodes the BFS starts from
+- unreachable:    nodes no entry can reach
+- dangling_edges: connections to node names that do not exist
+- unknown_sources: connection keys that are not node names (stale exports)
+- dead_branches:  IF / Switch outputs with nothing connected
+- loops:          strongly connected components, classified as
+                  'retry' (closed by an HTTP node that resumes a Wait or
+                  Webhook, like `Loop Back to Wait`, or through a Wait node
+                  and a node named as a loop/retry step), 'batch' (through a
+                  splitInBatches node) or 'accidental'
+
+Errors (unreachable nodes, dangling edges, accidental loops) make ok False;
+dead branches, unknown sources and loops without an exit are warnings.
+"""
+
+import json
+import re
+
+from workflow_graph import WorkflowGraph
+
+# Node names that mark a deliberate back edge
+LOOP_NAME = re.compile(r'\b(?:loop|retry)', re.IGNORECASE)
+
+# .../webhook/<id>, .../webhook-waiting/<id>, .../webhook-test/<id>
+WEBHOOK_URL = re.compile(r'/webhook(?:-waiting|-test)?/([^/?#\s"\'}]+)')
+
+
+def is_entry(node):
+    node_type = node.get('type', '')
+    return node_type.endswith('.webhook') or 'trigger' in node_type.lower()
+
+
+def output_count(node):
+    """Expected number of outputs for IF / Switch nodes, else None."""
+    node_type = node.get('type', '')
+    params = node.get('parameters', {})
+    if node_type.endswith('.if'):
+        return 2
+    if node_type.endswith('.switch'):
+        rules = params.get('rules', {})
+        count = len(rules.get('values', rules.get('rules', [])))
+        if params.get('options', {}).get('fallbackOutput') == 'extra':
+            count += 1
+        return count or None
+    return None
+
+
+def branch_label(node, branch):
+    if node.get('type', '').endswith('.if'):
+        return 'true' if branch == 0 else 'false'
+    rules = node.get('parameters', {}).get('rules', {}).get('values', [])
+    if branch < len(rules) and rules[branch].get('outputKey'):
+        return rules[branch]['outputKey']
+    return f"output {branch}"
+
+
+def resume_edges(graph):
+    """(http node, wait/webhook node) pairs where an HTTP call re-enters this workflow."""
+    hooks = {}
+    for node in graph.nodes:
+        if node.get('webhookId'):
+            hooks[node['webhookId']] = node['name']
+        if node.get('type', '').endswith('.webhook') and node.get('parameters', {}).get('path'):
+            hooks[node['parameters']['path']] = node['name']
+    edges = []
+    for node in graph.nodes:
+        if not node.get('type', '').endswith('.httpRequest'):
+            continue
+        for hook in WEBHOOK_URL.findall(str(node.get('parameters', {}).get('url', ''))):
+            if hook in hooks and hooks[hook] != node['name']:
+                edges.append((node['name'], hooks[hook]))
+    return edges
+
+
+def strongly_connected(names, adjacency):
+    """Tarjan's algorithm (iterative); returns the components as lists of names."""
+    index = {}
+    low = {}
+    on_stack = set()
+    stack = []
+    components = []
+    counter = 0
+    for root in names:
+        if root in index:
+            continue
+        work = [(root, iter(adjacency.get(root, ())))]
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            name, children = work[-1]
+            for child in children:
+                if child not in index:
+                    index[child] = low[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(adjacency.get(child, ()))))
+                    break
+                if child in on_stack:
+                    low[name] = min(low[name], index[child])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[name])
+                if low[name] == index[name]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == name:
+                            break
+                    components.append(component)
+    return components
+
+
+def analyze(graph):
+    """Structural report for a WorkflowGraph (O(nodes + edges))."""
+    names = [node['name'] for node in graph.nodes]
+    adjacency = {name: [] for name in names}
+    dangling = []
+    unknown_sources = []
+    edge_count = 0
+    for source, outputs in graph.connections.items():
+        if source not in graph:
+            unknown_sources.append(source)
+            continue
+        for output_type, branches in outputs.items():
+            for branch, targets in enumerate(branches):
+                for conn in targets or []:
+                    edge_count += 1
+                    if conn['node'] in graph:
+                        adjacency[source].append(conn['node'])
+                    else:
+                        dangling.append({'source': source, 'target': conn['node'],
+                                         'type': output_type, 'branch': branch})
+
+    resumes = resume_edges(graph)
+    for source, target in resumes:
+        adjacency[source].append(target)
+
+    # Reachability
+    entries = [node['name'] for node in graph.nodes if is_entry(node)]
+    seen = set(entries)
+    queue = list(entries)
+    for name in queue:
+        for child in adjacency[name]:
+            if child not in seen:
+                seen.add(child)
+                queue.append(child)
+    unreachable = [name for name in names if name not in seen]
+
+    # Dead IF / Switch outputs
+    dead_branches = []
+    for node in graph.nodes:
+        expected = output_count(node)
+        if expected is None:
+            continue
+        for branch in range(expected):
+            if not graph.targets(node['name'], branch):
+                dead_branches.append({'node': node['name'], 'branch': branch,
+                                      'label': branch_label(node, branch)})
+
+    # Loops
+    position = {name: index for index, name in enumerate(names)}
+    component_of = {}
+    cycles = []
+    for component in strongly_connected(names, adjacency):
+        if len(component) == 1 and component[0] not in adjacency[component[0]]:
+            continue
+        for name in component:
+            component_of[name] = len(cycles)
+        cycles.append(sorted(component, key=position.get))  # document order
+    via = [[] for _ in cycles]
+    for source, target in resumes:
+        if source in component_of and component_of.get(target) == component_of[source]:
+            via[component_of[source]].append(f"{source} -> {target}")
+
+    loops = []
+    for index, component in enumerate(cycles):
+        types = [graph.node(name).get('type', '') for name in component]
+        if via[index]:
+            kind = 'retry'
+        elif any(node_type.endswith('.splitInBatches') for node_type in types):
+            kind = 'batch'
+        elif (any(node_type.endswith('.wait') for node_type in types)
+              and any(LOOP_NAME.search(name) for name in component)):
+            kind = 'retry'
+        else:
+            kind = 'accidental'
+        has_exit = any(component_of.get(child) != index for name in component for child in adjacency[name])
+        loops.append({'kind': kind, 'nodes': component, 'resumed_via': sorted(via[index]), 'has_exit': has_exit})
+
+    errors = len(unreachable) + len(dangling) + sum(1 for loop in loops if loop['kind'] == 'accidental')
+    warnings = (len(dead_branches) + len(unknown_sources)
+                + sum(1 for loop in loops if not loop['has_exit']))
+    if not entries:
+        errors += 1
+    return {
+        'workflow': graph.workflow.get('name'),
+        'nodes': len(names),
+        'edges': edge_count,
+        'entries': entries,
+        'unreachable': unreachable,
+        'dangling_edges': dangling,
+        'unknown_sources': unknown_sources,
+        'dead_branches': dead_branches,
+        'sinks': [name for name in names if not adjacency[name]],
+        'loops': loops,
+        'errors': errors,
+        'warnings': warnings,
+        'ok': errors == 0,
+    }
+
+
+def verify_file(path):
+    """
+    analyze() every workflow in a JSON export (one workflow object, or a list
+    of them as `n8n export:workflow --all` writes). Returns
+    {'workflows': [report, ...]}, {'skipped': reason} or {'error': message}.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        return {'error': f"{type(e).__name__}: {e}"}
+    workflows = data if isinstance(data, list) else [data]
+    workflows = [w for w in workflows if isinstance(w, dict) and 'nodes' in w and 'connections' in w]
+    if not workflows:
+        return {'skipped': 'not a workflow export'}
+    return {'workflows': [analyze(WorkflowGraph(workflow)) for workflow in workflows]}
+
+
+def print_report(report):
+    """Human-readable version of an analyze() report."""
+    print(f"📊 {report['workflow'] or '(unnamed)'}: {report['nodes']} nodes, {report['edges']} edges")
+    print(f"   Entries: {', '.join(report['entries']) or '❌ NONE (no webhook or trigger node)'}")
+    for name in report['unreachable']:
+        print(f"   ❌ Unreachable: {name}")
+    for edge in report['dangling_edges']:
+        print(f"   ❌ Dangling edge: {edge['source']} [{edge['branch']}] → {edge['target']} (no such node)")
+    if report['unknown_sources']:
+        print(f"   ⚠️  Connections from {len(report['unknown_sources'])} unknown nodes: "
+              f"{', '.join(report['unknown_sources'])}")
+    for branch in report['dead_branches']:
+        print(f"   ⚠️  Dead branch: {branch['node']} ({branch['label']}) has nothing connected")
+    for loop in report['loops']:
+        icon = '❌' if loop['kind'] == 'accidental' else '🔁'
+        line = f"   {icon} {loop['kind'].capitalize()} loop: {' → '.join(loop['nodes'])}"
+        if loop['resumed_via']:
+            line += f" (resumed via {'; '.join(loop['resumed_via'])})"
+        if not loop['has_exit']:
+            line += ' ⚠️  no exit'
+        print(line)
+    status = '✅ OK' if report['ok'] else '❌ FAILED'
+    print(f"   {status}: {report['errors']} errors, {report['warnings']} warnings")